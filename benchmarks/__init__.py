@@ -0,0 +1,5 @@
+"""Performance benchmarks for Modern Phone Checker.
+
+These scripts are not part of the installed package. Run them from the
+repository root, e.g. ``python -m benchmarks.bench_checks --help``.
+"""
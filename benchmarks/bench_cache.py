@@ -0,0 +1,347 @@
+"""Cache micro-benchmarks, run against every shipped backend.
+
+For each backend in AVAILABLE_BACKENDS, and the Redis backend, and each
+store size, measures:
+- cold start: CacheManager.initialize() and the first get() on a store
+  already holding that many entries
+- get latency: backend hits, memory hits and misses
+- set throughput: one set() per number, set_many() in one batch, and
+  one set() per number in write-behind mode
+- bytes written per entry on disk, against the encoded payload size
+  (local backends only)
+
+The Redis backend runs against the server given by ``--redis-url``, or
+against the in-memory stand-in of the tests (tests/mock_redis.py), which
+measures the client side only.
+
+    python -m benchmarks.bench_cache --sizes 10000,100000,1000000 \\
+        --output cache.json --compare previous.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from modern_phone_checker.cache import CacheEntry, CacheManager
+from modern_phone_checker.cache_backends import (
+    AVAILABLE_BACKENDS, RedisBackend,
+)
+from modern_phone_checker.models import PhoneCheckResult
+from modern_phone_checker.resp import RespClient
+
+from .bench_checks import compare_reports, peak_memory_mb, percentile
+
+DEFAULT_BACKENDS = tuple(AVAILABLE_BACKENDS) + ("redis",)
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+PLATFORM = "whatsapp"
+COUNTRY_CODE = "33"
+# Entries written per backend call while seeding a store
+SEED_BATCH = 10_000
+
+
+def sample_result(phone: str) -> PhoneCheckResult:
+    """A result shaped like the ones the platform checkers return."""
+    return PhoneCheckResult(
+        platform=PLATFORM,
+        exists=True,
+        username=f"user{phone[-4:]}",
+        metadata={"status": "available", "confidence_score": 0.9},
+    )
+
+
+def stored_phone(i: int) -> str:
+    return f"6{i:08d}"
+
+
+def missing_phone(i: int) -> str:
+    return f"7{i:08d}"
+
+
+def disk_usage(path: Path, allocated: bool = False) -> int:
+    """Total size in bytes of the files below ``path``.
+
+    With ``allocated``, count the blocks the filesystem actually reserved,
+    which is what one-file-per-entry layouts really cost.
+    """
+    total = 0
+    for f in path.rglob("*"):
+        if f.is_file():
+            stat = f.stat()
+            total += stat.st_blocks * 512 if allocated else stat.st_size
+    return total
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50_us": round(percentile(ordered, 50) * 1e6, 1),
+        "p95_us": round(percentile(ordered, 95) * 1e6, 1),
+        "p99_us": round(percentile(ordered, 99) * 1e6, 1),
+    }
+
+
+def open_cache(
+    backend_name: str,
+    cache_dir: Path,
+    redis: Optional[RespClient] = None,
+    **kwargs,
+) -> CacheManager:
+    """CacheManager on the store ``cache_dir`` of a backend.
+
+    Redis stores are told apart by a key prefix named after the last
+    two parts of ``cache_dir``.
+    """
+    backend = backend_name
+    if backend_name == "redis":
+        if redis is None:
+            raise ValueError("The redis backend needs a client")
+        backend = RedisBackend(
+            redis, prefix=f"{cache_dir.parent.name}:{cache_dir.name}:"
+        )
+    return CacheManager(cache_dir=str(cache_dir), backend=backend, **kwargs)
+
+
+async def seed(
+    backend_name: str,
+    cache_dir: Path,
+    count: int,
+    redis: Optional[RespClient] = None,
+):
+    """Fill a store with ``count`` entries, bypassing the memory tier."""
+    manager = open_cache(backend_name, cache_dir, redis)
+    backend = await manager._get_backend()
+    expires_at = time.time() + manager.ttl_for(PLATFORM)
+    for start in range(0, count, SEED_BATCH):
+        batch = []
+        for i in range(start, min(start + SEED_BATCH, count)):
+            phone = stored_phone(i)
+            entry = CacheEntry(datetime.now(), sample_result(phone))
+            key = manager._make_key(phone, COUNTRY_CODE, PLATFORM)
+            batch.append((key, entry.encode(), expires_at))
+        await backend.set_many(batch)
+    await manager.close()
+
+
+async def time_gets(manager: CacheManager, phones: Sequence[str]):
+    """Latency of one get() per number, and how many were found."""
+    samples, found = [], 0
+    for phone in phones:
+        start = time.perf_counter()
+        hit = await manager.get(phone, COUNTRY_CODE, [PLATFORM])
+        samples.append(time.perf_counter() - start)
+        found += bool(hit)
+    return samples, found
+
+
+async def bench_reads(
+    backend_name: str,
+    size: int,
+    samples: int,
+    tmp: Path,
+    redis: Optional[RespClient] = None,
+) -> Dict:
+    """Cold start and read latencies against a store of ``size`` entries."""
+    cache_dir = tmp / f"{backend_name}-{size}"
+    start = time.perf_counter()
+    await seed(backend_name, cache_dir, size, redis)
+    seed_seconds = time.perf_counter() - start
+
+    manager = open_cache(backend_name, cache_dir, redis)
+    start = time.perf_counter()
+    await manager.initialize()
+    initialize_seconds = time.perf_counter() - start
+    step = max(1, size // samples)
+    phones = [stored_phone(i) for i in range(0, size, step)][:samples]
+    start = time.perf_counter()
+    await manager.get(phones[0], COUNTRY_CODE, [PLATFORM])
+    first_get_seconds = time.perf_counter() - start
+
+    # First reads come from the backend, repeated ones from memory
+    backend_hits, found = await time_gets(manager, phones[1:])
+    memory_hits, _ = await time_gets(manager, phones[1:])
+    misses, false_hits = await time_gets(
+        manager, [missing_phone(i) for i in range(samples)]
+    )
+    await manager.close()
+    if found != len(phones) - 1 or false_hits:
+        raise RuntimeError(f"{backend_name}: unexpected cache answers")
+
+    return {
+        "entries": size,
+        "seed_s": round(seed_seconds, 3),
+        "initialize_ms": round(initialize_seconds * 1000, 3),
+        "first_get_ms": round(first_get_seconds * 1000, 3),
+        "backend_hit": latency_summary(backend_hits),
+        "memory_hit": latency_summary(memory_hits),
+        "miss": latency_summary(misses),
+    }
+
+
+async def bench_writes(
+    backend_name: str,
+    samples: int,
+    tmp: Path,
+    redis: Optional[RespClient] = None,
+) -> Dict:
+    """Write throughput and bytes written per entry on an empty store."""
+    results = {}
+    for mode in ("set", "set_many", "write_behind_set"):
+        cache_dir = tmp / f"{backend_name}-{mode}"
+        manager = open_cache(
+            backend_name, cache_dir, redis,
+            write_behind=mode == "write_behind_set",
+        )
+        # Measure the empty store closed, as it is measured after writing
+        await manager.initialize()
+        await manager.close()
+        local = manager.backend.cache_dir is not None
+        empty = disk_usage(cache_dir)
+        empty_allocated = disk_usage(cache_dir, allocated=True)
+        items = [
+            (stored_phone(i), COUNTRY_CODE,
+             {PLATFORM: sample_result(stored_phone(i))})
+            for i in range(samples)
+        ]
+        start = time.perf_counter()
+        if mode == "set_many":
+            await manager.set_many(items)
+        else:
+            for phone, country_code, entries in items:
+                await manager.set(phone, country_code, entries)
+            # Write-behind timings include storing the last batch
+            await manager.flush()
+        elapsed = time.perf_counter() - start
+        # Closing flushes buffered data (e.g. the SQLite WAL)
+        await manager.close()
+        results[f"{mode}_per_sec"] = round(samples / elapsed, 1)
+        if not local:
+            continue
+        results[f"{mode}_bytes_per_entry"] = round(
+            (disk_usage(cache_dir) - empty) / samples, 1
+        )
+        results[f"{mode}_allocated_bytes_per_entry"] = round(
+            (disk_usage(cache_dir, allocated=True) - empty_allocated)
+            / samples, 1
+        )
+
+    payload = CacheEntry(datetime.now(), sample_result(stored_phone(0)))
+    results["payload_bytes_per_entry"] = len(payload.encode())
+    return results
+
+
+async def run_benchmark(
+    backends: Sequence[str] = DEFAULT_BACKENDS,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    samples: int = 1000,
+    redis_url: Optional[str] = None,
+) -> Dict:
+    """Benchmark each backend and return the report.
+
+    Args:
+        redis_url: Server of the redis backend (default: an in-memory
+            stand-in started for the run).
+    """
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "backends": list(backends),
+            "sizes": list(sizes),
+            "samples": samples,
+            "redis": "server" if redis_url else "mock",
+        },
+        "backends": {},
+    }
+    async with contextlib.AsyncExitStack() as stack:
+        redis = None
+        if "redis" in backends:
+            if redis_url is None:
+                from tests.mock_redis import MockRedisServer
+
+                server = await stack.enter_async_context(MockRedisServer())
+                redis_url = server.url
+            redis = RespClient.from_url(redis_url)
+            stack.callback(redis.close)
+        tmp = stack.enter_context(tempfile.TemporaryDirectory())
+        # Keys of a run never collide with those of an earlier one
+        root = Path(tmp) / f"bench_cache-{uuid.uuid4().hex[:8]}"
+        for name in backends:
+            report["backends"][name] = {
+                "writes": await bench_writes(name, samples, root, redis),
+                "reads": [
+                    await bench_reads(name, size, samples, root, redis)
+                    for size in sizes
+                ],
+            }
+    report["peak_rss_mb"] = peak_memory_mb()
+    return report
+
+
+def flatten(report: Dict) -> Dict[str, float]:
+    """Flatten a report into ``backend.[size.]metric`` numbers."""
+    flat = {}
+    for name, data in report.get("backends", {}).items():
+        for key, value in data["writes"].items():
+            flat[f"{name}.{key}"] = value
+        for reads in data["reads"]:
+            prefix = f"{name}.{reads['entries']}"
+            for key, value in reads.items():
+                if isinstance(value, dict):
+                    for stat, number in value.items():
+                        flat[f"{prefix}.{key}_{stat}"] = number
+                elif key != "entries":
+                    flat[f"{prefix}.{key}"] = value
+    return flat
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backends", default=",".join(DEFAULT_BACKENDS),
+        help="Comma-separated cache backends to benchmark",
+    )
+    parser.add_argument(
+        "--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma-separated numbers of stored entries",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=1000,
+        help="Operations timed per measurement",
+    )
+    parser.add_argument(
+        "--redis-url",
+        help="redis:// URL of the server for the redis backend (default: "
+             "an in-memory stand-in); keys expire after an hour",
+    )
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Previous report to compare to")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmark(
+        backends=args.backends.split(","),
+        sizes=[int(s) for s in args.sizes.split(",")],
+        samples=args.samples,
+        redis_url=args.redis_url,
+    ))
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            before = {"results": flatten(json.load(f))}
+        after = {"results": flatten(report)}
+        print("\n".join(compare_reports(before, after)))
+
+
+if __name__ == "__main__":
+    main()
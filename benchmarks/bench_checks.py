@@ -0,0 +1,338 @@
+"""End-to-end throughput and latency benchmark.
+
+Drives PhoneChecker against a local MockPlatformServer and writes a JSON
+report (checks/sec, latency percentiles, peak memory, cache hit ratio)
+that can be compared with a previous run:
+
+    python -m benchmarks.bench_checks --numbers 5000 --concurrency 200 \\
+        --latency-ms 20 --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from modern_phone_checker.cache import CacheManager
+from modern_phone_checker.core import PhoneChecker
+from modern_phone_checker.http_client import HTTPConfig
+from modern_phone_checker.platforms import DEFAULT_PLATFORMS
+from modern_phone_checker.resilience import RetryPolicy
+from modern_phone_checker.sharding import ShardedChecker
+
+from .mock_server import MockPlatformServer, point_checkers_at
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+# Metrics where a higher value is better (used by compare_reports)
+HIGHER_IS_BETTER = {
+    "checks_per_sec", "cache_hit_ratio", "set_per_sec", "set_many_per_sec",
+    "write_behind_set_per_sec",
+}
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    index = round(q / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident memory of the process in MB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def generate_numbers(count: int, repeat_ratio: float, seed: int) -> List:
+    """French mobile numbers, ``repeat_ratio`` of them already seen."""
+    rng = random.Random(seed)
+    numbers: List[str] = []
+    for i in range(count):
+        if numbers and rng.random() < repeat_ratio:
+            numbers.append(rng.choice(numbers))
+        else:
+            numbers.append(f"6{i:08d}")
+    return numbers
+
+
+async def run_benchmark(
+    numbers: int = 1000,
+    concurrency: int = 50,
+    platforms: Sequence[str] = DEFAULT_PLATFORMS,
+    latency: float = 0.01,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    throttle_rate: float = 0.0,
+    repeat_ratio: float = 0.0,
+    use_cache: bool = True,
+    max_connections: int = 100,
+    keepalive_connections: int = 20,
+    seed: int = 42,
+) -> Dict:
+    """Run one benchmark and return its report."""
+    server = MockPlatformServer(
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        throttle_rate=throttle_rate,
+        seed=seed,
+    )
+    phones = generate_numbers(numbers, repeat_ratio, seed)
+    latencies: List[float] = []
+    errors = 0
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CacheManager(cache_dir=cache_dir) if use_cache else None
+        async with server, PhoneChecker(
+            api_key="benchmark",
+            cache=cache,
+            use_cache=use_cache,
+            platforms=list(platforms),
+            # Measure the checker, not the production rate limits
+            rate_limits={p: (1_000_000, 1.0) for p in platforms},
+            retry_policy=RetryPolicy(base_delay=0.01),
+            http_config=HTTPConfig(
+                max_connections=max_connections,
+                max_keepalive_connections=keepalive_connections,
+            ),
+        ) as checker:
+            point_checkers_at(checker, server.base_url)
+            limit = asyncio.Semaphore(concurrency)
+
+            async def check(phone: str):
+                nonlocal errors
+                async with limit:
+                    start = time.perf_counter()
+                    results = await checker.check_number(phone, "33")
+                    latencies.append(time.perf_counter() - start)
+                    errors += sum(1 for r in results if r.error)
+
+            started = time.perf_counter()
+            # Bounded batches keep the number of pending tasks flat
+            for offset in range(0, len(phones), concurrency * 10):
+                await asyncio.gather(*[
+                    check(phone)
+                    for phone in phones[offset:offset + concurrency * 10]
+                ])
+            duration = time.perf_counter() - started
+            cache_stats = cache.stats() if cache else {}
+        if cache is not None:
+            await cache.close()
+
+    lookups = sum(
+        cache_stats.get(k, 0)
+        for k in ("memory_hits", "backend_hits", "backend_misses")
+    )
+    hits = cache_stats.get("memory_hits", 0) + cache_stats.get(
+        "backend_hits", 0
+    )
+    ordered = sorted(latencies)
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "numbers": numbers,
+            "concurrency": concurrency,
+            "platforms": list(platforms),
+            "latency": latency,
+            "jitter": jitter,
+            "error_rate": error_rate,
+            "throttle_rate": throttle_rate,
+            "repeat_ratio": repeat_ratio,
+            "use_cache": use_cache,
+            "max_connections": max_connections,
+            "keepalive_connections": keepalive_connections,
+        },
+        "results": {
+            "checks": len(latencies),
+            "duration_s": round(duration, 3),
+            "checks_per_sec": round(len(latencies) / duration, 1),
+            "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+            "peak_rss_mb": peak_memory_mb(),
+            "cache_hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "platform_errors": errors,
+        },
+        "server": {
+            "requests": sum(server.status_counts.values()),
+            "status_counts": {
+                str(k): v for k, v in sorted(server.status_counts.items())
+            },
+        },
+    }
+
+
+async def run_sharded_benchmark(
+    numbers: int = 1000,
+    workers: int = 2,
+    concurrency: int = 50,
+    platforms: Sequence[str] = DEFAULT_PLATFORMS,
+    latency: float = 0.01,
+    repeat_ratio: float = 0.0,
+    ordered: bool = False,
+    seed: int = 42,
+) -> Dict:
+    """Run one benchmark over ``workers`` processes (ShardedChecker).
+
+    Per-number latencies are not observable from the parent, so only
+    throughput and errors are reported. The mock server runs in the
+    parent process: use a latency that keeps it from being the limit.
+    """
+    server = MockPlatformServer(latency=latency, seed=seed)
+    phones = generate_numbers(numbers, repeat_ratio, seed)
+    checks = errors = 0
+    async with server:
+        sharded = ShardedChecker(
+            workers=workers,
+            checker_options={
+                "api_key": "benchmark",
+                "platforms": list(platforms),
+                "retry_policy": RetryPolicy(base_delay=0.01),
+                # Shared limits, kept out of the measurement
+                "rate_limits": {p: (1_000_000, 1.0) for p in platforms},
+            },
+            ordered=ordered,
+            on_start=functools.partial(
+                point_checkers_at, base_url=server.base_url
+            ),
+        )
+        started = time.perf_counter()
+        async for outcome in sharded.check_numbers(
+            [(phone, "33") for phone in phones], concurrency=concurrency
+        ):
+            checks += 1
+            errors += sum(1 for r in outcome.results if r.error)
+        duration = time.perf_counter() - started
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "numbers": numbers,
+            "workers": workers,
+            "concurrency": concurrency,
+            "platforms": list(platforms),
+            "latency": latency,
+            "repeat_ratio": repeat_ratio,
+            "ordered": ordered,
+        },
+        "results": {
+            "checks": checks,
+            "duration_s": round(duration, 3),
+            "checks_per_sec": round(checks / duration, 1),
+            "peak_rss_mb": peak_memory_mb(),
+            "platform_errors": errors,
+        },
+        "server": {
+            "requests": sum(server.status_counts.values()),
+        },
+    }
+
+
+def compare_reports(before: Dict, after: Dict) -> List[str]:
+    """Describe how the results changed between two reports."""
+    lines = []
+    width = max((len(key) for key in after["results"]), default=0)
+    for key, new in after["results"].items():
+        old = before.get("results", {}).get(key)
+        if not isinstance(new, (int, float)) or not isinstance(
+            old, (int, float)
+        ):
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        # Keys may be prefixed, e.g. "sqlite.set_per_sec"
+        metric = key.rsplit(".", 1)[-1]
+        better = change > 0 if metric in HIGHER_IS_BETTER else change < 0
+        marker = "" if abs(change) < 1 else (" +" if better else " -")
+        lines.append(
+            f"{key:>{width}}: {old:>10} -> {new:>10} ({change:+.1f}%)"
+            f"{marker}"
+        )
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--numbers", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--platforms", default=",".join(DEFAULT_PLATFORMS),
+        help="Comma-separated platforms to check",
+    )
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--repeat-ratio", type=float, default=0.0,
+        help="Fraction of numbers that were already checked",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--keepalive-connections", type=int, default=20)
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Worker processes (above 1, only throughput is measured)",
+    )
+    parser.add_argument("--ordered", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Previous report to compare to")
+    args = parser.parse_args(argv)
+
+    if args.workers > 1:
+        report = asyncio.run(run_sharded_benchmark(
+            numbers=args.numbers,
+            workers=args.workers,
+            concurrency=args.concurrency,
+            platforms=args.platforms.split(","),
+            latency=args.latency_ms / 1000,
+            repeat_ratio=args.repeat_ratio,
+            ordered=args.ordered,
+            seed=args.seed,
+        ))
+    else:
+        report = asyncio.run(run_benchmark(
+            numbers=args.numbers,
+            concurrency=args.concurrency,
+            platforms=args.platforms.split(","),
+            latency=args.latency_ms / 1000,
+            jitter=args.jitter_ms / 1000,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            repeat_ratio=args.repeat_ratio,
+            use_cache=not args.no_cache,
+            max_connections=args.max_connections,
+            keepalive_connections=args.keepalive_connections,
+            seed=args.seed,
+        ))
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            print("\n".join(compare_reports(json.load(f), report)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Local stand-in for the platform APIs.
+
+MockPlatformServer answers the requests sent by the WhatsApp, Telegram,
+Instagram and Snapchat checkers with configurable latency, error rate
+and throttling (HTTP 429), so benchmarks never touch the real services.
+Whether a number "exists" is derived from its digits, so answers are
+stable from one run to the next.
+"""
+
+import asyncio
+import json
+import random
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from modern_phone_checker.core import PhoneChecker
+
+REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests",
+           500: "Internal Server Error"}
+
+
+class MockPlatformServer:
+    """Minimal HTTP/1.1 server (with keep-alive) mimicking the platforms."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.05,
+        exists_ratio: float = 0.5,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            host: Interface to listen on.
+            port: TCP port (0 picks a free one).
+            latency: Mean response delay in seconds.
+            jitter: Maximum random deviation from ``latency`` in seconds.
+            error_rate: Fraction of requests answered with HTTP 500.
+            throttle_rate: Fraction of requests answered with HTTP 429.
+            retry_after: Retry-After value sent with 429 responses.
+            exists_ratio: Fraction of numbers reported as registered.
+            seed: Seed of the random generator (for reproducible runs).
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.exists_ratio = exists_ratio
+        self.random = random.Random(seed)
+        self.status_counts: Counter = Counter()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        # A large backlog avoids SYN retransmits when clients open
+        # hundreds of connections at once
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, backlog=4096
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockPlatformServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def _exists(self, phone: str) -> bool:
+        digits = "".join(c for c in phone if c.isdigit())
+        return int(digits[-2:] or 0) < self.exists_ratio * 100
+
+    async def _respond(
+        self, method: str, target: str, body: bytes
+    ) -> Tuple[int, Dict, Dict[str, str]]:
+        delay = self.latency
+        if self.jitter:
+            delay += self.random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        roll = self.random.random()
+        if roll < self.error_rate:
+            return 500, {"error": "internal"}, {}
+        if roll < self.error_rate + self.throttle_rate:
+            return 429, {"error": "throttled"}, {
+                "Retry-After": f"{self.retry_after:g}"
+            }
+
+        url = urlsplit(target)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path
+        if path == "/check":
+            phone = query.get("phone", "")
+            if not self._exists(phone):
+                return 404, {"exists": False}, {}
+            return 200, {"exists": True}, {}
+        if path.endswith("/getProfilePhotos"):
+            if self._exists(query.get("user_id", "")):
+                return 200, {"ok": True, "result": {"total_count": 1}}, {}
+            return 200, {"ok": False}, {}
+        if path == "/api/v1/users/search/":
+            phone = query.get("q", "")
+            users = [{"username": f"user{phone[-4:]}"}]
+            return 200, {"users": users if self._exists(phone) else []}, {}
+        if path == "/v1/contacts" and method == "POST":
+            phone = json.loads(body or b"{}").get("contact", "")
+            return 200, {"exists": self._exists(phone)}, {}
+        return 404, {"error": "not found"}, {}
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1")
+                    if not line.strip():
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload, extra = await self._respond(
+                    method, target, body
+                )
+                self.status_counts[status] += 1
+                data = json.dumps(payload).encode()
+                head = [
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(data)}",
+                ]
+                head += [f"{k}: {v}" for k, v in extra.items()]
+                writer.write(
+                    ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def point_checkers_at(checker: PhoneChecker, base_url: str):
+    """Redirect the platform checkers of ``checker`` to the mock server."""
+    endpoints = {
+        "whatsapp": "/check",
+        "telegram": "/bot<token>/getProfilePhotos",
+        "instagram": "/api/v1/users/search/",
+        "snapchat": "/v1/contacts",
+    }
+    for platform, platform_checker in checker.checkers.items():
+        if platform in endpoints:
+            platform_checker.endpoint = base_url + endpoints[platform]
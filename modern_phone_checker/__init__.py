@@ -2,9 +2,40 @@
 Phone Checker – A modern and ethical phone number verification tool.
 """
 
-from .core import PhoneChecker  # noqa: F401
-from .models import PhoneCheckResult  # noqa: F401
+import importlib
 
-__all__ = ["PhoneChecker", "PhoneCheckResult"]
+__all__ = [
+    "PhoneChecker",
+    "PhoneCheckResult",
+    "FrozenPhoneCheckResult",
+    "BulkCheckResult",
+    "ResultBatch",
+    "HTTPConfig",
+    "create_http_client",
+]
 
 __version__ = "0.1.0"
+
+# Public names and their modules, imported on first access so that
+# importing the package (e.g. to start the CLI) stays cheap
+_EXPORTS = {
+    "PhoneChecker": ".core",
+    "PhoneCheckResult": ".models",
+    "FrozenPhoneCheckResult": ".models",
+    "BulkCheckResult": ".models",
+    "ResultBatch": ".batch",
+    "HTTPConfig": ".http_client",
+    "create_http_client": ".http_client",
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
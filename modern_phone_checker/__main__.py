@@ -1,6 +1,11 @@
 """Command-line interface with enhanced display and mock monetization."""
 
 import asyncio
+import csv
+import importlib
+import itertools
+import json
+import sys
 from datetime import datetime
 
 import click
@@ -9,15 +14,38 @@ from rich.table import Table
 from rich.panel import Panel
 from rich import box
 
-from .core import PhoneChecker
-from .email_checker import EmailChecker
+from . import metrics
 from .cache import CacheManager
+from .cache_backends import AVAILABLE_BACKENDS, DEFAULT_BACKEND
+from .export import ParquetDatasetWriter
 from .platforms import DEFAULT_PLATFORMS
-from .utils import validate_phone_number
+from .utils import iterate_in_thread, validate_phone_number
 
 console = Console()
+err_console = Console(stderr=True)
 FREE_PHONE_PLATFORMS = ["whatsapp", "telegram"]
 
+# Classes imported when a command first needs them, so that starting
+# the CLI (or showing its help) does not load httpx and dnspython
+_LAZY_IMPORTS = {
+    "PhoneChecker": ".core",
+    "EmailChecker": ".email_checker",
+    "CheckpointedJob": ".jobs",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_IMPORTS[name], __package__)
+    globals()[name] = getattr(module, name)
+    return globals()[name]
+
+
+def _lazy(name):
+    """Return a lazily imported class (or its monkeypatched stand-in)."""
+    return globals().get(name) or __getattr__(name)
+
 
 def format_timestamp(timestamp: datetime) -> str:
     """Format a datetime into a readable string."""
@@ -62,6 +90,73 @@ def create_result_table(results):
     return table
 
 
+def _parse_csv_numbers(lines, default_country):
+    """Yield (phone, country_code) pairs from CSV lines.
+
+    The first row is treated as a header when its first cell is
+    ``phone``; otherwise rows are read as ``phone[,country_code]``.
+    """
+    reader = csv.reader(lines)
+    phone_idx, country_idx = 0, 1
+    for line_no, row in enumerate(reader, start=1):
+        if not row or not row[0].strip():
+            continue
+        if line_no == 1 and row[0].strip().lower() == "phone":
+            header = [cell.strip().lower() for cell in row]
+            country_idx = next(
+                (
+                    header.index(name)
+                    for name in ("country_code", "country")
+                    if name in header
+                ),
+                None,
+            )
+            continue
+        phone = row[phone_idx].strip()
+        country = default_country
+        if country_idx is not None and len(row) > country_idx:
+            country = row[country_idx].strip() or default_country
+        yield phone, country
+
+
+def _parse_ndjson_numbers(lines, default_country):
+    """Yield (phone, country_code) pairs from NDJSON lines."""
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            phone = str(record["phone"])
+        except (ValueError, KeyError, TypeError) as e:
+            err_console.print(
+                f"[yellow]Skipping line {line_no}: {e}[/yellow]"
+            )
+            continue
+        country = record.get("country_code") or record.get("country")
+        yield phone, str(country or default_country)
+
+
+def read_numbers(stream, fmt, default_country):
+    """Lazily read (phone, country_code) pairs from a text stream.
+
+    Args:
+        stream: Text stream to read from (file or stdin).
+        fmt: One of ``csv``, ``ndjson`` or ``auto`` (sniffs first line).
+        default_country: Country code used when a row has none.
+    """
+    lines = iter(stream)
+    first = next(lines, None)
+    if first is None:
+        return
+    if fmt == "auto":
+        fmt = "ndjson" if first.lstrip().startswith("{") else "csv"
+    lines = itertools.chain([first], lines)
+    if fmt == "ndjson":
+        yield from _parse_ndjson_numbers(lines, default_country)
+    else:
+        yield from _parse_csv_numbers(lines, default_country)
+
+
 @click.group()
 def cli():
     """Modern Phone Checker CLI."""
@@ -117,6 +212,9 @@ def check(
     """
 
     async def run():
+        PhoneChecker = _lazy("PhoneChecker")
+        EmailChecker = _lazy("EmailChecker")
+
         # Input validation
         if phone and not validate_phone_number(phone, country):
             console.print(
@@ -176,6 +274,8 @@ def check(
                     email_result = await email_checker.check(email)
                     results.append(email_result)
 
+        await cache.close()
+
         # Display results
         console.print("\n")
         target = phone if phone else email
@@ -193,5 +293,365 @@ def check(
     asyncio.run(run())
 
 
+@cli.command("check-batch")
+@click.argument("input_file", type=click.File("r"), default="-")
+@click.option(
+    "--format",
+    "input_format",
+    type=click.Choice(["auto", "csv", "ndjson"]),
+    default="auto",
+    show_default=True,
+    help="Input format (auto detects NDJSON from the first line).",
+)
+@click.option(
+    "--api-key",
+    "api_key",
+    default=None,
+    help="API key to enable premium features.",
+)
+@click.option(
+    "--country",
+    "-c",
+    default="33",
+    help="Country code used for rows without one (default: 33).",
+)
+@click.option(
+    "--concurrency",
+    type=int,
+    default=50,
+    show_default=True,
+    help="Maximum number of numbers checked at once.",
+)
+@click.option(
+    "--per-platform-limit",
+    "per_platform_limit",
+    type=int,
+    default=None,
+    help="Maximum concurrent requests sent to each platform.",
+)
+@click.option(
+    "--force-refresh",
+    is_flag=True,
+    help="Ignore cache and force a fresh verification.",
+)
+@click.option(
+    "--cache-expire",
+    "cache_expire",
+    type=int,
+    default=3600,
+    show_default=True,
+    help="Cache expiration time in seconds.",
+)
+@click.option(
+    "--metrics-file",
+    "metrics_file",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write Prometheus text-format metrics to this file at the end.",
+)
+@click.option(
+    "--parquet-dir",
+    "parquet_dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Write results to a Parquet dataset partitioned by country code "
+    "and date instead of stdout (needs pyarrow).",
+)
+@click.option(
+    "--row-group-size",
+    "row_group_size",
+    type=click.IntRange(min=1),
+    default=100_000,
+    show_default=True,
+    help="Rows per Parquet row group (with --parquet-dir).",
+)
+@click.option(
+    "--checkpoint",
+    "checkpoint",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Record progress in this file; running the same command again "
+    "skips the numbers already completed.",
+)
+@click.option(
+    "--checkpoint-every",
+    "checkpoint_every",
+    type=click.IntRange(min=1),
+    default=10_000,
+    show_default=True,
+    help="Completed numbers between two checkpoints.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes sharing the checks (and the rate limits).",
+)
+@click.option(
+    "--ordered",
+    is_flag=True,
+    help="With --workers, write results in input order.",
+)
+@click.option(
+    "--shared-state",
+    "shared_state",
+    default=None,
+    metavar="DIR|URL",
+    help="Directory or redis://host:port/db URL holding the cache and "
+    "the rate limits, shared with every run using it.",
+)
+def check_batch(
+    input_file,
+    input_format,
+    api_key,
+    country,
+    concurrency,
+    per_platform_limit,
+    force_refresh,
+    cache_expire,
+    metrics_file,
+    parquet_dir,
+    row_group_size,
+    checkpoint,
+    checkpoint_every,
+    workers,
+    ordered,
+    shared_state,
+):
+    """
+    Check many phone numbers read from a CSV/NDJSON file or stdin.
+
+    Writes one NDJSON line per number to stdout as soon as it completes,
+    or appends the results to a Parquet dataset with --parquet-dir.
+    With --checkpoint, an interrupted run can be resumed by running the
+    same command again. With --shared-state, runs on several hosts share
+    one quota per platform and one cache.
+    """
+
+    async def run():
+        PhoneChecker = _lazy("PhoneChecker")
+        phone_platforms = (
+            DEFAULT_PLATFORMS if api_key else FREE_PHONE_PLATFORMS
+        )
+        writer = None
+        if parquet_dir:
+            writer = ParquetDatasetWriter(
+                parquet_dir, row_group_size=row_group_size
+            )
+        # Results are written in batches; close() stores the rest
+        cache_options = dict(expire_after=cache_expire, write_behind=True)
+        cache = None
+        store = None
+        if workers > 1:
+            from .sharding import ShardedChecker, outcome_to_json
+
+            # Workers serialize NDJSON output themselves
+            serialize = writer is None and not checkpoint
+            checker = ShardedChecker(
+                workers=workers,
+                checker_options=dict(
+                    api_key=api_key, platforms=phone_platforms
+                ),
+                cache_options=cache_options,
+                ordered=ordered,
+                transform=outcome_to_json if serialize else None,
+                shared_state=shared_state,
+            )
+        else:
+            rate_limiters = None
+            if shared_state:
+                from .shared_state import open_state_store
+
+                store = open_state_store(shared_state)
+                await store.open()
+                cache_options["backend"] = store.cache_backend()
+                rate_limiters = store.rate_limiters(phone_platforms)
+            cache = CacheManager(**cache_options)
+            checker = PhoneChecker(
+                api_key=api_key,
+                cache=cache,
+                platforms=phone_platforms,
+                rate_limiters=rate_limiters,
+            )
+
+        outcomes = None
+        job = None
+
+        async def flush_output():
+            # Results must be stored before they are marked as completed
+            if writer is not None:
+                await writer.flush()
+            else:
+                sys.stdout.flush()
+
+        try:
+            # Each worker process initializes its own checker
+            if workers == 1:
+                await checker.initialize()
+            # Waiting for input (e.g. a slow pipe) must not stall the
+            # checks in flight
+            numbers = iterate_in_thread(
+                read_numbers(input_file, input_format, country)
+            )
+            options = dict(
+                concurrency=concurrency,
+                per_platform_limit=per_platform_limit,
+                force_refresh=force_refresh,
+            )
+            if checkpoint:
+                # Parquet rows count as completed once in a part file, so
+                # checkpoints don't cut row groups short
+                job = _lazy("CheckpointedJob")(
+                    checker,
+                    checkpoint,
+                    checkpoint_every=checkpoint_every,
+                    on_checkpoint=flush_output,
+                    durable=writer.take_durable if writer else None,
+                )
+                outcomes = job.run(numbers, **options)
+            else:
+                outcomes = checker.check_numbers(numbers, **options)
+            async for outcome in outcomes:
+                if writer is not None:
+                    await writer.write(
+                        outcome, token=job.position if job else None
+                    )
+                elif isinstance(outcome, str):
+                    click.echo(outcome)
+                else:
+                    click.echo(json.dumps(outcome.to_dict()))
+        finally:
+            try:
+                # Lets the job record its last checkpoint while the
+                # checker and the output are still open
+                if outcomes is not None:
+                    await outcomes.aclose()
+                if writer is not None:
+                    await writer.close()
+            finally:
+                if workers == 1:
+                    await checker.close()
+                    await cache.close()
+                if store is not None:
+                    await store.close()
+
+    asyncio.run(run())
+
+    registry = metrics.registry()
+    if metrics_file and hasattr(registry, "render"):
+        with open(metrics_file, "w") as f:
+            f.write(registry.render())
+
+
+@cli.group("cache")
+def cache_group():
+    """Inspect and maintain the result cache."""
+    pass
+
+
+def cache_options(func):
+    """Options locating the cache, shared by the ``cache`` commands."""
+    func = click.option(
+        "--cache-expire",
+        "cache_expire",
+        type=int,
+        default=3600,
+        show_default=True,
+        help="Cache expiration time in seconds the entries were written "
+             "with.",
+    )(func)
+    func = click.option(
+        "--backend",
+        type=click.Choice(sorted(AVAILABLE_BACKENDS)),
+        default=DEFAULT_BACKEND,
+        show_default=True,
+        help="Cache storage backend.",
+    )(func)
+    return click.option(
+        "--cache-dir",
+        "cache_dir",
+        type=click.Path(file_okay=False),
+        default=".cache",
+        show_default=True,
+        help="Cache directory.",
+    )(func)
+
+
+def format_size(size: int) -> str:
+    """Format a number of bytes for display."""
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB"):
+        size /= 1024
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.1f} GB"
+
+
+@cache_group.command("stats")
+@cache_options
+@click.option(
+    "--json",
+    "as_json",
+    is_flag=True,
+    help="Print the statistics as JSON.",
+)
+def cache_stats(cache_dir, backend, cache_expire, as_json):
+    """Show entry counts, disk size and age distribution of the cache."""
+
+    async def run():
+        cache = CacheManager(
+            cache_dir=cache_dir, backend=backend, expire_after=cache_expire
+        )
+        try:
+            await cache.initialize()
+            return await cache.storage_stats()
+        finally:
+            await cache.close()
+
+    stats = asyncio.run(run())
+    if as_json:
+        click.echo(json.dumps(stats))
+        return
+
+    table = Table(box=box.ROUNDED, title=f"Cache {cache_dir} ({backend})")
+    table.add_column("Metric", style="cyan bold")
+    table.add_column("Value", style="yellow", justify="right")
+    table.add_row("Entries", str(stats["entries"]))
+    table.add_row("Live", str(stats["live"]))
+    table.add_row("Expired", str(stats["expired"]))
+    table.add_row("Size", format_size(stats["size_bytes"]))
+    for platform, count in sorted(stats["platforms"].items()):
+        table.add_row(f"Platform {platform}", str(count))
+    for label, count in stats["age"].items():
+        table.add_row(f"Age {label}", str(count))
+    console.print(table)
+
+
+@cache_group.command("compact")
+@cache_options
+def cache_compact(cache_dir, backend, cache_expire):
+    """Remove expired entries and reclaim their disk space."""
+
+    async def run():
+        cache = CacheManager(
+            cache_dir=cache_dir, backend=backend, expire_after=cache_expire
+        )
+        try:
+            await cache.initialize()
+            before = await cache.backend.size_bytes()
+            removed = await cache.compact()
+            return removed, before, await cache.backend.size_bytes()
+        finally:
+            await cache.close()
+
+    removed, before, after = asyncio.run(run())
+    console.print(
+        f"Removed [bold]{removed}[/bold] expired entries, "
+        f"size {format_size(before)} -> {format_size(after)}"
+    )
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,345 @@
+"""Columnar storage for large numbers of check results.
+
+A ResultBatch keeps results in typed arrays rather than one object per
+result:
+- strings (phone, country code, platform, error, username, metadata)
+  are interned per column and stored as integer ids
+- ``exists`` is a bitmap
+- timestamps are int64 microseconds since the epoch
+
+Exports to CSV, Arrow and Parquet read these columns directly, so no
+PhoneCheckResult is built along the way. Arrow and Parquet need pyarrow
+(``pip install modern_phone_checker[arrow]``).
+"""
+
+import csv
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple,
+)
+
+from . import serialization
+from .models import BulkCheckResult, FrozenPhoneCheckResult, PhoneCheckResult
+
+# Exported columns, in order
+COLUMNS = (
+    "phone", "country_code", "platform", "exists", "error", "username",
+    "last_seen", "metadata", "timestamp",
+)
+
+# Stored in place of a missing timestamp
+_NO_TIME = -(2 ** 63)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: Optional[datetime]) -> int:
+    """Microseconds since the epoch (naive datetimes are local time)."""
+    if value is None:
+        return _NO_TIME
+    return (value.astimezone(timezone.utc) - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> Optional[datetime]:
+    """Naive local datetime, as the checkers produce them."""
+    if value == _NO_TIME:
+        return None
+    moment = _EPOCH + value * _MICROSECOND
+    return moment.astimezone().replace(tzinfo=None)
+
+
+# Arrow index type of each array typecode used for string ids
+_INDEX_TYPES = {"b": "int8", "h": "int16", "i": "int32"}
+
+
+def require_pyarrow():
+    """Import pyarrow, with an install hint when it is missing."""
+    try:
+        import pyarrow
+        import pyarrow.compute
+    except ImportError as e:
+        raise ImportError(
+            "Arrow and Parquet export need pyarrow: "
+            "pip install modern_phone_checker[arrow]"
+        ) from e
+    return pyarrow
+
+
+class _InternedColumn:
+    """Column of optional strings stored as ids into a value table.
+
+    Id 0 stands for None.
+    """
+
+    __slots__ = ("values", "codes", "_ids")
+
+    def __init__(self, typecode: str = "i"):
+        self.values: List[Optional[str]] = [None]
+        self.codes = array(typecode)
+        self._ids: Dict[str, int] = {}
+
+    def append(self, value: Optional[str]):
+        if value is None:
+            self.codes.append(0)
+            return
+        code = self._ids.get(value)
+        if code is None:
+            code = self._ids[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self.values[self.codes[index]]
+
+    def decode(self) -> List[Optional[str]]:
+        values = self.values
+        return [values[code] for code in self.codes]
+
+    def nbytes(self) -> int:
+        text = sum(len(value) for value in self.values[1:])
+        return self.codes.itemsize * len(self.codes) + text
+
+    def to_arrow(self, pa):
+        """DictionaryArray over a copy of the codes (nulls for id 0)."""
+        index_type = getattr(pa, _INDEX_TYPES[self.codes.typecode])()
+        # A copy: exporting the array itself would forbid appending to it
+        data = pa.py_buffer(self.codes.tobytes())
+        codes = pa.Array.from_buffers(
+            index_type, len(self.codes), [None, data]
+        )
+        validity = pa.compute.not_equal(codes, 0).buffers()[1]
+        indices = pa.Array.from_buffers(
+            index_type, len(self.codes),
+            [validity, data],
+        )
+        # Dictionary values must not be null: id 0 gets a placeholder
+        dictionary = pa.array([""] + self.values[1:], pa.string())
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+
+class ResultBatch:
+    """Check results stored column by column.
+
+    Each row is one platform result of one number. Numbers that could
+    not be checked at all (a BulkCheckResult with an error and no
+    results) are kept as a row without platform.
+
+    Example:
+        >>> batch = ResultBatch()
+        >>> async for outcome in checker.check_numbers(numbers):
+        ...     batch.append_bulk(outcome)
+        >>> batch.to_parquet("results.parquet")
+    """
+
+    __slots__ = (
+        "phone", "country_code", "platform", "error", "username",
+        "metadata", "last_seen", "timestamp", "_exists", "_length",
+    )
+
+    def __init__(self, outcomes: Iterable[BulkCheckResult] = ()):
+        """
+        Args:
+            outcomes: Bulk check outcomes to store right away.
+        """
+        self.phone = _InternedColumn()
+        self.country_code = _InternedColumn("h")
+        self.platform = _InternedColumn("b")
+        self.error = _InternedColumn()
+        self.username = _InternedColumn()
+        # Metadata dicts are stored as JSON text, most of them repeat
+        self.metadata = _InternedColumn()
+        self.last_seen = array("q")
+        self.timestamp = array("q")
+        # One bit per row, least significant bit first (Arrow layout)
+        self._exists = bytearray()
+        self._length = 0
+        self.extend(outcomes)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(
+        self,
+        phone: str,
+        country_code: str,
+        result: Optional[PhoneCheckResult],
+        error: Optional[str] = None,
+    ):
+        """Add one row.
+
+        Args:
+            phone: Phone number (without country code).
+            country_code: Country code the number was checked against.
+            result: Platform result, or None if the number could not be
+                checked.
+            error: Error message used when ``result`` is None.
+        """
+        self.phone.append(phone)
+        self.country_code.append(country_code)
+        bit = self._length % 8
+        if bit == 0:
+            self._exists.append(0)
+        self._length += 1
+        if result is None:
+            for column in (self.platform, self.username, self.metadata):
+                column.append(None)
+            self.error.append(error)
+            self.last_seen.append(_NO_TIME)
+            self.timestamp.append(_NO_TIME)
+            return
+
+        if result.exists:
+            self._exists[-1] |= 1 << bit
+        self.platform.append(result.platform)
+        self.error.append(result.error)
+        self.username.append(result.username)
+        self.metadata.append(
+            serialization.dumps(result.metadata).decode()
+            if result.metadata is not None else None
+        )
+        self.last_seen.append(_to_micros(result.last_seen))
+        self.timestamp.append(_to_micros(result.timestamp))
+
+    def append_bulk(self, outcome: BulkCheckResult):
+        """Add the rows of one number checked through a bulk run."""
+        if not outcome.results:
+            self.append(
+                outcome.phone, outcome.country_code, None, outcome.error
+            )
+        for result in outcome.results:
+            self.append(outcome.phone, outcome.country_code, result)
+
+    def extend(self, outcomes: Iterable[BulkCheckResult]):
+        """Add the rows of several bulk outcomes."""
+        for outcome in outcomes:
+            self.append_bulk(outcome)
+
+    def exists(self, index: int) -> bool:
+        """Value of the ``exists`` column at ``index``."""
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return bool(self._exists[index >> 3] >> (index & 7) & 1)
+
+    def exists_count(self) -> int:
+        """Number of rows where the number exists on the platform."""
+        return bin(int.from_bytes(self._exists, "little")).count("1")
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the stored data in bytes."""
+        strings = sum(column.nbytes() for column in self._string_columns())
+        times = 8 * (len(self.last_seen) + len(self.timestamp))
+        return strings + times + len(self._exists)
+
+    def _string_columns(self) -> Tuple[_InternedColumn, ...]:
+        return (
+            self.phone, self.country_code, self.platform, self.error,
+            self.username, self.metadata,
+        )
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Values of one row, keyed by column name."""
+        metadata = self.metadata[index]
+        return {
+            "phone": self.phone[index],
+            "country_code": self.country_code[index],
+            "platform": self.platform[index],
+            "exists": self.exists(index),
+            "error": self.error[index],
+            "username": self.username[index],
+            "last_seen": _from_micros(self.last_seen[index]),
+            "metadata": (
+                serialization.loads(metadata) if metadata is not None
+                else None
+            ),
+            "timestamp": _from_micros(self.timestamp[index]),
+        }
+
+    def __iter__(self) -> Iterator[
+        Tuple[str, str, Optional[FrozenPhoneCheckResult]]
+    ]:
+        """Yield ``(phone, country_code, result)`` for each row.
+
+        Results are rebuilt as FrozenPhoneCheckResult objects one at a
+        time; rows without platform yield None.
+        """
+        for index in range(self._length):
+            row = self.row(index)
+            phone = row.pop("phone")
+            country_code = row.pop("country_code")
+            if row["platform"] is None:
+                yield phone, country_code, None
+            else:
+                yield phone, country_code, FrozenPhoneCheckResult(**row)
+
+    def to_csv(self, stream: TextIO, header: bool = True):
+        """Write the rows as CSV (timestamps in ISO 8601, UTC)."""
+        writer = csv.writer(stream)
+        if header:
+            writer.writerow(COLUMNS)
+
+        def iso(micros: int) -> str:
+            if micros == _NO_TIME:
+                return ""
+            return (_EPOCH + micros * _MICROSECOND).isoformat()
+
+        exists = self._exists
+        columns = [column.decode() for column in self._string_columns()]
+        phones, countries, platforms, errors, usernames, metadata = columns
+        writer.writerows(
+            (
+                phones[i], countries[i], platforms[i] or "",
+                int(exists[i >> 3] >> (i & 7) & 1), errors[i] or "",
+                usernames[i] or "", iso(self.last_seen[i]),
+                metadata[i] or "", iso(self.timestamp[i]),
+            )
+            for i in range(self._length)
+        )
+
+    def to_arrow(self):
+        """Build a ``pyarrow.Table`` over the stored columns.
+
+        String columns become dictionary arrays and ``exists`` reuses
+        the bitmap layout of the batch; nothing is converted row by row.
+        The table holds copies of the column buffers, so the batch can
+        still be appended to while it is alive.
+        """
+        pa = require_pyarrow()
+        length = self._length
+        timestamp_type = pa.timestamp("us", tz="UTC")
+
+        def times(values: array):
+            data = pa.py_buffer(values.tobytes())
+            raw = pa.Array.from_buffers(pa.int64(), length, [None, data])
+            validity = pa.compute.not_equal(raw, _NO_TIME).buffers()[1]
+            return pa.Array.from_buffers(
+                timestamp_type, length, [validity, data]
+            )
+
+        exists = pa.Array.from_buffers(
+            pa.bool_(), length, [None, pa.py_buffer(bytes(self._exists))]
+        )
+        return pa.table({
+            "phone": self.phone.to_arrow(pa),
+            "country_code": self.country_code.to_arrow(pa),
+            "platform": self.platform.to_arrow(pa),
+            "exists": exists,
+            "error": self.error.to_arrow(pa),
+            "username": self.username.to_arrow(pa),
+            "last_seen": times(self.last_seen),
+            "metadata": self.metadata.to_arrow(pa),
+            "timestamp": times(self.timestamp),
+        })
+
+    def to_parquet(self, path: str, **kwargs):
+        """Write the rows to a Parquet file.
+
+        Args:
+            path: Destination file.
+            **kwargs: Passed to ``pyarrow.parquet.write_table`` (e.g.
+                ``compression``).
+        """
+        table = self.to_arrow()
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path, **kwargs)
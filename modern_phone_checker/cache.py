@@ -5,89 +5,658 @@ sending too many API requests. It uses a freshness score to
 decide when to refresh the data.
 """
 
-import json
+import asyncio
+import functools
+import logging
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union, Tuple, Iterable
 from pathlib import Path
-import aiofiles
 import aiofiles.os
 from .models import PhoneCheckResult
+from .platforms import AVAILABLE_CHECKERS
+from . import metrics, serialization
+from .cache_backends import (
+    AVAILABLE_BACKENDS, DEFAULT_BACKEND, CacheBackend, CacheItem,
+)
+
+# Background tasks report here: stdout may carry the command's output
+logger = logging.getLogger(__name__)
+
+# (upper bound in seconds, label) of the age buckets of storage_stats()
+AGE_BUCKETS = (
+    (3600, "<1h"),
+    (6 * 3600, "1h-6h"),
+    (24 * 3600, "6h-24h"),
+    (7 * 24 * 3600, "1d-7d"),
+    (float("inf"), ">7d"),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """Names of the ``__slots__`` attributes of ``cls`` and its bases."""
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(
+            name for name in slots
+            if name not in ('__dict__', '__weakref__')
+        )
+    return tuple(names)
+
+
+def _approximate_size(obj: Any) -> int:
+    """Roughly estimate the memory footprint of a cache entry in bytes."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            _approximate_size(k) + _approximate_size(v)
+            for k, v in obj.items()
+        )
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_approximate_size(item) for item in obj)
+    else:
+        if hasattr(obj, '__dict__'):
+            size += _approximate_size(vars(obj))
+        # Slotted objects (e.g. PhoneCheckResult) have no __dict__
+        for name in _slot_names(type(obj)):
+            if hasattr(obj, name):
+                size += _approximate_size(getattr(obj, name))
+    return size
+
+
+@dataclass
+class MemoryCacheStats:
+    """Counters of the in-memory cache tier.
+
+    Attributes:
+        hits: Lookups answered from memory
+        misses: Lookups that were not in memory (or had expired)
+        evictions: Live entries dropped to stay within the memory budget
+        expirations: Expired entries dropped from memory
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class LRUCache:
+    """Size-bounded in-memory cache with LRU and TTL-aware eviction.
+
+    Each entry carries its own expiry time: expired entries are never
+    returned and are dropped first when room must be made. The budget
+    can be given as a number of entries, an approximate size in bytes,
+    or both.
+    """
+
+    # Number of least recently used entries inspected for expiry
+    # before evicting live entries
+    expiry_scan = 32
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 10000,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries kept (None: unbounded).
+            max_bytes: Approximate maximum memory used by the entries
+                (None: unbounded).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = MemoryCacheStats()
+        self.size_bytes = 0
+        # key -> (value, expires_at, size in bytes)
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key`` if present and fresh."""
+        item = self._entries.get(key)
+        if item is None:
+            self.stats.misses += 1
+            return None
+        value, expires_at, _ = item
+        if expires_at <= time.time():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, expires_at: float):
+        """Store ``value`` under ``key`` until ``expires_at`` (epoch)."""
+        self._remove(key)
+        size = _approximate_size(value) if self.max_bytes else 0
+        self._entries[key] = (value, expires_at, size)
+        self.size_bytes += size
+        self._enforce_budget()
+
+    def pop(self, key: str):
+        """Remove ``key`` from the cache if present."""
+        self._remove(key)
+
+    def clear(self):
+        """Remove every entry."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def purge_expired(self, limit: Optional[int] = None) -> int:
+        """Drop expired entries, scanning at most ``limit`` of them.
+
+        Returns:
+            Number of entries removed.
+        """
+        now = time.time()
+        expired = []
+        for index, (key, item) in enumerate(self._entries.items()):
+            if limit is not None and index >= limit:
+                break
+            if item[1] <= now:
+                expired.append(key)
+        for key in expired:
+            self._remove(key)
+        self.stats.expirations += len(expired)
+        return len(expired)
+
+    def _remove(self, key: str):
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self.size_bytes -= item[2]
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and (
+            len(self._entries) > self.max_entries
+        ):
+            return True
+        return self.max_bytes is not None and self.size_bytes > self.max_bytes
+
+    def _enforce_budget(self):
+        if not self._over_budget():
+            return
+        # Expired entries are the cheapest to lose: drop those found
+        # among the least recently used ones before evicting live data.
+        self.purge_expired(limit=self.expiry_scan)
+        while self._over_budget() and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.stats.evictions += 1
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Decoded form of one cached platform result, shared by readers.
+
+    Attributes:
+        timestamp: When the result was stored
+        result: The cached result (never handed out directly, callers
+            receive copies)
+    """
+
+    timestamp: datetime
+    result: PhoneCheckResult
+
+    def encode(self) -> bytes:
+        """Serialize the entry for storage."""
+        return serialization.dumps({
+            'timestamp': self.timestamp.isoformat(),
+            'result': self.result.to_dict(),
+        })
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CacheEntry":
+        """Build an entry from its stored form.
+
+        Raises:
+            ValueError: The data is not a valid entry (torn or corrupt
+                file, foreign format).
+        """
+        try:
+            raw = serialization.loads(data)
+            return cls(
+                timestamp=datetime.fromisoformat(raw['timestamp']),
+                result=PhoneCheckResult.from_dict(raw['result']),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid cache entry: {e!r}") from e
 
 
 class CacheManager:
-    def __init__(self, cache_dir: str = '.cache', expire_after: int = 3600):
+    """Two-tier cache of verification results, keyed by platform.
+
+    Each (platform, number) pair is cached on its own with a TTL that can
+    be set per platform, so a check only needs to query the platforms
+    whose result is missing or stale.
+
+    In write-behind mode, set() only updates the memory tier and queues
+    the encoded entries; they are written to the backend in batches once
+    ``flush_size`` entries are pending or ``flush_interval`` seconds after
+    the first queued write, and by flush() and close().
+
+    Expired entries are dropped when they are read. With a
+    ``sweep_interval``, a background task also removes them from both
+    tiers, examining at most ``sweep_budget`` stored entries per pass.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = '.cache',
+        expire_after: int = 3600,
+        backend: Union[str, CacheBackend] = DEFAULT_BACKEND,
+        warm_up: int = 0,
+        memory_max_entries: Optional[int] = 10000,
+        memory_max_bytes: Optional[int] = None,
+        platform_ttls: Optional[Dict[str, int]] = None,
+        write_behind: bool = False,
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+        sweep_interval: Optional[float] = None,
+        sweep_budget: int = 1000,
+    ):
         """Initialize the cache manager.
 
         Args:
-            cache_dir: Directory to store cache files.
+            cache_dir: Directory to store cache files (a CacheBackend
+                instance uses its own).
             expire_after: Cache validity duration in seconds (default: 1 hour).
+            backend: Storage backend name ('sqlite' or 'json') or a
+                CacheBackend instance.
+            warm_up: Number of entries to load in memory in the background
+                after initialization (0 disables the warm-up).
+            memory_max_entries: Maximum number of entries kept in memory.
+            memory_max_bytes: Approximate memory budget in bytes for the
+                in-memory tier (None: only the entry count is bounded).
+            platform_ttls: Validity duration in seconds per platform,
+                overriding ``expire_after`` (e.g. {'whatsapp': 86400}).
+            write_behind: Buffer writes and store them in batches.
+            flush_size: Pending entries that trigger a flush (write-behind).
+            flush_interval: Maximum delay in seconds before a pending
+                entry is written (write-behind).
+            sweep_interval: Seconds between two passes of the expiry
+                sweeper (None disables it).
+            sweep_budget: Maximum number of entries examined per pass.
         """
+        if isinstance(backend, str) and backend not in AVAILABLE_BACKENDS:
+            raise ValueError(f"Unknown cache backend: {backend}")
         self.cache_dir = Path(cache_dir)
         self.expire_after = expire_after
-        self.cache_data: Dict[str, Any] = {}
+        self.platform_ttls: Dict[str, int] = dict(platform_ttls or {})
+        self.backend_name = backend if isinstance(backend, str) else None
+        self.backend: Optional[CacheBackend] = (
+            backend if isinstance(backend, CacheBackend) else None
+        )
+        self.warm_up = warm_up
+        self.cache_data = LRUCache(
+            max_entries=memory_max_entries, max_bytes=memory_max_bytes
+        )
+        self.backend_hits = 0
+        self.backend_misses = 0
+        self._warm_up_task: Optional[asyncio.Future] = None
+        self.write_behind = write_behind
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        # Encoded entries waiting to be written, by cache key
+        self._pending: Dict[str, CacheItem] = {}
+        self._flush_task: Optional[asyncio.Future] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.sweep_interval = sweep_interval
+        self.sweep_budget = sweep_budget
+        self._sweep_task: Optional[asyncio.Future] = None
 
     async def initialize(self):
-        """Create the cache directory if needed and load existing data."""
+        """Create the cache directory if needed and open the backend.
+
+        Entries are read lazily by get(), so this returns immediately
+        whatever the size of the cache. If a warm-up was requested, it
+        runs as a background task.
+        """
         await self._ensure_cache_dir()
-        await self._load_cache()
+        await self._get_backend()
+        if self.warm_up > 0 and self._warm_up_task is None:
+            self._warm_up_task = asyncio.ensure_future(self._load_cache())
+        if self.sweep_interval and self._sweep_task is None:
+            self._sweep_task = asyncio.ensure_future(self._sweep_forever())
 
     async def _ensure_cache_dir(self):
-        """Ensure the cache directory exists."""
-        if not self.cache_dir.exists():
-            await aiofiles.os.makedirs(str(self.cache_dir))
+        """Ensure the directory of the backend exists, if it has one."""
+        cache_dir = (
+            self.backend.cache_dir if self.backend is not None
+            else self.cache_dir
+        )
+        if cache_dir is not None and not cache_dir.exists():
+            # Other processes sharing the directory may create it too
+            await aiofiles.os.makedirs(str(cache_dir), exist_ok=True)
+
+    async def _get_backend(self) -> CacheBackend:
+        """Return the storage backend, opening it on first use."""
+        if self.backend is None:
+            await self._ensure_cache_dir()
+            backend_class = AVAILABLE_BACKENDS[self.backend_name]
+            self.backend = backend_class(self.cache_dir)
+        await self.backend.open()
+        return self.backend
+
+    async def close(self):
+        """Stop the warm-up, write pending entries and close the backend.
+
+        Raises:
+            Exception: Pending entries could not be written (the backend
+                is closed anyway).
+        """
+        for name in ('_warm_up_task', '_sweep_task', '_flush_task'):
+            task = getattr(self, name)
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                setattr(self, name, None)
+        try:
+            await self.flush()
+        finally:
+            if self.backend is not None:
+                await self.backend.close()
 
-    def _get_cache_file(self, phone: str, country_code: str) -> Path:
-        """Generate the cache file path for a given number."""
-        cache_key = f"{country_code}_{phone}"
-        return self.cache_dir / f"{cache_key}.json"
+    def _get_flush_lock(self) -> asyncio.Lock:
+        # Created lazily so the lock binds to the running event loop
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    async def flush(self):
+        """Write every pending entry to the backend in one batch.
+
+        If the write fails, the entries stay pending (unless they were
+        overwritten in the meantime) and the error is raised.
+        """
+        async with self._get_flush_lock():
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            stats = metrics.registry()
+            try:
+                backend = await self._get_backend()
+                with stats.time("phone_checker_cache_flush_seconds"):
+                    await backend.set_many(list(batch.values()))
+            except BaseException:
+                # Newer writes of the same keys take precedence
+                self._pending = {**batch, **self._pending}
+                raise
+            stats.inc("phone_checker_cache_flushed_entries_total", len(batch))
+
+    def _schedule_flush(self):
+        """Make sure pending entries are written within flush_interval."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(
+                self._flush_after_interval()
+            )
+
+    async def _flush_after_interval(self):
+        await asyncio.sleep(self.flush_interval)
+        # Writes queued during this flush schedule the next one
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning("Error while writing cache entries: %s", e)
+            self._schedule_flush()
+
+    async def sweep(self, limit: Optional[int] = None) -> int:
+        """Remove expired entries from memory and from the backend.
+
+        Args:
+            limit: Maximum number of entries examined in each tier
+                (``sweep_budget`` if None).
+
+        Returns:
+            Number of entries removed from the backend.
+        """
+        limit = limit or self.sweep_budget
+        self.cache_data.purge_expired(limit)
+        backend = await self._get_backend()
+        removed = await backend.delete_expired(time.time(), limit)
+        metrics.registry().inc("phone_checker_cache_swept_total", removed)
+        return removed
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning("Error while sweeping cache: %s", e)
+
+    async def compact(self) -> int:
+        """Remove every expired entry and reclaim the freed disk space.
+
+        Returns:
+            Number of entries removed from the backend.
+        """
+        await self.flush()
+        self.cache_data.purge_expired()
+        backend = await self._get_backend()
+        removed = await backend.delete_expired(time.time())
+        await backend.compact()
+        return removed
+
+    async def storage_stats(self) -> Dict[str, Any]:
+        """Describe the entries stored in the backend.
+
+        Returns:
+            Dict with the number of ``entries`` (``live`` and
+            ``expired``), the disk ``size_bytes``, the entry count per
+            platform and the distribution of entry ages (``age``).
+        """
+        backend = await self._get_backend()
+        now = time.time()
+        entries = expired = 0
+        platforms: Dict[str, int] = {}
+        ages = {label: 0 for _, label in AGE_BUCKETS}
+        async for batch in backend.iter_expiries():
+            for cache_key, expires_at in batch:
+                platform = self._key_platform(cache_key)
+                entries += 1
+                expired += expires_at <= now
+                platforms[platform] = platforms.get(platform, 0) + 1
+                age = now - (expires_at - self.ttl_for(platform))
+                label = next(
+                    label for bound, label in AGE_BUCKETS if age < bound
+                )
+                ages[label] += 1
+        return {
+            'entries': entries,
+            'live': entries - expired,
+            'expired': expired,
+            'size_bytes': await backend.size_bytes(),
+            'platforms': platforms,
+            'age': ages,
+        }
 
     async def _load_cache(self):
-        """Load existing cache data from disk."""
+        """Load up to ``warm_up`` entries from disk into memory."""
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                async with aiofiles.open(cache_file, mode='r') as f:
-                    content = await f.read()
-                    self.cache_data[cache_file.stem] = json.loads(content)
+            entries = await self.backend.load_entries(self.warm_up)
         except Exception as e:
-            print(f"Error while loading cache: {e}")
+            logger.warning("Error while loading cache: %s", e)
+            return
+        for cache_key, data in entries.items():
+            # Never overwrite entries set or read since startup
+            if cache_key not in self.cache_data:
+                platform = self._key_platform(cache_key)
+                try:
+                    entry = CacheEntry.decode(data)
+                except ValueError:
+                    # Dropped when get() reads it
+                    continue
+                self.cache_data.set(
+                    cache_key, entry, self._expires_at(entry, platform)
+                )
+
+    @staticmethod
+    def _make_key(phone: str, country_code: str, platform: str) -> str:
+        """Build the cache key of a (platform, number) pair."""
+        return f"{platform}_{country_code}_{phone}"
+
+    @staticmethod
+    def _key_platform(cache_key: str) -> str:
+        """Return the platform of a key built by _make_key()."""
+        # Numbers and country codes are digits, platform names may
+        # contain underscores
+        return cache_key.rsplit('_', 2)[0]
+
+    def ttl_for(self, platform: str) -> int:
+        """Return the validity duration in seconds of a platform's results."""
+        return self.platform_ttls.get(platform, self.expire_after)
+
+    def _expires_at(self, entry: CacheEntry, platform: str) -> float:
+        """Return the expiry time (epoch) of a cache entry."""
+        return entry.timestamp.timestamp() + self.ttl_for(platform)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters of both cache tiers."""
+        memory = self.cache_data.stats
+        return {
+            'memory_hits': memory.hits,
+            'memory_misses': memory.misses,
+            'backend_hits': self.backend_hits,
+            'backend_misses': self.backend_misses,
+            'evictions': memory.evictions,
+            'expirations': memory.expirations,
+            'memory_entries': len(self.cache_data),
+            'memory_bytes': self.cache_data.size_bytes,
+            'pending_writes': len(self._pending),
+        }
 
-    def _calculate_freshness_score(self, timestamp: datetime) -> float:
+    def _calculate_freshness_score(
+        self,
+        timestamp: datetime,
+        ttl: Optional[int] = None
+    ) -> float:
         """Calculate a freshness score for cached data.
 
         The score ranges from 1.0 (very fresh) to 0.0 (expired).
         """
+        ttl = ttl or self.expire_after
         age = (datetime.now() - timestamp).total_seconds()
-        return max(0.0, 1.0 - (age / self.expire_after))
+        return max(0.0, 1.0 - (age / ttl))
 
     async def get(
         self,
         phone: str,
-        country_code: str
-    ) -> Optional[Dict[str, PhoneCheckResult]]:
-        """Retrieve cached results for a phone number.
+        country_code: str,
+        platforms: Iterable[str]
+    ) -> Dict[str, Tuple[PhoneCheckResult, float]]:
+        """Retrieve the fresh cached results of a number.
+
+        Entries are decoded once when they are read from the backend;
+        every call then returns fresh copies of the results, so callers
+        may annotate them without altering the cache.
+
+        Args:
+            phone: Phone number without country code.
+            country_code: Country code.
+            platforms: Platforms to look up.
 
         Returns:
-            Cached results if valid, otherwise None.
+            Mapping of platform to (result, freshness score) for every
+            requested platform with a valid cached result. Platforms
+            missing from the mapping must be checked again.
         """
-        cache_key = f"{country_code}_{phone}"
-        cached_data = self.cache_data.get(cache_key)
+        with metrics.registry().time("phone_checker_cache_lookup_seconds"):
+            return await self._get(phone, country_code, platforms)
 
-        if not cached_data:
-            return None
+    async def _get(
+        self,
+        phone: str,
+        country_code: str,
+        platforms: Iterable[str]
+    ) -> Dict[str, Tuple[PhoneCheckResult, float]]:
+        """Implementation of get, without instrumentation."""
+        stats = metrics.registry()
+        entries: Dict[str, CacheEntry] = {}
+        missing: Dict[str, str] = {}
+        for platform in platforms:
+            cache_key = self._make_key(phone, country_code, platform)
+            entry = self.cache_data.get(cache_key)
+            if entry is None:
+                missing[cache_key] = platform
+            else:
+                entries[platform] = entry
+        if entries:
+            stats.inc(
+                "phone_checker_cache_hits_total", len(entries), tier="memory"
+            )
 
-        timestamp = datetime.fromisoformat(cached_data['timestamp'])
-        freshness = self._calculate_freshness_score(timestamp)
+        if missing:
+            backend = await self._get_backend()
+            # Pending writes may already be gone from the memory tier
+            stored = {
+                cache_key: self._pending[cache_key][1]
+                for cache_key in missing if cache_key in self._pending
+            }
+            unwritten = [k for k in missing if k not in stored]
+            if unwritten:
+                stored.update(await backend.get_many(unwritten))
+            for cache_key, data in list(stored.items()):
+                platform = missing[cache_key]
+                try:
+                    entry = CacheEntry.decode(data)
+                except ValueError as e:
+                    # Unreadable entries are misses, checked again
+                    logger.warning(
+                        "Dropping unreadable cache entry %s: %s", cache_key, e
+                    )
+                    del stored[cache_key]
+                    await backend.delete(cache_key)
+                    continue
+                self.cache_data.set(
+                    cache_key, entry, self._expires_at(entry, platform)
+                )
+                entries[platform] = entry
+            self.backend_misses += len(missing) - len(stored)
+            self.backend_hits += len(stored)
+            if stored:
+                stats.inc(
+                    "phone_checker_cache_hits_total", len(stored),
+                    tier="backend"
+                )
+            if len(missing) > len(stored):
+                stats.inc(
+                    "phone_checker_cache_misses_total",
+                    len(missing) - len(stored)
+                )
 
-        if freshness <= 0:
-            await self.invalidate(phone, country_code)
-            return None
+        found = {}
+        expired = []
+        for platform, entry in entries.items():
+            freshness = self._calculate_freshness_score(
+                entry.timestamp, self.ttl_for(platform)
+            )
+            if freshness <= 0:
+                expired.append(platform)
+            else:
+                found[platform] = (entry.result.copy(), freshness)
 
-        cached_data['freshness_score'] = freshness
-        cached_data['results'] = {
-            platform: PhoneCheckResult(**data)
-            for platform, data in cached_data['results'].items()
-        }
-        return cached_data
+        if expired:
+            await self.invalidate(phone, country_code, expired)
+        return found
 
     async def set(
         self,
@@ -95,39 +664,71 @@ class CacheManager:
         country_code: str,
         results: Dict[str, PhoneCheckResult]
     ):
-        """Store verification results in cache for a phone number."""
-        cache_key = f"{country_code}_{phone}"
-        serializable_results = {}
-
-        for platform, result in results.items():
-            serializable_results[platform] = {
-                "platform": result.platform,
-                "exists": result.exists,
-                "username": result.username,
-                "error": result.error,
-                "timestamp": (
-                    result.timestamp.isoformat()
-                    if result.timestamp else None
-                ),
-                "metadata": result.metadata,
-            }
+        """Store verification results of a number, one entry per platform.
 
-        cache_data = {
-            'timestamp': datetime.now().isoformat(),
-            'results': serializable_results
-        }
+        Results carrying an error are not cached, so the platform is
+        queried again on the next check.
+        """
+        await self.set_many([(phone, country_code, results)])
 
-        self.cache_data[cache_key] = cache_data
+    async def set_many(self, items):
+        """Store results for several numbers in a single backend write.
 
-        cache_file = self._get_cache_file(phone, country_code)
-        async with aiofiles.open(cache_file, mode='w') as f:
-            await f.write(json.dumps(cache_data, indent=2))
+        Args:
+            items: Iterable of (phone, country_code, results) tuples.
+        """
+        batch = [
+            self._build_entry(phone, country_code, platform, result)
+            for phone, country_code, results in items
+            for platform, result in results.items()
+            if not result.error
+        ]
+        if not self.write_behind:
+            backend = await self._get_backend()
+            await backend.set_many(batch)
+            return
+        for item in batch:
+            self._pending[item[0]] = item
+        if len(self._pending) >= self.flush_size:
+            await self.flush()
+        elif self._pending:
+            self._schedule_flush()
+
+    def _build_entry(
+        self,
+        phone: str,
+        country_code: str,
+        platform: str,
+        result: PhoneCheckResult
+    ) -> CacheItem:
+        """Encode a result and remember it in memory."""
+        cache_key = self._make_key(phone, country_code, platform)
+        # Keep a private copy so later changes by the caller don't leak
+        entry = CacheEntry(timestamp=datetime.now(), result=result.copy())
+        expires_at = self._expires_at(entry, platform)
+        self.cache_data.set(cache_key, entry, expires_at)
+        return cache_key, entry.encode(), expires_at
 
-    async def invalidate(self, phone: str, country_code: str):
-        """Invalidate cache for a specific number."""
-        cache_key = f"{country_code}_{phone}"
-        self.cache_data.pop(cache_key, None)
+    async def invalidate(
+        self,
+        phone: str,
+        country_code: str,
+        platforms: Optional[Iterable[str]] = None
+    ):
+        """Invalidate cache for a specific number.
 
-        cache_file = self._get_cache_file(phone, country_code)
-        if cache_file.exists():
-            await aiofiles.os.remove(str(cache_file))
+        Args:
+            phone: Phone number without country code.
+            country_code: Country code.
+            platforms: Platforms to invalidate (all known ones if None).
+        """
+        if platforms is None:
+            platforms = list(AVAILABLE_CHECKERS) + list(self.platform_ttls)
+        backend = await self._get_backend()
+        # Wait for a flush in progress, which could write the entries back
+        async with self._get_flush_lock():
+            for platform in set(platforms):
+                cache_key = self._make_key(phone, country_code, platform)
+                self.cache_data.pop(cache_key)
+                self._pending.pop(cache_key, None)
+                await backend.delete(cache_key)
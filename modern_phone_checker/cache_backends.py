@@ -0,0 +1,492 @@
+"""Storage backends for the caching system.
+
+A backend only knows how to persist and retrieve encoded cache entries
+(bytes) by key; decoding, freshness and expiry decisions are made by
+the CacheManager. Backends do keep the expiry time of each entry, so
+expired entries can be swept without decoding them. Two backends are
+provided:
+- ``sqlite``: a single SQLite database in WAL mode (default)
+- ``json``: one JSON file per cached number (legacy format)
+
+RedisBackend keeps the entries on a Redis-protocol server instead, so
+several processes or hosts can share one cache. It needs a client, not a
+directory, and is therefore passed to the CacheManager as an instance
+(see shared_state.RedisStateStore).
+"""
+
+import asyncio
+import itertools
+import os
+import sqlite3
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional, Dict, List, Tuple
+
+import aiofiles
+import aiofiles.os
+
+from .resp import RespClient
+
+# (key, encoded entry, expires_at) as accepted by CacheBackend.set_many
+CacheItem = Tuple[str, bytes, float]
+
+# (key, expires_at) as listed by CacheBackend.iter_expiries
+ExpiryItem = Tuple[str, float]
+
+
+class CacheBackend(ABC):
+    """Base class for all cache storage backends."""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Args:
+            cache_dir: Directory where the backend keeps its data (None
+                for backends storing nothing locally).
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+    async def open(self):
+        """Prepare the backend for use."""
+
+    async def close(self):
+        """Release resources held by the backend."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the entry stored under ``key``, or None."""
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Return the entries stored under ``keys`` (missing ones omitted)."""
+        entries = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                entries[key] = value
+        return entries
+
+    async def set(self, key: str, entry: bytes, expires_at: float):
+        """Store a single entry."""
+        await self.set_many([(key, entry, expires_at)])
+
+    @abstractmethod
+    async def set_many(self, items: List[CacheItem]):
+        """Store several entries at once."""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Remove the entry stored under ``key`` if present."""
+
+    async def load_entries(self, limit: int) -> Dict[str, bytes]:
+        """Return up to ``limit`` stored entries (used to warm up memory)."""
+        return {}
+
+    async def delete_expired(
+        self, now: float, limit: Optional[int] = None
+    ) -> int:
+        """Remove expired entries, examining at most ``limit`` of them.
+
+        Successive calls resume where the previous one stopped, so a
+        sweeper can go through a large store in small steps. Without a
+        ``limit``, every expired entry is removed.
+
+        Returns:
+            Number of entries removed.
+        """
+        return 0
+
+    async def iter_expiries(
+        self, batch_size: int = 10000
+    ) -> AsyncIterator[List[ExpiryItem]]:
+        """Yield the (key, expires_at) pairs of all entries, in batches."""
+        return
+        yield
+
+    async def size_bytes(self) -> int:
+        """Return the disk space used by the backend, in bytes."""
+        if self.cache_dir is None:
+            return 0
+        return sum(
+            f.stat().st_size for f in self.cache_dir.glob("*") if f.is_file()
+        )
+
+    async def compact(self):
+        """Give back the space freed by deleted entries, if applicable."""
+
+
+class JSONFileBackend(CacheBackend):
+    """Stores each entry in its own ``{key}.json`` file.
+
+    The expiry time of an entry is kept as the modification time of its
+    file. Files written by earlier versions carry their write time
+    instead, so they are swept as if they expired when written.
+
+    Entries are written to a temporary file and renamed over the old
+    one, so readers never see a partly written entry.
+    """
+
+    def __init__(self, cache_dir: Path):
+        super().__init__(cache_dir)
+        # Directory scan resumed by successive delete_expired calls
+        self._sweep_scan: Optional[Iterator[os.DirEntry]] = None
+
+    def _get_cache_file(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    async def _run(self, func, *args):
+        """Run blocking filesystem calls outside the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    def _scan(self) -> Iterator[os.DirEntry]:
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    yield entry
+
+    def _write_many(self, items: List[CacheItem]):
+        for key, entry, expires_at in items:
+            # Names without the .json suffix are skipped by _scan()
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f".{key}.", suffix=".tmp", dir=self.cache_dir
+            )
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(entry)
+                os.utime(tmp_path, (expires_at, expires_at))
+                os.replace(tmp_path, self._get_cache_file(key))
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+    async def get(self, key: str) -> Optional[bytes]:
+        cache_file = self._get_cache_file(key)
+        try:
+            async with aiofiles.open(cache_file, mode='rb') as f:
+                return await f.read()
+        except FileNotFoundError:
+            return None
+
+    async def set_many(self, items: List[CacheItem]):
+        if items:
+            await self._run(self._write_many, items)
+
+    async def delete(self, key: str):
+        cache_file = self._get_cache_file(key)
+        if cache_file.exists():
+            await aiofiles.os.remove(str(cache_file))
+
+    async def load_entries(self, limit: int) -> Dict[str, bytes]:
+        now = time.time()
+        entries = {}
+        # The scan is lazy, so only ``limit`` live entries are visited
+        live = (
+            entry for entry in self._scan()
+            if entry.stat().st_mtime > now
+        )
+        for dir_entry in itertools.islice(live, limit):
+            key = dir_entry.name[:-len(".json")]
+            entry = await self.get(key)
+            if entry is not None:
+                entries[key] = entry
+        return entries
+
+    def _delete_expired(self, now: float, limit: Optional[int]) -> int:
+        if self._sweep_scan is None or limit is None:
+            self._sweep_scan = self._scan()
+        removed = 0
+        steps = range(limit) if limit is not None else itertools.count()
+        for _ in steps:
+            entry = next(self._sweep_scan, None)
+            if entry is None:
+                # Next pass starts over from the beginning
+                self._sweep_scan = None
+                break
+            try:
+                if entry.stat().st_mtime <= now:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    async def delete_expired(
+        self, now: float, limit: Optional[int] = None
+    ) -> int:
+        return await self._run(self._delete_expired, now, limit)
+
+    def _list_expiries(self) -> List[ExpiryItem]:
+        items = []
+        for entry in self._scan():
+            try:
+                items.append((entry.name[:-len(".json")],
+                              entry.stat().st_mtime))
+            except FileNotFoundError:
+                pass
+        return items
+
+    async def iter_expiries(
+        self, batch_size: int = 10000
+    ) -> AsyncIterator[List[ExpiryItem]]:
+        items = await self._run(self._list_expiries)
+        for start in range(0, len(items), batch_size):
+            yield items[start:start + batch_size]
+
+    async def size_bytes(self) -> int:
+        return await self._run(
+            lambda: sum(entry.stat().st_size for entry in self._scan())
+        )
+
+
+class SQLiteBackend(CacheBackend):
+    """Stores all entries in a single SQLite database (WAL mode).
+
+    Entries are looked up on demand by their primary key, so nothing is
+    read at startup. The expiry time is kept in an indexed column to
+    allow expired rows to be found without decoding them. All database
+    access goes through a single worker thread so the event loop never
+    blocks on disk I/O.
+    """
+
+    filename = "cache.sqlite3"
+
+    def __init__(self, cache_dir: Path):
+        super().__init__(cache_dir)
+        self.path = self.cache_dir / self.filename
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _run(self, func, *args):
+        """Run a blocking database call on the backend's thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _connect(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " expires_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at"
+            " ON cache_entries (expires_at)"
+        )
+        conn.commit()
+        self._conn = conn
+
+    async def open(self):
+        if self._conn is not None:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="phone-checker-cache"
+        )
+        await self._run(self._connect)
+
+    async def close(self):
+        if self._conn is None:
+            return
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=True)
+        self._conn = None
+        self._executor = None
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = self._conn.execute(
+            "SELECT value FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _get_many(self, keys: List[str]) -> List[Tuple[str, bytes]]:
+        placeholders = ", ".join("?" * len(keys))
+        return self._conn.execute(
+            "SELECT key, value FROM cache_entries"
+            f" WHERE key IN ({placeholders})",
+            keys,
+        ).fetchall()
+
+    def _set_many(self, rows: List[CacheItem]):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries"
+                " (key, value, expires_at) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def _load_entries(self, limit: int) -> List[Tuple[str, bytes]]:
+        # Entries expiring last are the most recently written ones
+        return self._conn.execute(
+            "SELECT key, value FROM cache_entries WHERE expires_at > ?"
+            " ORDER BY expires_at DESC LIMIT ?",
+            (time.time(), limit),
+        ).fetchall()
+
+    def _delete(self, key: str):
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE key = ?", (key,)
+            )
+
+    def _delete_expired(self, now: float, limit: Optional[int]) -> int:
+        # The expires_at index makes this proportional to ``limit``
+        # (a negative LIMIT means no limit in SQLite)
+        if limit is None:
+            limit = -1
+        with self._conn:
+            return self._conn.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                " SELECT key FROM cache_entries WHERE expires_at <= ?"
+                " LIMIT ?)",
+                (now, limit),
+            ).rowcount
+
+    def _list_expiries(
+        self, after: str, batch_size: int
+    ) -> List[ExpiryItem]:
+        return self._conn.execute(
+            "SELECT key, expires_at FROM cache_entries WHERE key > ?"
+            " ORDER BY key LIMIT ?",
+            (after, batch_size),
+        ).fetchall()
+
+    def _compact(self):
+        self._conn.execute("VACUUM")
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _size_bytes(self) -> int:
+        return sum(
+            path.stat().st_size
+            for path in self.cache_dir.glob(self.filename + "*")
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._run(self._get, key)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        if not keys:
+            return {}
+        return dict(await self._run(self._get_many, keys))
+
+    async def set_many(self, items: List[CacheItem]):
+        if items:
+            await self._run(self._set_many, items)
+
+    async def delete(self, key: str):
+        await self._run(self._delete, key)
+
+    async def load_entries(self, limit: int) -> Dict[str, bytes]:
+        rows = await self._run(self._load_entries, limit)
+        return dict(rows)
+
+    async def delete_expired(
+        self, now: float, limit: Optional[int] = None
+    ) -> int:
+        return await self._run(self._delete_expired, now, limit)
+
+    async def iter_expiries(
+        self, batch_size: int = 10000
+    ) -> AsyncIterator[List[ExpiryItem]]:
+        after = ""
+        while True:
+            rows = await self._run(self._list_expiries, after, batch_size)
+            if not rows:
+                return
+            yield rows
+            after = rows[-1][0]
+
+    async def size_bytes(self) -> int:
+        return await self._run(self._size_bytes)
+
+    async def compact(self):
+        await self._run(self._compact)
+
+
+class RedisBackend(CacheBackend):
+    """Stores entries on a Redis-protocol server, under a key prefix.
+
+    Every entry is written with its remaining lifetime, so the server
+    removes expired entries itself and nothing is left to sweep.
+    """
+
+    def __init__(self, client: RespClient, prefix: str = "phone_checker:"):
+        """
+        Args:
+            client: Connection to the server (owned by the caller).
+            prefix: Prefix of the keys, shared by every process using
+                the same cache.
+        """
+        # Nothing is stored locally
+        super().__init__()
+        self.client = client
+        self.prefix = prefix + "cache:"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.execute("GET", self.prefix + key)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        if not keys:
+            return {}
+        values = await self.client.execute(
+            "MGET", *(self.prefix + key for key in keys)
+        )
+        return {
+            key: value for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    async def set_many(self, items: List[CacheItem]):
+        now = time.time()
+        commands = []
+        for key, value, expires_at in items:
+            ttl = int((expires_at - now) * 1000)
+            if ttl > 0:
+                commands.append(("SET", self.prefix + key, value, "PX", ttl))
+        for reply in await self.client.pipeline(commands):
+            if isinstance(reply, Exception):
+                raise reply
+
+    async def delete(self, key: str):
+        await self.client.execute("DEL", self.prefix + key)
+
+    async def iter_expiries(
+        self, batch_size: int = 10000
+    ) -> AsyncIterator[List[ExpiryItem]]:
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.client.execute(
+                "SCAN", cursor, "MATCH", self.prefix + "*",
+                "COUNT", batch_size,
+            )
+            if keys:
+                now = time.time()
+                ttls = await self.client.pipeline(
+                    [("PTTL", key) for key in keys]
+                )
+                # Keys that expired in between report a negative TTL
+                yield [
+                    (key.decode()[len(self.prefix):], now + ttl / 1000)
+                    for key, ttl in zip(keys, ttls)
+                    if isinstance(ttl, int) and ttl >= 0
+                ]
+            if cursor in (b"0", "0"):
+                return
+
+    async def size_bytes(self) -> int:
+        """Not tracked: the memory is used on the server."""
+        return 0
+
+
+# Mapping of available backends
+AVAILABLE_BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'json': JSONFileBackend,
+}
+
+DEFAULT_BACKEND = 'sqlite'
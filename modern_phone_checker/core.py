@@ -5,13 +5,97 @@ the core logic of the application, including the caching system.
 """
 
 import asyncio
-from typing import List, Optional, Dict, Any
+import itertools
+import logging
+from contextlib import AsyncExitStack
+from typing import (
+    List, Optional, Dict, Any, Tuple, Union, Iterable, AsyncIterable,
+    AsyncIterator, Set,
+)
 import httpx
 
-from .models import PhoneCheckResult
+from .http_client import HTTPConfig, create_http_client
+from . import metrics
+from .confidence import ConfidenceScorer
+from .models import PhoneCheckResult, BulkCheckResult
 from .platforms import AVAILABLE_CHECKERS, DEFAULT_PLATFORMS
+from .platforms.base import BaseChecker
 from .cache import CacheManager
-from .utils import validate_phone_number, clean_phone_number
+from .resilience import CircuitBreaker, RetryPolicy
+from .phone_numbers import normalize_batch, normalize_phone_number
+from .utils import clean_phone_number, RateLimiter, SingleFlight
+
+# Background refreshes report here: stdout may carry the results
+logger = logging.getLogger(__name__)
+
+NumberSource = Union[
+    Iterable[Tuple[str, str]], AsyncIterable[Tuple[str, str]]
+]
+
+# Marker pushed by each bulk worker once it has no more work
+_WORKER_DONE = object()
+
+# Input numbers validated at once by check_numbers
+_VALIDATION_CHUNK = 1000
+
+
+async def _iterate_numbers(
+    numbers: NumberSource
+) -> AsyncIterator[Tuple[str, str]]:
+    """Iterates over a sync or async source of (phone, country_code)."""
+    if hasattr(numbers, '__aiter__'):
+        async for item in numbers:
+            yield item
+    else:
+        for item in numbers:
+            yield item
+
+
+async def _iterate_chunks(
+    numbers: NumberSource, size: int
+) -> AsyncIterator[List[Tuple[str, str]]]:
+    """Groups a sync or async source of numbers in lists of up to ``size``.
+
+    With an async source, a partial chunk is yielded as soon as the next
+    number is not available right away, so numbers are never held back
+    while the source is slow.
+    """
+    if not hasattr(numbers, '__aiter__'):
+        iterator = iter(numbers)
+        while True:
+            chunk = list(itertools.islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
+    iterator = numbers.__aiter__()
+    chunk: List[Tuple[str, str]] = []
+    next_item = None
+    try:
+        while True:
+            next_item = asyncio.ensure_future(iterator.__anext__())
+            if chunk:
+                # One loop iteration is enough for a buffered number
+                await asyncio.sleep(0)
+                if not next_item.done():
+                    yield chunk
+                    chunk = []
+            try:
+                chunk.append(await next_item)
+            except StopAsyncIteration:
+                break
+            except Exception:
+                # Numbers read before the error are still checked
+                if chunk:
+                    yield chunk
+                raise
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        if next_item is not None and not next_item.done():
+            next_item.cancel()
 
 
 class PhoneChecker:
@@ -24,6 +108,17 @@ class PhoneChecker:
         platforms: Optional[List[str]] = None,
         use_cache: bool = True,
         cache_expire: int = 3600,
+        cache_backend: str = 'sqlite',
+        cache_ttls: Optional[Dict[str, int]] = None,
+        cache_write_behind: bool = False,
+        rate_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+        rate_limiters: Optional[Dict[str, RateLimiter]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        http_config: Optional[HTTPConfig] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        scorer: Optional[ConfidenceScorer] = None,
+        refresh_ahead: Optional[float] = None,
+        max_refreshes: int = 100,
     ):
         """
         Initializes the checker with the specified options.
@@ -34,18 +129,65 @@ class PhoneChecker:
             platforms: List of platforms to check (all if None).
             use_cache: Whether to enable caching.
             cache_expire: Cache expiration duration in seconds.
+            cache_backend: Storage backend of the cache created when no
+                ``cache`` is given ('sqlite' or 'json').
+            cache_ttls: Cache expiration per platform in seconds,
+                overriding ``cache_expire`` (e.g. {'whatsapp': 86400}).
+            cache_write_behind: Batch the writes of the cache created when
+                no ``cache`` is given (see CacheManager).
+            rate_limits: (calls, period in seconds) per platform,
+                overriding each checker's default rate limit.
+            rate_limiters: Rate limiters per platform, e.g. shared with
+                other checkers or processes (take precedence over
+                ``rate_limits``).
+            client: Optional shared httpx.AsyncClient (see
+                create_http_client). It is not closed by close().
+            http_config: Connection pool and timeout settings.
+            retry_policy: Retry policy applied to every platform request.
+            scorer: ConfidenceScorer updated with the outcome of every
+                platform request (a new one if None).
+            refresh_ahead: Freshness score (0-1) below which a cached
+                result is returned at once and refreshed in the
+                background (None disables refresh-ahead).
+            max_refreshes: Maximum number of background refreshes
+                running at the same time; past it, stale results are
+                served without scheduling another refresh.
         """
-        # Create an HTTPX AsyncClient (no proxies argument)
-        self.client = httpx.AsyncClient()
+        self.http_config = http_config or HTTPConfig()
+        # Use the shared HTTP client or open a dedicated pool
+        self._owns_client = client is None
+        self.client = client or create_http_client(self.http_config)
+        self._host_limits: Optional[Dict[str, asyncio.Semaphore]] = None
         self.checkers: Dict[str, Any] = {}
         self.api_key = api_key
+        # Coalesces concurrent checks of the same (platform, number)
+        self._in_flight = SingleFlight()
         self.use_cache = use_cache
+        self.rate_limits = rate_limits or {}
+        self.rate_limiters = rate_limiters or {}
+        self.retry_policy = retry_policy
+        self.scorer = scorer or ConfidenceScorer()
+        # One circuit breaker per platform
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.refresh_ahead = refresh_ahead
+        self.max_refreshes = max_refreshes
+        # Background refreshes and the (platform, country, phone) keys
+        # they are refreshing
+        self._refresh_tasks: Set[asyncio.Future] = set()
+        self._refreshing: Set[Tuple[str, str, str]] = set()
 
         # Use provided cache manager or create a new one
+        self._owns_cache = False
         if cache is not None:
             self.cache = cache
         elif use_cache:
-            self.cache = CacheManager(expire_after=cache_expire)
+            self.cache = CacheManager(
+                expire_after=cache_expire,
+                backend=cache_backend,
+                platform_ttls=cache_ttls,
+                write_behind=cache_write_behind,
+            )
+            self._owns_cache = True
 
         # Instantiate platform-specific checkers
         self._initialize_checkers(platforms or DEFAULT_PLATFORMS)
@@ -55,23 +197,113 @@ class PhoneChecker:
         if self.use_cache:
             await self.cache.initialize()
 
+    async def __aenter__(self) -> "PhoneChecker":
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
     def _initialize_checkers(self, platforms: List[str]):
         """Initializes the checkers for the selected platforms."""
         for platform in platforms:
             if platform in AVAILABLE_CHECKERS:
                 checker_class = AVAILABLE_CHECKERS[platform]
+                options = {}
+                if issubclass(checker_class, BaseChecker):
+                    breaker = self.circuit_breakers.setdefault(
+                        platform, CircuitBreaker()
+                    )
+                    options.update(
+                        retry_policy=self.retry_policy,
+                        circuit_breaker=breaker,
+                        scorer=self.scorer,
+                    )
+                if platform in self.http_config.platform_timeouts:
+                    options['timeout'] = self.http_config.timeout(platform)
+                if platform in self.rate_limiters:
+                    options['rate_limiter'] = self.rate_limiters[platform]
+                elif platform in self.rate_limits:
+                    options['rate_limiter'] = RateLimiter(
+                        *self.rate_limits[platform]
+                    )
                 # Pass client, api_key, and cache to each checker
                 self.checkers[platform] = checker_class(
                     client=self.client,
                     api_key=self.api_key,
-                    cache=self.cache if self.use_cache else None
+                    cache=self.cache if self.use_cache else None,
+                    **options
+                )
+
+    async def _run_checker(
+        self,
+        platform: str,
+        checker: Any,
+        phone: str,
+        country_code: str,
+        platform_limits: Optional[Dict[str, asyncio.Semaphore]] = None
+    ) -> PhoneCheckResult:
+        """Runs one platform checker, honouring its concurrency limits."""
+        stats = metrics.registry()
+        with stats.time(
+            "phone_checker_platform_check_seconds", platform=platform
+        ):
+            try:
+                async with AsyncExitStack() as stack:
+                    for limits in (self._get_host_limits(), platform_limits):
+                        if limits:
+                            await stack.enter_async_context(limits[platform])
+                    result = await checker.check(phone, country_code)
+            except Exception:
+                stats.inc(
+                    "phone_checker_platform_errors_total", platform=platform
                 )
+                raise
+        if getattr(result, "error", None):
+            stats.inc("phone_checker_platform_errors_total", platform=platform)
+        return result
+
+    def _get_host_limits(self) -> Optional[Dict[str, asyncio.Semaphore]]:
+        """Return the per-platform connection semaphores, if configured."""
+        per_host = self.http_config.max_connections_per_host
+        if per_host and self._host_limits is None:
+            # Created lazily so they belong to the running event loop
+            self._host_limits = {
+                platform: asyncio.Semaphore(per_host)
+                for platform in self.checkers
+            }
+        return self._host_limits
+
+    async def _check_platform(
+        self,
+        platform: str,
+        phone: str,
+        country_code: str,
+        platform_limits: Optional[Dict[str, asyncio.Semaphore]] = None
+    ) -> Tuple[PhoneCheckResult, bool]:
+        """Checks one platform, sharing the request with concurrent callers.
+
+        Returns:
+            Tuple of (result, leader). Only the leader, which actually
+            sent the request, should store the result in cache.
+        """
+        result, leader = await self._in_flight.do(
+            (platform, country_code, phone),
+            lambda: self._run_checker(
+                platform, self.checkers[platform], phone, country_code,
+                platform_limits
+            ),
+        )
+        if not leader and isinstance(result, PhoneCheckResult):
+            result = result.copy()
+        return result, leader
 
     async def check_number(
         self,
         phone: str,
         country_code: str,
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        platform_limits: Optional[Dict[str, asyncio.Semaphore]] = None
     ) -> List[PhoneCheckResult]:
         """Checks a phone (or email) across all configured platforms.
 
@@ -79,53 +311,267 @@ class PhoneChecker:
             phone: Phone number without country code.
             country_code: Country code (e.g. '33' for France).
             force_refresh: Force fresh verification even if cached.
+            platform_limits: Optional semaphores (one per platform) capping
+                the number of concurrent requests sent to each platform.
 
         Returns:
             List of results for each platform.
         """
-        # Validate the input number
-        if not validate_phone_number(phone, country_code):
-            raise ValueError(f"Invalid number: +{country_code}{phone}")
+        stats = metrics.registry()
+        stats.inc("phone_checker_checks_total")
+        with stats.track_in_flight("phone_checker_checks_in_flight"), \
+                stats.time("phone_checker_check_seconds"):
+            return await self._check_number(
+                phone, country_code, force_refresh, platform_limits
+            )
 
-        clean_number = clean_phone_number(phone)
+    async def _check_number(
+        self,
+        phone: str,
+        country_code: str,
+        force_refresh: bool,
+        platform_limits: Optional[Dict[str, asyncio.Semaphore]]
+    ) -> List[PhoneCheckResult]:
+        """Implementation of check_number, without instrumentation."""
+        # Validate the input number; +CC input sets the country
+        normalized = normalize_phone_number(phone, country_code)
+        if normalized is None:
+            raise ValueError(f"Invalid number: +{country_code}{phone}")
+        country_code, clean_number = normalized
 
-        # Return cached results if fresh
+        # Reuse fresh cached results, platform by platform
+        results: Dict[str, PhoneCheckResult] = {}
+        stale = []
         if self.use_cache and not force_refresh:
-            cached = await self.cache.get(clean_number, country_code)
-            if cached:
-                results = []
-                for res in cached['results'].values():
-                    if res.metadata is None:
-                        res.metadata = {}
-                    res.metadata['cached'] = True
-                    res.metadata['freshness_score'] = cached['freshness_score']
-                    results.append(res)
-                return results
-
-        # Perform all checks in parallel
+            cached = await self.cache.get(
+                clean_number, country_code, self.checkers
+            )
+            for platform, (res, freshness) in cached.items():
+                if res.metadata is None:
+                    res.metadata = {}
+                res.metadata['cached'] = True
+                res.metadata['freshness_score'] = freshness
+                results[platform] = res
+                if self.refresh_ahead is not None and (
+                    freshness < self.refresh_ahead
+                ):
+                    stale.append(platform)
+        if stale:
+            self._schedule_refresh(
+                stale, clean_number, country_code, platform_limits
+            )
+
+        # Check the remaining platforms in parallel
+        missing = [
+            platform for platform in self.checkers if platform not in results
+        ]
+        if missing:
+            results.update(await self._fetch_platforms(
+                missing, clean_number, country_code, platform_limits
+            ))
+
+        return [
+            results[platform] for platform in self.checkers
+            if platform in results
+        ]
+
+    async def _fetch_platforms(
+        self,
+        platforms: List[str],
+        phone: str,
+        country_code: str,
+        platform_limits: Optional[Dict[str, asyncio.Semaphore]]
+    ) -> Dict[str, PhoneCheckResult]:
+        """Checks platforms in parallel and caches the new results."""
         tasks = [
-            checker.check(clean_number, country_code)
-            for checker in self.checkers.values()
+            self._check_platform(
+                platform, phone, country_code, platform_limits
+            )
+            for platform in platforms
         ]
         raw_results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Filter valid PhoneCheckResult objects
-        valid_results = [
-            r for r in raw_results if isinstance(r, PhoneCheckResult)
-        ]
+        # Keep valid PhoneCheckResult objects only
+        fresh_results = {}
+        led_results = {}
+        for platform, outcome in zip(platforms, raw_results):
+            if isinstance(outcome, BaseException):
+                continue
+            result, leader = outcome
+            if isinstance(result, PhoneCheckResult):
+                fresh_results[platform] = result
+                if leader:
+                    led_results[platform] = result
 
-        # Save fresh results to cache
-        if self.use_cache:
-            results_dict = {r.platform: r for r in valid_results}
-            await self.cache.set(clean_number, country_code, results_dict)
+        # Save fresh results to cache (once per coalesced request)
+        if self.use_cache and led_results:
+            await self.cache.set(phone, country_code, led_results)
+        return fresh_results
+
+    def _schedule_refresh(
+        self,
+        platforms: List[str],
+        phone: str,
+        country_code: str,
+        platform_limits: Optional[Dict[str, asyncio.Semaphore]]
+    ):
+        """Refreshes stale cached results in the background.
+
+        Platforms already being refreshed are skipped, and nothing is
+        scheduled once ``max_refreshes`` refreshes are running.
+        """
+        keys = {
+            platform: (platform, country_code, phone)
+            for platform in platforms
+            if (platform, country_code, phone) not in self._refreshing
+        }
+        if not keys or len(self._refresh_tasks) >= self.max_refreshes:
+            return
+        self._refreshing.update(keys.values())
+        metrics.registry().inc("phone_checker_refreshes_total", len(keys))
+
+        async def refresh():
+            try:
+                await self._fetch_platforms(
+                    list(keys), phone, country_code, platform_limits
+                )
+            except Exception as e:
+                logger.warning(
+                    "Error while refreshing +%s%s: %s", country_code, phone, e
+                )
+            finally:
+                self._refreshing.difference_update(keys.values())
 
-        return valid_results
+        task = asyncio.ensure_future(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def check_numbers(
+        self,
+        numbers: NumberSource,
+        concurrency: int = 50,
+        per_platform_limit: Optional[int] = None,
+        force_refresh: bool = False
+    ) -> AsyncIterator[BulkCheckResult]:
+        """Checks many numbers with bounded concurrency.
+
+        Numbers are pulled lazily from ``numbers`` so that memory use
+        stays flat regardless of the input size. Results are yielded in
+        completion order, not input order.
+
+        Args:
+            numbers: Sync or async iterable of (phone, country_code) pairs.
+            concurrency: Maximum number of numbers checked at once.
+            per_platform_limit: Maximum concurrent requests per platform
+                (unbounded if None).
+            force_refresh: Force fresh verification even if cached.
+
+        Yields:
+            One BulkCheckResult per input number. Invalid numbers and
+            failed checks are reported through its ``error`` field.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        platform_limits = None
+        if per_platform_limit:
+            platform_limits = {
+                platform: asyncio.Semaphore(per_platform_limit)
+                for platform in self.checkers
+            }
+
+        # Both queues are bounded so the input is never read far ahead
+        # of the workers and finished results wait for the consumer.
+        pending: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        finished: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+        async def feed():
+            try:
+                # Numbers are validated a chunk at a time, before any
+                # request is sent for them
+                async for chunk in _iterate_chunks(
+                    numbers, _VALIDATION_CHUNK
+                ):
+                    for (phone, country_code), normalized in zip(
+                        chunk, normalize_batch(chunk)
+                    ):
+                        # Invalid numbers never take a worker
+                        if normalized is None:
+                            await finished.put(BulkCheckResult(
+                                phone, country_code, [],
+                                error=(
+                                    f"Invalid number: +{country_code}{phone}"
+                                ),
+                            ))
+                            continue
+                        await pending.put((phone, country_code, normalized))
+            finally:
+                for _ in range(concurrency):
+                    await pending.put(None)
+
+        async def work():
+            while True:
+                item = await pending.get()
+                if item is None:
+                    break
+                phone, country_code, (checked_code, national) = item
+                try:
+                    # The normalized form skips the slow parsing paths
+                    results = await self.check_number(
+                        national,
+                        checked_code,
+                        force_refresh=force_refresh,
+                        platform_limits=platform_limits,
+                    )
+                    outcome = BulkCheckResult(phone, country_code, results)
+                except Exception as e:
+                    outcome = BulkCheckResult(
+                        phone, country_code, [], error=str(e)
+                    )
+                await finished.put(outcome)
+            await finished.put(_WORKER_DONE)
+
+        feeder = asyncio.ensure_future(feed())
+        workers = [
+            asyncio.ensure_future(work()) for _ in range(concurrency)
+        ]
+        try:
+            remaining = concurrency
+            while remaining:
+                outcome = await finished.get()
+                if outcome is _WORKER_DONE:
+                    remaining -= 1
+                    continue
+                yield outcome
+            # Surface errors raised while reading the input
+            await feeder
+        finally:
+            for task in [feeder, *workers]:
+                task.cancel()
+            await asyncio.gather(feeder, *workers, return_exceptions=True)
 
     async def invalidate_cache(self, phone: str, country_code: str):
         """Invalidates the cache for a specific number."""
         if self.use_cache:
-            await self.cache.invalidate(phone, country_code)
+            country_code, clean_number = normalize_phone_number(
+                phone, country_code
+            ) or (country_code, clean_phone_number(phone))
+            await self.cache.invalidate(
+                clean_number, country_code, self.checkers
+            )
 
     async def close(self):
-        """Properly closes HTTP connections."""
-        await self.client.aclose()
+        """Properly closes owned HTTP connections and cache.
+
+        Background refreshes still running are cancelled, and pending
+        cache writes are flushed, even to a shared cache.
+        """
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+        if self._owns_client:
+            await self.client.aclose()
+        if self._owns_cache:
+            await self.cache.close()
+        elif self.use_cache:
+            await self.cache.flush()
@@ -1,25 +1,99 @@
 """EmailChecker: syntax + MX record validation returning PhoneCheckResult."""
 
+import asyncio
+import itertools
 import re
-import dns.resolver
+import time
 from datetime import datetime
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+import dns.asyncresolver
+import dns.resolver
 
+from .cache import LRUCache
 from .models import PhoneCheckResult
+from .utils import SingleFlight
+
+EMAIL_REGEX = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+# Answers meaning the domain has no MX record (safe to cache). Not
+# NoNameservers: every server failing (e.g. SERVFAIL) is transient.
+NEGATIVE_ANSWERS = (
+    dns.resolver.NXDOMAIN,
+    dns.resolver.NoAnswer,
+)
+
+# (valid_mx, error) outcome of an MX lookup
+MXOutcome = Tuple[bool, Optional[str]]
 
 
 class EmailChecker:
-    """Checks an email address for valid syntax and MX records."""
+    """Checks an email address for valid syntax and MX records.
+
+    MX lookups are asynchronous and cached per domain: positive answers
+    for the TTL of the DNS record, negative ones (no such domain, no MX)
+    for ``negative_ttl`` seconds. Concurrent lookups of the same domain
+    share a single DNS query.
+    """
 
-    def __init__(self, api_key: str = None, cache=None):
+    def __init__(
+        self,
+        api_key: str = None,
+        cache=None,
+        resolver: Optional[dns.asyncresolver.Resolver] = None,
+        negative_ttl: int = 300,
+        mx_cache_size: int = 10000,
+    ):
         """
         Args:
             api_key: Optional API key for premium email-verification services.
             cache: Optional CacheManager (not used in this simple checker).
+            resolver: Optional dns.asyncresolver.Resolver to use.
+            negative_ttl: Seconds a missing domain/MX answer is cached.
+            mx_cache_size: Maximum number of domains kept in the MX cache.
         """
         self.api_key = api_key
         self.cache = cache
+        self.negative_ttl = negative_ttl
+        self.mx_cache = LRUCache(max_entries=mx_cache_size)
+        self._resolver = resolver
+        self._lookups = SingleFlight()
+
+    @property
+    def resolver(self) -> dns.asyncresolver.Resolver:
+        """DNS resolver, created on first use."""
+        if self._resolver is None:
+            self._resolver = dns.asyncresolver.Resolver()
+        return self._resolver
+
+    async def _lookup_mx(self, domain: str) -> MXOutcome:
+        """Query the MX records of a domain and cache the outcome."""
+        try:
+            answers = await self.resolver.resolve(domain, "MX")
+        except NEGATIVE_ANSWERS as e:
+            outcome, ttl = (False, str(e)), self.negative_ttl
+        except Exception as e:
+            # Timeouts and other transient failures are not cached
+            return False, str(e)
+        else:
+            ttl = answers.rrset.ttl if answers.rrset is not None else 0
+            outcome = (len(answers) > 0, None)
+        if ttl > 0:
+            self.mx_cache.set(domain, outcome, time.time() + ttl)
+        return outcome
+
+    async def resolve_mx(self, domain: str) -> MXOutcome:
+        """Return (valid_mx, error) for a domain, using the MX cache."""
+        domain = domain.lower()
+        cached = self.mx_cache.get(domain)
+        if cached is not None:
+            return cached
+        outcome, _ = await self._lookups.do(
+            domain, lambda: self._lookup_mx(domain)
+        )
+        return outcome
 
-    def check(self, email: str) -> PhoneCheckResult:
+    async def check(self, email: str) -> PhoneCheckResult:
         """
         Perform a two-step email check:
           1) Regex syntax validation.
@@ -34,19 +108,22 @@ class EmailChecker:
               - timestamp=datetime.now()
         """
         # 1) Syntax check
-        regex = r"[^@]+@[^@]+\.[^@]+"
-        syntax_ok = bool(re.fullmatch(regex, email))
+        syntax_ok = bool(EMAIL_REGEX.fullmatch(email))
 
         # 2) MX check
-        valid_mx = False
-        error = None
+        outcome = (False, None)
         if syntax_ok:
-            try:
-                domain = email.split("@", 1)[1]
-                answers = dns.resolver.resolve(domain, "MX")
-                valid_mx = len(answers) > 0
-            except Exception as e:
-                error = str(e)
+            domain = email.split("@", 1)[1]
+            outcome = await self.resolve_mx(domain)
+        return self._make_result(syntax_ok, outcome)
+
+    def _make_result(
+        self,
+        syntax_ok: bool,
+        outcome: MXOutcome
+    ) -> PhoneCheckResult:
+        """Build the result of an email check."""
+        valid_mx, error = outcome
 
         # Build metadata dict
         metadata = {
@@ -62,3 +139,53 @@ class EmailChecker:
             error=error,
             timestamp=datetime.now()
         )
+
+    async def check_many(
+        self,
+        emails: Iterable[str],
+        concurrency: int = 100,
+        chunk_size: int = 10000,
+    ) -> AsyncIterator[PhoneCheckResult]:
+        """Check many addresses, resolving each distinct domain once.
+
+        Addresses are processed in chunks so memory stays bounded; the
+        distinct domains of a chunk that are not cached yet are resolved
+        concurrently before its results are produced.
+
+        Args:
+            emails: Iterable of email addresses.
+            concurrency: Maximum number of DNS queries in flight.
+            chunk_size: Number of addresses read ahead at a time.
+
+        Yields:
+            One PhoneCheckResult per address, in input order.
+        """
+        limit = asyncio.Semaphore(concurrency)
+
+        async def resolve(domain: str) -> MXOutcome:
+            async with limit:
+                return await self.resolve_mx(domain)
+
+        emails = iter(emails)
+        while True:
+            chunk = list(itertools.islice(emails, chunk_size))
+            if not chunk:
+                return
+            # Domain of each address (None when the syntax is invalid)
+            domains = [
+                email.split("@", 1)[1].lower()
+                if EMAIL_REGEX.fullmatch(email) else None
+                for email in chunk
+            ]
+            distinct = list(set(filter(None, domains)))
+            # Outcomes are kept for the whole chunk, so even uncacheable
+            # failures are only looked up once per domain
+            outcomes = dict(zip(
+                distinct,
+                await asyncio.gather(*[resolve(d) for d in distinct]),
+            ))
+            for domain in domains:
+                if domain is None:
+                    yield self._make_result(False, (False, None))
+                else:
+                    yield self._make_result(True, outcomes[domain])
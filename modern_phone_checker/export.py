@@ -0,0 +1,230 @@
+"""Parquet export of bulk check results.
+
+ParquetDatasetWriter turns the outcomes of PhoneChecker.check_numbers
+into a Hive-partitioned Parquet dataset:
+
+    results/
+        country_code=33/date=2024-05-01/part-3f9c2a1b-00000.parquet
+        country_code=33/date=2024-05-01/part-3f9c2a1b-00001.parquet
+        country_code=1/date=2024-05-01/part-3f9c2a1b-00000.parquet
+
+Rows are buffered per partition in ResultBatch columns and written as
+one row group per part file once a partition holds ``row_group_size``
+rows, so memory stays bounded whatever the size of the run. Parts are
+written under a temporary name, synced to disk and renamed once
+complete: an interrupted run, even by a crash of the host, leaves only
+complete parts behind, and a writer opened again on the same directory
+appends new parts next to them.
+
+Each write can carry a token, handed back by take_durable() once the
+row is in a complete part synced to disk. A checkpointed job uses this
+to record only the numbers whose rows are on disk, without forcing
+partial row groups out at every checkpoint.
+
+Needs pyarrow (``pip install modern_phone_checker[arrow]``).
+"""
+
+import asyncio
+import os
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from . import metrics
+from .batch import ResultBatch, require_pyarrow
+from .models import BulkCheckResult
+
+# Directory levels of the dataset, outermost first
+PARTITION_COLUMNS = ("country_code", "date")
+
+# (country code, ISO date) identifying a partition
+PartitionKey = Tuple[str, str]
+
+
+def partition_key(outcome: BulkCheckResult) -> PartitionKey:
+    """Partition of an outcome: its country code and UTC check date.
+
+    Outcomes without results (invalid numbers) are dated today.
+    """
+    checked_at = (
+        outcome.results[0].timestamp if outcome.results else None
+    ) or datetime.now()
+    date = checked_at.astimezone(timezone.utc).date().isoformat()
+    return outcome.country_code, date
+
+
+class ParquetDatasetWriter:
+    """Write bulk outcomes to a partitioned Parquet dataset.
+
+    Example:
+        >>> async with ParquetDatasetWriter("results") as writer:
+        ...     async for outcome in checker.check_numbers(numbers):
+        ...         await writer.write(outcome)
+    """
+
+    def __init__(
+        self,
+        root: str,
+        row_group_size: int = 100_000,
+        max_buffered_rows: int = 1_000_000,
+        compression: str = "zstd",
+    ):
+        """
+        Args:
+            root: Directory of the dataset (created if needed).
+            row_group_size: Rows written per part file (one row group).
+            max_buffered_rows: Rows held in memory across all partitions;
+                beyond it the largest partition is written early.
+            compression: Parquet compression codec.
+        """
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be positive")
+        self.root = Path(root)
+        self.row_group_size = row_group_size
+        self.max_buffered_rows = max(max_buffered_rows, row_group_size)
+        self.compression = compression
+        self.rows_written = 0
+        self.parts_written = 0
+        # Parts of this writer never collide with earlier or concurrent
+        # writers of the same dataset
+        self._token = uuid.uuid4().hex[:8]
+        self._sequence = 0
+        self._buffers: Dict[PartitionKey, ResultBatch] = {}
+        # Tokens of the buffered outcomes, and of the written ones not
+        # yet taken by take_durable()
+        self._tokens: Dict[PartitionKey, List[Any]] = {}
+        self._durable: List[Any] = []
+        self._buffered_rows = 0
+        self._parquet = None
+
+    async def __aenter__(self) -> "ParquetDatasetWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _partition_dir(self, key: PartitionKey) -> Path:
+        parts = [f"{name}={value}" for name, value in
+                 zip(PARTITION_COLUMNS, key)]
+        return self.root.joinpath(*parts)
+
+    async def write(self, outcome: BulkCheckResult, token: Any = None):
+        """Buffer one outcome, writing a row group when one is full.
+
+        Args:
+            outcome: Outcome to store.
+            token: Optional value returned by take_durable() once the
+                rows of the outcome are written.
+        """
+        if self._parquet is None:
+            require_pyarrow()
+            import pyarrow.parquet
+            self._parquet = pyarrow.parquet
+        key = partition_key(outcome)
+        batch = self._buffers.get(key)
+        if batch is None:
+            batch = self._buffers[key] = ResultBatch()
+        before = len(batch)
+        batch.append_bulk(outcome)
+        self._buffered_rows += len(batch) - before
+        if token is not None:
+            self._tokens.setdefault(key, []).append(token)
+
+        if len(batch) >= self.row_group_size:
+            await self._write_partition(key)
+        elif self._buffered_rows > self.max_buffered_rows:
+            largest = max(self._buffers, key=lambda k: len(self._buffers[k]))
+            await self._write_partition(largest)
+
+    def take_durable(self) -> List[Any]:
+        """Return the tokens of the outcomes written since the last call."""
+        durable, self._durable = self._durable, []
+        return durable
+
+    async def flush(self):
+        """Write every buffered row, one part per partition."""
+        for key in list(self._buffers):
+            await self._write_partition(key)
+
+    async def close(self):
+        """Write the remaining rows."""
+        await self.flush()
+
+    async def _write_partition(self, key: PartitionKey):
+        batch = self._buffers.pop(key, None)
+        tokens = self._tokens.pop(key, [])
+        if not batch:
+            return
+        self._buffered_rows -= len(batch)
+        name = f"part-{self._token}-{self._sequence:05d}.parquet"
+        self._sequence += 1
+        loop = asyncio.get_running_loop()
+        with metrics.registry().time("phone_checker_export_write_seconds"):
+            await loop.run_in_executor(
+                None, self._write_part, self._partition_dir(key), name, batch
+            )
+        self.rows_written += len(batch)
+        self.parts_written += 1
+        self._durable.extend(tokens)
+        metrics.registry().inc("phone_checker_export_rows_total", len(batch))
+
+    def _write_part(self, directory: Path, name: str, batch: ResultBatch):
+        table = batch.to_arrow()
+        # The partition directory already records the country code
+        table = table.remove_column(
+            table.schema.get_field_index("country_code")
+        )
+        created = []
+        parent = directory
+        while not parent.exists():
+            created.append(parent)
+            parent = parent.parent
+        directory.mkdir(parents=True, exist_ok=True)
+        # Readers skip names starting with "." until the part is complete
+        tmp_path = directory / f".{name}.tmp"
+        with open(tmp_path, "wb") as f:
+            self._parquet.write_table(
+                table,
+                f,
+                row_group_size=len(table),
+                compression=self.compression,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, directory / name)
+        # The rename, and the new partition directories, survive a crash
+        # only once the directories listing them are synced too
+        _fsync_directory(directory)
+        for path in created:
+            _fsync_directory(path.parent)
+
+
+def _fsync_directory(path: Path):
+    """Flush the entries of a directory to disk, where supported."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_dataset(root: str):
+    """Read a dataset written by ParquetDatasetWriter as a pyarrow Table.
+
+    The partition columns come back as strings.
+    """
+    pa = require_pyarrow()
+    import pyarrow.dataset as ds
+
+    partitioning = ds.partitioning(
+        pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]),
+        flavor="hive",
+    )
+    return ds.dataset(
+        str(root), format="parquet", partitioning=partitioning
+    ).to_table()
@@ -0,0 +1,87 @@
+"""HTTP connection pool configuration.
+
+This module builds the httpx.AsyncClient used by the checkers. A single
+client (and therefore a single connection pool) can be shared by many
+PhoneChecker instances to avoid connection churn and repeated TLS
+handshakes.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+
+@dataclass
+class HTTPConfig:
+    """Connection pool and timeout settings.
+
+    Attributes:
+        max_connections: Maximum number of open connections
+        max_keepalive_connections: Idle connections kept for reuse
+        keepalive_expiry: Seconds an idle connection is kept open
+        max_connections_per_host: Maximum concurrent requests per platform
+            (None: only bounded by max_connections)
+        http2: Use HTTP/2 when the server supports it (needs ``h2``)
+        connect_timeout: Seconds allowed to establish a connection
+        read_timeout: Seconds allowed between two received chunks
+        write_timeout: Seconds allowed to send the request
+        pool_timeout: Seconds allowed to wait for a free connection
+        platform_timeouts: (connect, read) timeouts per platform,
+            overriding the global ones
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    max_connections_per_host: Optional[int] = None
+    http2: bool = False
+    connect_timeout: float = 5.0
+    read_timeout: float = 10.0
+    write_timeout: float = 10.0
+    pool_timeout: float = 5.0
+    platform_timeouts: Dict[str, Tuple[float, float]] = field(
+        default_factory=dict
+    )
+
+    def limits(self) -> httpx.Limits:
+        """Return the connection pool limits."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self, platform: Optional[str] = None) -> httpx.Timeout:
+        """Return the timeouts to use, optionally for a given platform."""
+        connect, read = self.platform_timeouts.get(
+            platform, (self.connect_timeout, self.read_timeout)
+        )
+        return httpx.Timeout(
+            connect=connect,
+            read=read,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+def create_http_client(
+    config: Optional[HTTPConfig] = None,
+    **kwargs
+) -> httpx.AsyncClient:
+    """Create an AsyncClient with a tuned connection pool.
+
+    Args:
+        config: Pool and timeout settings (defaults if None).
+        **kwargs: Extra arguments passed to httpx.AsyncClient.
+
+    Returns:
+        A client that can be shared by several PhoneChecker instances.
+    """
+    config = config or HTTPConfig()
+    return httpx.AsyncClient(
+        limits=config.limits(),
+        timeout=config.timeout(),
+        http2=config.http2,
+        **kwargs
+    )
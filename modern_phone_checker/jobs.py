@@ -0,0 +1,278 @@
+"""Resumable bulk checks.
+
+A CheckpointedJob runs PhoneChecker.check_numbers while recording its
+progress in a checkpoint log, so that a job interrupted at number 800k
+of 1M restarts where it stopped instead of from the beginning.
+
+The log is an append-only file of JSON lines, each written (and synced
+to disk) for a batch of completed numbers:
+
+    {"offset": 1200, "done": [[1203, "33:612345678"], ...]}
+
+``offset`` is the number of input items that are all completed; ``done``
+lists the numbers completed beyond it, by input position and key,
+since results arrive in completion order. A number only counts as
+completed once the consumer has taken its result, and the
+``on_checkpoint`` callback runs before each record is written so
+outputs can be flushed first. Numbers that were in flight when the job
+stopped are checked again, usually from the cache.
+
+Flushing a buffered output at every checkpoint can be costly (e.g.
+Parquet row groups cut short). Such outputs can instead report which
+results they stored durably through ``durable``: a number then counts
+as completed once reported, and only the final checkpoint of a run
+waits for ``on_checkpoint``.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List,
+    Optional, Tuple,
+)
+
+from .core import NumberSource, PhoneChecker, _iterate_numbers
+from .models import BulkCheckResult
+
+
+class CheckpointMismatchError(Exception):
+    """Raised when the input differs from the one recorded in a log."""
+
+
+def job_key(phone: str, country_code: str) -> str:
+    """Key identifying a number in the checkpoint log."""
+    return f"{country_code}:{phone}"
+
+
+class CheckpointLog:
+    """Durable record of the progress of a bulk job.
+
+    Attributes:
+        offset: Number of leading input items all completed.
+        done: Completed items beyond ``offset``, by input position.
+        finished: True once the whole input was completed.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: File holding the log (created if needed).
+        """
+        self.path = Path(path)
+        self.offset = 0
+        self.done: Dict[int, str] = {}
+        self.finished = False
+
+    def load(self):
+        """Read the log, then rewrite it as a single record.
+
+        A torn last line (the process died while writing it) is
+        ignored: its numbers are simply checked again.
+        """
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    self.offset = max(self.offset, record["offset"])
+                    self.done.update(
+                        (index, key) for index, key in record["done"]
+                    )
+                    self.finished = record.get("finished", False)
+            self.done = {
+                index: key for index, key in self.done.items()
+                if index >= self.offset
+            }
+        # Compact the log so it does not grow across restarts
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self._record(sorted(self.done.items())))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _record(self, done: List[Tuple[int, str]]) -> str:
+        record: Dict[str, Any] = {"offset": self.offset, "done": done}
+        if self.finished:
+            record["finished"] = True
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    def append(self, done: List[Tuple[int, str]]):
+        """Durably record a batch of completed items."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(self._record(done))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class CheckpointedJob:
+    """Bulk check that can be resumed after an interruption.
+
+    Example:
+        >>> job = CheckpointedJob(checker, "job.checkpoint")
+        >>> async for outcome in job.run(numbers, concurrency=100):
+        ...     print(outcome.to_dict())
+
+    Run it again with the same input and checkpoint file to continue.
+    """
+
+    def __init__(
+        self,
+        checker: PhoneChecker,
+        checkpoint_path: str,
+        checkpoint_every: int = 1000,
+        checkpoint_interval: float = 5.0,
+        on_checkpoint: Optional[Callable[[], Awaitable[None]]] = None,
+        durable: Optional[Callable[[], Iterable[Tuple[int, str]]]] = None,
+    ):
+        """
+        Args:
+            checker: Initialized checker running the checks.
+            checkpoint_path: File of the checkpoint log.
+            checkpoint_every: Completed numbers per checkpoint record.
+            checkpoint_interval: Maximum seconds between two records
+                while numbers complete.
+            on_checkpoint: Coroutine function awaited before each record
+                is written, e.g. to flush the output of the results
+                (before the final record only, with ``durable``).
+            durable: Function returning the ``position`` of the results
+                durably stored since its last call; numbers then count
+                as completed once returned there instead of once taken
+                by the consumer.
+        """
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1")
+        self.checker = checker
+        self.log = CheckpointLog(checkpoint_path)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.on_checkpoint = on_checkpoint
+        self.durable = durable
+        # (input position, key) of the last outcome yielded by run()
+        self.position: Optional[Tuple[int, str]] = None
+        # Numbers skipped because an earlier run completed them
+        self.skipped = 0
+        # Numbers completed by this run
+        self.completed = 0
+        self._unrecorded: List[Tuple[int, str]] = []
+        # Outcomes yielded since the last checkpoint
+        self._since_checkpoint = 0
+        self._input_size: Optional[int] = None
+        self._last_checkpoint = time.monotonic()
+
+    async def run(
+        self, numbers: NumberSource, **kwargs
+    ) -> AsyncIterator[BulkCheckResult]:
+        """Check the numbers not completed by earlier runs.
+
+        Args:
+            numbers: The same input as the earlier runs of the job.
+            **kwargs: Passed to PhoneChecker.check_numbers.
+
+        Yields:
+            One BulkCheckResult per number still to check, in completion
+            order.
+
+        Raises:
+            CheckpointMismatchError: If the input differs from the one
+                recorded in the log.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.log.load)
+        # Input positions of the numbers in flight, by key
+        in_flight: Dict[str, Deque[int]] = {}
+
+        async def remaining():
+            index = -1
+            async for phone, country_code in _iterate_numbers(numbers):
+                index += 1
+                if index < self.log.offset:
+                    self.skipped += 1
+                    continue
+                key = job_key(phone, country_code)
+                recorded = self.log.done.get(index)
+                if recorded is not None:
+                    if recorded != key:
+                        raise CheckpointMismatchError(
+                            f"Input item {index} is {key}, the checkpoint "
+                            f"log recorded {recorded}"
+                        )
+                    self.skipped += 1
+                    continue
+                in_flight.setdefault(key, deque()).append(index)
+                yield phone, country_code
+            self._input_size = index + 1
+
+        try:
+            async for outcome in self.checker.check_numbers(
+                remaining(), **kwargs
+            ):
+                key = job_key(outcome.phone, outcome.country_code)
+                # Duplicated numbers are interchangeable
+                positions = in_flight[key]
+                index = positions.popleft()
+                if not positions:
+                    del in_flight[key]
+                self.position = index, key
+                yield outcome
+                self._since_checkpoint += 1
+                if self.durable is None:
+                    # The consumer is done with the result
+                    self._complete(index, key)
+                if self._checkpoint_due():
+                    await self.checkpoint()
+        finally:
+            await self.checkpoint(final=True)
+
+    def _complete(self, index: int, key: str):
+        self.completed += 1
+        self._unrecorded.append((index, key))
+        log = self.log
+        log.done[index] = key
+        while log.offset in log.done:
+            del log.done[log.offset]
+            log.offset += 1
+
+    def _checkpoint_due(self) -> bool:
+        return (
+            self._since_checkpoint >= self.checkpoint_every
+            or time.monotonic() - self._last_checkpoint
+            >= self.checkpoint_interval
+        )
+
+    async def checkpoint(self, final: bool = False):
+        """Record the numbers completed since the last checkpoint.
+
+        Args:
+            final: Last checkpoint of the run; with ``durable``, outputs
+                are flushed (``on_checkpoint``) only before this one.
+        """
+        if self.durable is not None:
+            if final and self.on_checkpoint is not None:
+                await self.on_checkpoint()
+            for index, key in self.durable():
+                self._complete(index, key)
+        if self._input_size is not None:
+            self.log.finished = self.log.offset >= self._input_size
+        self._since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+        if not self._unrecorded and not self.log.finished:
+            return
+        if self.durable is None and self.on_checkpoint is not None:
+            await self.on_checkpoint()
+        # Write-behind entries would be lost with the process
+        cache = getattr(self.checker, "cache", None)
+        if cache is not None:
+            await cache.flush()
+        offset = self.log.offset
+        done = [item for item in self._unrecorded if item[0] >= offset]
+        self._unrecorded = []
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.log.append, done)
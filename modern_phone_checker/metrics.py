@@ -0,0 +1,261 @@
+"""Lightweight metrics for the hot paths of the checker.
+
+Components record measurements through the process-wide registry
+returned by registry(). The default InMemoryMetrics keeps counters,
+gauges and latency histograms in process and renders them in the
+Prometheus text format; use set_registry() to plug another sink (or a
+NullMetrics to disable collection).
+"""
+
+import asyncio
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Help text of the metrics recorded by the package
+DESCRIPTIONS = {
+    "phone_checker_checks_total": "Numbers checked by PhoneChecker",
+    "phone_checker_check_seconds": "Duration of PhoneChecker.check_number",
+    "phone_checker_checks_in_flight": "Numbers currently being checked",
+    "phone_checker_refreshes_total":
+        "Platform results refreshed ahead of their expiry",
+    "phone_checker_platform_check_seconds":
+        "Duration of a platform check, limits included",
+    "phone_checker_platform_errors_total":
+        "Platform checks that returned an error",
+    "phone_checker_cache_lookup_seconds": "Duration of CacheManager.get",
+    "phone_checker_cache_hits_total": "Cache hits per tier",
+    "phone_checker_cache_misses_total": "Cache lookups that found nothing",
+    "phone_checker_cache_flush_seconds":
+        "Duration of a batched write of pending cache entries",
+    "phone_checker_cache_flushed_entries_total":
+        "Cache entries written by write-behind flushes",
+    "phone_checker_cache_swept_total":
+        "Expired cache entries removed by the sweeper",
+    "phone_checker_export_write_seconds":
+        "Duration of writing one Parquet part file",
+    "phone_checker_export_rows_total": "Result rows written to Parquet",
+    "phone_checker_rate_limit_wait_seconds":
+        "Time spent waiting for the rate limiter",
+    "phone_checker_http_request_seconds": "Latency of platform HTTP requests",
+    "phone_checker_http_requests_in_flight":
+        "Platform HTTP requests in progress",
+    "phone_checker_http_retries_total": "Platform HTTP requests retried",
+    "phone_checker_json_parse_seconds": "Time spent decoding JSON responses",
+}
+
+# Default histogram buckets (seconds)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class NullMetrics:
+    """Metrics sink that records nothing; base of all sinks."""
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        """Increment a counter."""
+
+    def add(self, name: str, value: float, **labels):
+        """Add ``value`` (possibly negative) to a gauge."""
+
+    def set(self, name: str, value: float, **labels):
+        """Set a gauge."""
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a value in a histogram."""
+
+    @contextmanager
+    def time(self, name: str, **labels) -> Iterator[None]:
+        """Record the duration of the ``with`` block in a histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def track_in_flight(self, name: str, **labels) -> Iterator[None]:
+        """Count the ``with`` block in a gauge while it runs."""
+        self.add(name, 1, **labels)
+        try:
+            yield
+        finally:
+            self.add(name, -1, **labels)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class InMemoryMetrics(NullMetrics):
+    """In-process metrics store with a Prometheus text exporter."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets: Upper bounds of the histogram buckets, in seconds.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        series = self.counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def add(self, name: str, value: float, **labels):
+        series = self.gauges.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        self.gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        series = self.histograms.setdefault(name, {})
+        key = _label_key(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = _Histogram(self.buckets)
+        histogram.observe(value)
+
+    def value(self, name: str, **labels) -> float:
+        """Return the current value of a counter or gauge (0 if unset)."""
+        key = _label_key(labels)
+        for store in (self.counters, self.gauges):
+            if name in store:
+                return store[name].get(key, 0.0)
+        return 0.0
+
+    def count(self, name: str, **labels) -> int:
+        """Return the number of values recorded in a histogram."""
+        histogram = self.histograms.get(name, {}).get(_label_key(labels))
+        return histogram.count if histogram else 0
+
+    def reset(self):
+        """Forget every recorded value."""
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str):
+            if name in DESCRIPTIONS:
+                lines.append(f"# HELP {name} {DESCRIPTIONS[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for kind, store in (("counter", self.counters),
+                            ("gauge", self.gauges)):
+            for name in sorted(store):
+                header(name, kind)
+                for key, value in sorted(store[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+        for name in sorted(self.histograms):
+            header(name, "histogram")
+            for key, histogram in sorted(self.histograms[name].items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    labels = _format_labels(key, f'le="{bound:g}"')
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _format_labels(key, 'le="+Inf"')
+                lines.append(f"{name}_bucket{labels} {histogram.count}")
+                lines.append(
+                    f"{name}_sum{_format_labels(key)} {histogram.sum:g}"
+                )
+                lines.append(
+                    f"{name}_count{_format_labels(key)} {histogram.count}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+_registry: NullMetrics = InMemoryMetrics()
+
+
+def registry() -> NullMetrics:
+    """Return the process-wide metrics sink."""
+    return _registry
+
+
+def set_registry(metrics: NullMetrics) -> NullMetrics:
+    """Replace the process-wide metrics sink and return the previous one."""
+    global _registry
+    previous, _registry = _registry, metrics
+    return previous
+
+
+async def start_metrics_server(
+    host: str = "127.0.0.1",
+    port: int = 9108,
+    metrics: Optional[InMemoryMetrics] = None,
+) -> asyncio.AbstractServer:
+    """Serve the metrics in text format on ``http://host:port/metrics``.
+
+    Args:
+        host: Interface to listen on.
+        port: TCP port to listen on.
+        metrics: Store to expose (the process-wide registry if None).
+
+    Returns:
+        The running server; close it with ``server.close()``.
+    """
+    async def handle(reader, writer):
+        try:
+            request_line = await reader.readline()
+            # Drain the request headers
+            while (await reader.readline()).strip():
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[1] == "/metrics":
+                source = metrics or registry()
+                body = source.render() if hasattr(source, "render") else ""
+                status = "200 OK"
+            else:
+                body, status = "Not Found\n", "404 Not Found"
+            payload = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
@@ -3,15 +3,119 @@
 This module defines the main data structures used in the application.
 """
 
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, fields, replace
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
+def _slotted(cls):
+    """Rebuild a dataclass with ``__slots__`` instead of a ``__dict__``.
+
+    Equivalent to ``dataclass(slots=True)``, which needs Python 3.10.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in names and key not in ('__dict__', '__weakref__')
+    }
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+class _ResultMethods:
+    """Behaviour shared by the mutable and frozen result types."""
+
+    __slots__ = ()
+
+    def __post_init__(self):
+        """Initialize the timestamp if not provided."""
+        if self.timestamp is None:
+            # object.__setattr__ also works on frozen instances
+            object.__setattr__(self, 'timestamp', datetime.now())
+
+    def __getstate__(self):
+        return [getattr(self, name) for name in self.__slots__]
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation of the result."""
+        return {
+            "platform": self.platform,
+            "exists": self.exists,
+            "error": self.error,
+            "username": self.username,
+            "last_seen": (
+                self.last_seen.isoformat() if self.last_seen else None
+            ),
+            "metadata": self.metadata,
+            "timestamp": (
+                self.timestamp.isoformat() if self.timestamp else None
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Build a result from the output of :meth:`to_dict`."""
+        last_seen = data.get("last_seen")
+        timestamp = data.get("timestamp")
+        return cls(
+            platform=data["platform"],
+            exists=data["exists"],
+            error=data.get("error"),
+            username=data.get("username"),
+            last_seen=(
+                datetime.fromisoformat(last_seen) if last_seen else None
+            ),
+            metadata=data.get("metadata"),
+            timestamp=(
+                datetime.fromisoformat(timestamp) if timestamp else None
+            ),
+        )
+
+    def copy(self):
+        """Return a copy that can be modified without affecting this one.
+
+        Only ``metadata`` is mutable in practice, so it is the only
+        field that is duplicated.
+        """
+        return replace(
+            self,
+            metadata=dict(self.metadata) if self.metadata else None,
+        )
+
+    def _convert(self, cls):
+        return cls(
+            platform=self.platform,
+            exists=self.exists,
+            error=self.error,
+            username=self.username,
+            last_seen=self.last_seen,
+            metadata=dict(self.metadata) if self.metadata else None,
+            timestamp=self.timestamp,
+        )
+
+    def freeze(self) -> "FrozenPhoneCheckResult":
+        """Return an immutable copy of the result."""
+        if isinstance(self, FrozenPhoneCheckResult):
+            return self
+        return self._convert(FrozenPhoneCheckResult)
+
+    def thaw(self) -> "PhoneCheckResult":
+        """Return a mutable copy of the result."""
+        return self._convert(PhoneCheckResult)
+
+
+@_slotted
 @dataclass
-class PhoneCheckResult:
+class PhoneCheckResult(_ResultMethods):
     """Result of a phone number check on a specific platform.
 
+    Instances use ``__slots__``, so they carry no per-instance
+    ``__dict__``; see :meth:`freeze` for an immutable copy.
+
     Attributes:
         platform: Name of the platform checked (e.g., 'whatsapp', 'telegram')
         exists: True if the number exists on the platform
@@ -29,7 +133,45 @@ class PhoneCheckResult:
     metadata: Optional[Dict[str, Any]] = None
     timestamp: datetime = None
 
-    def __post_init__(self):
-        """Initialize the timestamp if not provided."""
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+
+@_slotted
+@dataclass(frozen=True)
+class FrozenPhoneCheckResult(_ResultMethods):
+    """Immutable variant of :class:`PhoneCheckResult`.
+
+    Fields cannot be reassigned, which makes results safe to share
+    between consumers without copying. ``metadata`` is still a plain
+    dict: treat it as read-only.
+    """
+    platform: str
+    exists: bool
+    error: Optional[str] = None
+    username: Optional[str] = None
+    last_seen: Optional[datetime] = None
+    metadata: Optional[Dict[str, Any]] = None
+    timestamp: datetime = None
+
+
+@dataclass
+class BulkCheckResult:
+    """Outcome of a single number checked through a bulk run.
+
+    Attributes:
+        phone: Phone number as it was submitted (without country code)
+        country_code: Country code the number was checked against
+        results: Per-platform results (empty if the check failed)
+        error: Error message if the number could not be checked
+    """
+    phone: str
+    country_code: str
+    results: List[PhoneCheckResult]
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation of the outcome."""
+        return {
+            "phone": self.phone,
+            "country_code": self.country_code,
+            "error": self.error,
+            "results": [result.to_dict() for result in self.results],
+        }
@@ -0,0 +1,464 @@
+"""Table-driven validation and normalization of phone numbers.
+
+Every ITU calling code has a NumberingPlan giving the possible lengths
+of its national significant numbers (NSN), its national trunk prefix
+and, for a few countries, a stricter pattern. Patterns are compiled once
+at import time.
+
+Numbers are normalized to a (country_code, national_number) pair:
+- ``+CC...`` input is parsed as E.164, whatever the default country
+- national input may carry the trunk prefix (``0612345678`` in France)
+- spaces, dashes, dots and parentheses are ignored
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import (
+    Dict, Iterable, List, Optional, Pattern, Tuple,
+)
+
+# Calling code, regions, min and max NSN length, trunk prefix ("-": none)
+_PLANS_TABLE = """
+1 US,CA,PR,DO,JM,TT,BS,BB,AG,AI,BM,DM,GD,GU,KN,KY,LC,MP,MS,SX,TC,VC 10 10 1
+7 RU,KZ 10 10 8
+20 EG 8 10 0
+27 ZA 9 9 0
+30 GR 10 10 -
+31 NL 9 9 0
+32 BE 8 9 0
+33 FR 9 9 0
+34 ES 9 9 -
+36 HU 8 9 06
+39 IT,VA 6 11 -
+40 RO 9 9 0
+41 CH 9 9 0
+43 AT 4 13 0
+44 GB,GG,IM,JE 7 10 0
+45 DK 8 8 -
+46 SE 7 13 0
+47 NO,SJ 5 8 -
+48 PL 9 9 -
+49 DE 6 15 0
+51 PE 8 9 0
+52 MX 10 10 -
+53 CU 6 8 0
+54 AR 10 11 0
+55 BR 10 11 0
+56 CL 9 9 -
+57 CO 8 10 0
+58 VE 10 10 0
+60 MY 7 10 0
+61 AU,CX,CC 5 15 0
+62 ID 7 12 0
+63 PH 8 10 0
+64 NZ 8 10 0
+65 SG 8 8 -
+66 TH 8 9 0
+81 JP 9 10 0
+82 KR 8 10 0
+84 VN 9 10 0
+86 CN 7 12 0
+90 TR 10 10 0
+91 IN 10 10 0
+92 PK 9 10 0
+93 AF 9 9 0
+94 LK 9 9 0
+95 MM 7 10 0
+98 IR 10 10 0
+211 SS 9 9 0
+212 MA,EH 9 9 0
+213 DZ 8 9 0
+216 TN 8 8 -
+218 LY 9 9 0
+220 GM 7 7 -
+221 SN 9 9 -
+222 MR 8 8 -
+223 ML 8 8 -
+224 GN 8 9 -
+225 CI 8 10 -
+226 BF 8 8 -
+227 NE 8 8 -
+228 TG 8 8 -
+229 BJ 8 10 -
+230 MU 7 8 -
+231 LR 7 9 0
+232 SL 8 8 0
+233 GH 9 9 0
+234 NG 8 10 0
+235 TD 8 8 -
+236 CF 8 8 -
+237 CM 8 9 -
+238 CV 7 7 -
+239 ST 7 7 -
+240 GQ 9 9 -
+241 GA 7 8 -
+242 CG 9 9 -
+243 CD 9 9 0
+244 AO 9 9 -
+245 GW 7 9 -
+246 IO 7 7 -
+247 AC 4 5 -
+248 SC 7 7 -
+249 SD 9 9 0
+250 RW 9 9 0
+251 ET 9 9 0
+252 SO 7 9 0
+253 DJ 8 8 -
+254 KE 9 10 0
+255 TZ 9 9 0
+256 UG 9 9 0
+257 BI 8 8 -
+258 MZ 8 9 -
+260 ZM 9 9 0
+261 MG 9 9 0
+262 RE,YT 9 9 0
+263 ZW 5 10 0
+264 NA 7 10 0
+265 MW 7 9 0
+266 LS 8 8 -
+267 BW 7 8 -
+268 SZ 8 8 -
+269 KM 7 7 -
+290 SH,TA 4 5 -
+291 ER 7 7 0
+297 AW 7 7 -
+298 FO 6 6 -
+299 GL 6 6 -
+350 GI 8 8 -
+351 PT 9 9 -
+352 LU 4 11 -
+353 IE 7 10 0
+354 IS 7 9 -
+355 AL 8 9 0
+356 MT 8 8 -
+357 CY 8 8 -
+358 FI,AX 5 12 0
+359 BG 7 9 0
+370 LT 8 8 8
+371 LV 8 8 -
+372 EE 7 8 -
+373 MD 8 8 0
+374 AM 8 8 0
+375 BY 9 10 8
+376 AD 6 9 -
+377 MC 8 9 0
+378 SM 6 10 -
+380 UA 9 9 0
+381 RS 8 12 0
+382 ME 8 8 0
+383 XK 8 9 0
+385 HR 8 9 0
+386 SI 8 8 0
+387 BA 8 9 0
+389 MK 8 8 0
+420 CZ 9 9 -
+421 SK 9 9 0
+423 LI 7 9 -
+500 FK,GS 5 5 -
+501 BZ 7 7 -
+502 GT 8 8 -
+503 SV 7 8 -
+504 HN 8 8 -
+505 NI 8 8 -
+506 CR 8 8 -
+507 PA 7 8 -
+508 PM 6 6 0
+509 HT 8 8 -
+590 GP,BL,MF 9 9 0
+591 BO 8 8 0
+592 GY 7 7 -
+593 EC 8 9 0
+594 GF 9 9 0
+595 PY 6 9 0
+596 MQ 9 9 0
+597 SR 6 7 -
+598 UY 8 8 0
+599 CW,BQ 7 8 -
+670 TL 7 8 -
+672 NF 6 6 -
+673 BN 7 7 -
+674 NR 7 7 -
+675 PG 7 8 -
+676 TO 5 7 -
+677 SB 5 7 -
+678 VU 5 7 -
+679 FJ 7 7 -
+680 PW 7 7 -
+681 WF 6 9 -
+682 CK 5 5 -
+683 NU 4 7 -
+685 WS 5 10 -
+686 KI 5 8 -
+687 NC 6 6 -
+688 TV 5 7 -
+689 PF 6 8 -
+690 TK 4 7 -
+691 FM 7 7 -
+692 MH 7 7 1
+800 001 8 8 -
+808 001 8 8 -
+850 KP 8 10 0
+852 HK 8 8 -
+853 MO 8 8 -
+855 KH 8 9 0
+856 LA 8 10 0
+870 001 9 9 -
+878 001 12 12 -
+880 BD 8 10 0
+881 001 9 10 -
+882 001 7 12 -
+883 001 9 12 -
+886 TW 8 9 0
+888 001 11 11 -
+960 MV 7 7 -
+961 LB 7 8 0
+962 JO 8 9 0
+963 SY 8 9 0
+964 IQ 8 10 0
+965 KW 7 8 -
+966 SA 9 9 0
+967 YE 7 9 0
+968 OM 8 8 -
+970 PS 8 9 0
+971 AE 8 9 0
+972 IL 8 9 0
+973 BH 8 8 -
+974 QA 7 8 -
+975 BT 7 8 -
+976 MN 8 8 0
+977 NP 8 10 0
+979 001 9 9 -
+992 TJ 9 9 -
+993 TM 8 8 8
+994 AZ 9 9 0
+995 GE 9 9 0
+996 KG 9 9 0
+998 UZ 9 9 -
+"""
+
+# Stricter NSN patterns where the length alone accepts too much
+_PATTERNS = {
+    '33': r'[67]\d{8}',  # France: mobile numbers only
+    '1': r'[2-9]\d{2}[2-9]\d{6}',  # NANP: area code and exchange
+}
+
+# Deletes the separators people write in phone numbers
+_SEPARATORS = str.maketrans('', '', ' \t\r\n-.()/')
+# Same, keeping the newlines that separate numbers in normalize_batch
+_BATCH_SEPARATORS = str.maketrans('', '', ' \t\r-.()/')
+_DIGITS = re.compile(r'\d+', re.ASCII)
+
+# Longest calling code (codes are prefix-free, see split_calling_code)
+MAX_CALLING_CODE_LENGTH = 3
+
+# (country_code, national_number) of a normalized number
+NormalizedNumber = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class NumberingPlan:
+    """Numbering plan of one calling code.
+
+    Attributes:
+        country_code: ITU calling code (e.g. '33')
+        regions: ISO 3166 codes of the regions sharing the calling code
+            ('001' for non-geographic services)
+        min_length: Shortest national significant number
+        max_length: Longest national significant number
+        trunk_prefix: Prefix dialled before national numbers, if any
+        pattern: Regular expression a national significant number must
+            fully match (digits only)
+    """
+
+    country_code: str
+    regions: Tuple[str, ...]
+    min_length: int
+    max_length: int
+    trunk_prefix: Optional[str] = None
+    pattern: str = ''
+    regex: Pattern = field(init=False, repr=False, compare=False)
+    # Matches every valid number of a newline-separated list
+    scan_regex: Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        pattern = self.pattern or (
+            rf'\d{{{self.min_length},{self.max_length}}}'
+        )
+        object.__setattr__(self, 'pattern', pattern)
+        object.__setattr__(self, 'regex', re.compile(pattern, re.ASCII))
+        # Lines that are a trunk prefix and a valid NSN are left to
+        # national_number(), which strips the prefix
+        trunk = (
+            f'(?!{re.escape(self.trunk_prefix)}(?:{pattern})$)'
+            if self.trunk_prefix else ''
+        )
+        object.__setattr__(self, 'scan_regex', re.compile(
+            f'^{trunk}(?:{pattern})$', re.ASCII | re.MULTILINE
+        ))
+
+    def national_number(self, digits: str) -> Optional[str]:
+        """Return the NSN of a national number, or None if invalid.
+
+        ``digits`` may start with the trunk prefix. The prefix is
+        removed first: where the NSN length range also fits the prefix
+        (``0412345678`` in Australia), the number is taken as prefixed.
+        """
+        trunk = self.trunk_prefix
+        if trunk and digits.startswith(trunk):
+            national = digits[len(trunk):]
+            if self.regex.fullmatch(national):
+                return national
+        if self.regex.fullmatch(digits):
+            return digits
+        return None
+
+
+def _load_plans(table: str) -> Dict[str, NumberingPlan]:
+    plans = {}
+    for line in table.strip().splitlines():
+        code, regions, min_length, max_length, trunk = line.split()
+        plans[code] = NumberingPlan(
+            country_code=code,
+            regions=tuple(regions.split(',')),
+            min_length=int(min_length),
+            max_length=int(max_length),
+            trunk_prefix=None if trunk == '-' else trunk,
+            pattern=_PATTERNS.get(code, ''),
+        )
+    return plans
+
+
+NUMBERING_PLANS: Dict[str, NumberingPlan] = _load_plans(_PLANS_TABLE)
+
+
+def split_calling_code(digits: str) -> Optional[Tuple[str, str]]:
+    """Split international digits into (calling code, rest).
+
+    Calling codes form a prefix code (no code is the prefix of another),
+    so the first known prefix is the only possible one.
+    """
+    for length in range(1, MAX_CALLING_CODE_LENGTH + 1):
+        if digits[:length] in NUMBERING_PLANS:
+            return digits[:length], digits[length:]
+    return None
+
+
+def _digits(phone: str) -> Optional[str]:
+    """Strip separators; None if anything but digits remains."""
+    stripped = phone.translate(_SEPARATORS)
+    return stripped if _DIGITS.fullmatch(stripped) else None
+
+
+def parse_e164(number: str) -> Optional[NormalizedNumber]:
+    """Parse an international ``+CC...`` (or ``00CC...``) number.
+
+    Returns:
+        (country_code, national_number), or None if the number is not a
+        valid international number.
+    """
+    number = number.strip()
+    if number.startswith('+'):
+        digits = _digits(number[1:])
+    elif number.startswith('00'):
+        digits = _digits(number[2:])
+    else:
+        return None
+    if not digits:
+        return None
+    split = split_calling_code(digits)
+    if split is None:
+        return None
+    code, rest = split
+    # National prefixes are not dialled after the calling code, except
+    # for the rare numbers that start with the trunk digit themselves
+    if NUMBERING_PLANS[code].regex.fullmatch(rest):
+        return code, rest
+    return None
+
+
+def normalize_phone_number(
+    phone: str,
+    country_code: Optional[str] = None,
+) -> Optional[NormalizedNumber]:
+    """Validate a phone number and return its normalized form.
+
+    Args:
+        phone: National number (with or without trunk prefix and
+            separators) or international number starting with ``+``.
+        country_code: Calling code of national numbers (e.g. '33').
+            International numbers carry their own and ignore it.
+
+    Returns:
+        (country_code, national_number), or None if the number is
+        invalid.
+    """
+    if phone.lstrip().startswith('+'):
+        return parse_e164(phone)
+    plan = NUMBERING_PLANS.get(country_code) if country_code else None
+    digits = _digits(phone)
+    if plan is None or digits is None:
+        return None
+    national = plan.national_number(digits)
+    if national is None:
+        # Written with the international call prefix instead of "+"
+        return parse_e164(phone)
+    return country_code, national
+
+
+def normalize_batch(
+    numbers: Iterable[Tuple[str, Optional[str]]],
+) -> List[Optional[NormalizedNumber]]:
+    """Validate and normalize many (phone, country_code) pairs at once.
+
+    Numbers are grouped by calling code; the separators of a whole
+    group are stripped with one ``str.translate`` call and its valid
+    numbers found with one regular expression scan. Only the numbers
+    that fail this fast path (trunk prefix, ``+CC`` input, invalid
+    ones) are looked at one by one.
+
+    Returns:
+        One (country_code, national_number) pair per input, or None for
+        invalid numbers, in input order.
+    """
+    numbers = list(numbers)
+    phones = [phone for phone, _ in numbers]
+    country_codes = [country_code for _, country_code in numbers]
+    distinct = set(country_codes)
+    if len(distinct) == 1:
+        return _normalize_group(phones, distinct.pop())
+
+    results: List[Optional[NormalizedNumber]] = [None] * len(numbers)
+    for country_code in distinct:
+        positions = [
+            index for index, code in enumerate(country_codes)
+            if code == country_code
+        ]
+        group = _normalize_group(
+            [phones[index] for index in positions], country_code
+        )
+        for index, result in zip(positions, group):
+            results[index] = result
+    return results
+
+
+def _normalize_group(
+    phones: List[str], country_code: Optional[str]
+) -> List[Optional[NormalizedNumber]]:
+    """normalize_batch for numbers sharing the same default country."""
+    plan = NUMBERING_PLANS.get(country_code) if country_code else None
+    joined = '\n'.join(phones)
+    if plan is None or joined.count('\n') != len(phones) - 1:
+        # No national plan, or newlines inside the numbers
+        return [normalize_phone_number(p, country_code) for p in phones]
+    cleaned = joined.translate(_BATCH_SEPARATORS)
+    valid = set(plan.scan_regex.findall(cleaned))
+    return [
+        (country_code, digits) if digits in valid
+        else normalize_phone_number(phone, country_code)
+        for digits, phone in zip(cleaned.split('\n'), phones)
+    ]
+
+
+def to_e164(country_code: str, national_number: str) -> str:
+    """Format a normalized number as E.164 (e.g. '+33612345678')."""
+    return f'+{country_code}{national_number}'
@@ -2,20 +2,139 @@
 
 Each module in this package implements the verification logic
 for a specific platform.
+
+Checkers are looked up by platform name in AVAILABLE_CHECKERS, a
+registry that only imports a checker module when its platform is first
+requested. Besides the built-in platforms, other packages can provide
+checkers through the ``modern_phone_checker.platforms`` entry point
+group, e.g. in their setup.py:
+
+    entry_points={
+        "modern_phone_checker.platforms": [
+            "signal = my_package.signal:SignalChecker",
+        ],
+    }
 """
 
-from .whatsapp import WhatsAppChecker
-from .telegram import TelegramChecker
-from .instagram import InstagramChecker
-from .snapchat import SnapchatChecker
+import importlib
+from typing import Any, Dict, Iterator, MutableMapping, Union
 
-# Mapping of available checkers
-AVAILABLE_CHECKERS = {
-    'whatsapp': WhatsAppChecker,
-    'telegram': TelegramChecker,
-    'instagram': InstagramChecker,
-    'snapchat': SnapchatChecker,
+# Entry point group scanned for third-party checkers
+ENTRY_POINT_GROUP = "modern_phone_checker.platforms"
+
+# Built-in checkers as "module:class" references
+BUILTIN_CHECKERS = {
+    'whatsapp': 'modern_phone_checker.platforms.whatsapp:WhatsAppChecker',
+    'telegram': 'modern_phone_checker.platforms.telegram:TelegramChecker',
+    'instagram': 'modern_phone_checker.platforms.instagram:InstagramChecker',
+    'snapchat': 'modern_phone_checker.platforms.snapchat:SnapchatChecker',
 }
 
+# A checker class, a "module:class" reference or an entry point
+CheckerSpec = Union[type, str, Any]
+
+
+def _entry_points(group: str) -> list:
+    """Return the installed entry points of ``group``."""
+    # Imported here as it is only needed for plugins and slow to import
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return list(entry_points.select(group=group))
+    # Python < 3.10 returns a dict of groups
+    return list(entry_points.get(group, []))
+
+
+def _load(spec: CheckerSpec) -> type:
+    """Import the checker class a spec refers to."""
+    if isinstance(spec, str):
+        module_name, _, attribute = spec.partition(':')
+        return getattr(importlib.import_module(module_name), attribute)
+    if not isinstance(spec, type) and hasattr(spec, 'load'):
+        return spec.load()
+    return spec
+
+
+class CheckerRegistry(MutableMapping):
+    """Mapping of platform name to checker class, loaded lazily.
+
+    Names are known without importing anything; a checker module is
+    imported the first time its class is looked up. Installed entry
+    points are only scanned when an unknown platform is requested or
+    the platforms are listed, so using the built-in checkers never pays
+    for the scan. Entry points cannot shadow a built-in or registered
+    checker; use register() to replace one.
+    """
+
+    def __init__(
+        self,
+        builtins: Dict[str, CheckerSpec],
+        group: str = ENTRY_POINT_GROUP,
+    ):
+        """
+        Args:
+            builtins: Checkers available without any plugin.
+            group: Entry point group providing more checkers.
+        """
+        self.group = group
+        self._specs: Dict[str, CheckerSpec] = dict(builtins)
+        self._classes: Dict[str, type] = {}
+        self._discovered = False
+
+    def _discover(self):
+        if self._discovered:
+            return
+        self._discovered = True
+        for entry_point in _entry_points(self.group):
+            self._specs.setdefault(entry_point.name, entry_point)
+
+    def register(self, name: str, checker: CheckerSpec):
+        """Register a checker under a platform name.
+
+        Args:
+            name: Platform name.
+            checker: Checker class, or "module:class" reference imported
+                when the platform is first used.
+        """
+        self._specs[name] = checker
+        self._classes.pop(name, None)
+
+    def is_loaded(self, name: str) -> bool:
+        """Return True if the checker of ``name`` is already imported."""
+        return name in self._classes
+
+    def __getitem__(self, name: str) -> type:
+        if name not in self._specs:
+            self._discover()
+        checker = self._classes.get(name)
+        if checker is None:
+            checker = self._classes[name] = _load(self._specs[name])
+        return checker
+
+    def __setitem__(self, name: str, checker: CheckerSpec):
+        self.register(name, checker)
+
+    def __delitem__(self, name: str):
+        del self._specs[name]
+        self._classes.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        if name not in self._specs:
+            self._discover()
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(list(self._specs))
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._specs)
+
+
+# Mapping of available checkers
+AVAILABLE_CHECKERS = CheckerRegistry(BUILTIN_CHECKERS)
+
 # List of default enabled platforms
 DEFAULT_PLATFORMS = ['whatsapp', 'telegram', 'instagram', 'snapchat']
@@ -1,11 +1,34 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from .. import metrics, serialization
 from ..models import PhoneCheckResult
+from ..resilience import (
+    CircuitBreaker, CircuitOpenError, RetryExhaustedError, RetryPolicy,
+    RETRYABLE_EXCEPTIONS,
+)
+from ..utils import RateLimiter, parse_retry_after
 
 
 class BaseChecker(ABC):
-    def __init__(self, client, api_key: Optional[str] = None, cache=None):
+    # Platform identifier, used for reliability tracking
+    name: str = ""
+    # Default (calls, period in seconds) allowed by the platform
+    default_rate_limit: Tuple[int, float] = (10, 1.0)
+
+    def __init__(
+        self,
+        client,
+        api_key: Optional[str] = None,
+        cache=None,
+        rate_limiter: Optional[RateLimiter] = None,
+        timeout=None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        scorer=None,
+    ):
         """
         Base class initializer for all platform checkers.
 
@@ -13,10 +36,134 @@ class BaseChecker(ABC):
             client: an httpx.AsyncClient instance
             api_key: optional API key for premium endpoints
             cache: optional CacheManager for storing results
+            rate_limiter: optional RateLimiter (one built from
+                ``default_rate_limit`` if None)
+            timeout: optional httpx.Timeout for this platform (the
+                client's timeout is used if None)
+            retry_policy: optional RetryPolicy (default policy if None)
+            circuit_breaker: optional CircuitBreaker (a private one if None)
+            scorer: optional ConfidenceScorer fed with the outcome of
+                every request
         """
         self.client = client
         self.api_key = api_key
         self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter(
+            *self.default_rate_limit
+        )
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.scorer = scorer
+
+    async def request(self, method: str, url: str, **kwargs):
+        """Sends an HTTP request with retries and circuit breaking.
+
+        Transport errors and retryable status codes are retried according
+        to the retry policy. The last transport error is re-raised.
+
+        Raises:
+            CircuitOpenError: if the platform is considered unhealthy.
+            RetryExhaustedError: if the last response still has a
+                retryable status, so checkers report an error instead of
+                a (cacheable) negative answer.
+        """
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError(
+                f"Circuit open for {self.name or type(self).__name__}"
+            )
+
+        try:
+            return await self._request_with_retries(method, url, **kwargs)
+        except asyncio.CancelledError:
+            # Outcomes are recorded right before returning, so a cancelled
+            # request has none: give back its half-open probe slot, which
+            # would otherwise stay taken forever
+            self.circuit_breaker.release()
+            raise
+
+    async def _request_with_retries(self, method: str, url: str, **kwargs):
+        policy = self.retry_policy
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            try:
+                resp = await self._send(method, url, **kwargs)
+            except RETRYABLE_EXCEPTIONS:
+                if attempt >= policy.max_attempts:
+                    self._record_outcome(False, start)
+                    raise
+            except Exception:
+                self._record_outcome(False, start)
+                raise
+            else:
+                retryable = policy.is_retryable(resp.status_code)
+                if attempt >= policy.max_attempts or not retryable:
+                    # Throttling (4xx) says nothing about platform health
+                    self._record_outcome(resp.status_code < 500, start)
+                    if retryable:
+                        raise RetryExhaustedError(
+                            f"{self.name or type(self).__name__} answered "
+                            f"HTTP {resp.status_code} after {attempt} "
+                            "attempts",
+                            resp.status_code,
+                        )
+                    return resp
+                retry_after = parse_retry_after(
+                    resp.headers.get("Retry-After")
+                )
+            metrics.registry().inc(
+                "phone_checker_http_retries_total", platform=self.name
+            )
+            await asyncio.sleep(policy.delay(attempt, retry_after))
+
+    def _record_outcome(self, success: bool, start: float):
+        """Feeds the circuit breaker and the confidence scorer."""
+        if success:
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+        if self.scorer is not None and self.name:
+            self.scorer.update_platform_reliability(
+                self.name, success, time.monotonic() - start
+            )
+
+    async def _send(self, method: str, url: str, **kwargs):
+        """Sends one HTTP request through the platform's rate limiter.
+
+        A 429 response (or a 503 with ``Retry-After``) slows the limiter
+        down; any other response lets it recover its nominal rate.
+        """
+        stats = metrics.registry()
+        with stats.time(
+            "phone_checker_rate_limit_wait_seconds", platform=self.name
+        ):
+            await self.rate_limiter.acquire()
+        with stats.track_in_flight(
+            "phone_checker_http_requests_in_flight", platform=self.name
+        ), stats.time(
+            "phone_checker_http_request_seconds", platform=self.name
+        ):
+            resp = await self.client.request(method, url, **kwargs)
+        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        if resp.status_code == 429 or (
+            resp.status_code == 503 and retry_after is not None
+        ):
+            self.rate_limiter.penalize(retry_after)
+        else:
+            self.rate_limiter.reward()
+        return resp
+
+    def parse_json(self, resp) -> Any:
+        """Decodes a JSON response body, timing the parsing."""
+        with metrics.registry().time(
+            "phone_checker_json_parse_seconds", platform=self.name
+        ):
+            return serialization.loads(resp.content)
 
     @abstractmethod
     async def check(self, phone: str, country_code: str) -> PhoneCheckResult:
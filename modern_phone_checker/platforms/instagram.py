@@ -5,8 +5,11 @@ from ..models import PhoneCheckResult
 class InstagramChecker(BaseChecker):
     """Checker for Instagram profiles."""
 
-    def __init__(self, client, api_key: str = None, cache=None):
-        super().__init__(client, api_key=api_key, cache=cache)
+    name = "instagram"
+    default_rate_limit = (5, 1.0)
+
+    def __init__(self, client, api_key: str = None, cache=None, **kwargs):
+        super().__init__(client, api_key=api_key, cache=cache, **kwargs)
         self.endpoint = "https://www.instagram.com/api/v1/users/search/"
 
     async def check(self, phone: str, country_code: str) -> PhoneCheckResult:
@@ -15,8 +18,8 @@ class InstagramChecker(BaseChecker):
         """
         payload = {"q": f"+{country_code}{phone}"}
         try:
-            resp = await self.client.get(self.endpoint, params=payload)
-            users = resp.json().get("users", [])
+            resp = await self.request("GET", self.endpoint, params=payload)
+            users = self.parse_json(resp).get("users", [])
             exists = len(users) > 0
             username = users[0]["username"] if exists else None
             return self.create_result(
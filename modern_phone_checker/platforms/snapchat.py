@@ -5,8 +5,11 @@ from ..models import PhoneCheckResult
 class SnapchatChecker(BaseChecker):
     """Checker for Snapchat profiles."""
 
-    def __init__(self, client, api_key: str = None, cache=None):
-        super().__init__(client, api_key=api_key, cache=cache)
+    name = "snapchat"
+    default_rate_limit = (10, 1.0)
+
+    def __init__(self, client, api_key: str = None, cache=None, **kwargs):
+        super().__init__(client, api_key=api_key, cache=cache, **kwargs)
         self.endpoint = (
             "https://kit.snapchat.com/v1/contacts"
         )
@@ -20,10 +23,10 @@ class SnapchatChecker(BaseChecker):
         )
         payload = {"contact": f"+{country_code}{phone}"}
         try:
-            resp = await self.client.post(
-                self.endpoint, json=payload, headers=headers
+            resp = await self.request(
+                "POST", self.endpoint, json=payload, headers=headers
             )
-            data = resp.json()
+            data = self.parse_json(resp)
             exists = data.get("exists", False)
             return self.create_result(
                 platform="snapchat",
@@ -5,8 +5,11 @@ from ..models import PhoneCheckResult
 class TelegramChecker(BaseChecker):
     """Checker for Telegram profiles."""
 
-    def __init__(self, client, api_key: str = None, cache=None):
-        super().__init__(client, api_key=api_key, cache=cache)
+    name = "telegram"
+    default_rate_limit = (30, 1.0)
+
+    def __init__(self, client, api_key: str = None, cache=None, **kwargs):
+        super().__init__(client, api_key=api_key, cache=cache, **kwargs)
         self.endpoint = (
             "https://api.telegram.org/bot<token>/getProfilePhotos"
         )
@@ -19,8 +22,8 @@ class TelegramChecker(BaseChecker):
         url = self.endpoint.replace("<token>", self.api_key or "")
         params = {"user_id": f"+{country_code}{phone}"}
         try:
-            resp = await self.client.get(url, params=params)
-            data = resp.json()
+            resp = await self.request("GET", url, params=params)
+            data = self.parse_json(resp)
             exists = "result" in data
             return self.create_result(
                 platform="telegram",
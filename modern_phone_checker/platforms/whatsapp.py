@@ -5,14 +5,17 @@ from ..models import PhoneCheckResult
 class WhatsAppChecker(BaseChecker):
     """Checker for WhatsApp profiles."""
 
-    def __init__(self, client, api_key: str = None, cache=None):
+    name = "whatsapp"
+    default_rate_limit = (20, 1.0)
+
+    def __init__(self, client, api_key: str = None, cache=None, **kwargs):
         """
         Args:
             client:  httpx.AsyncClient instance
             api_key: optional API key (not used for free endpoints)
             cache:   optional CacheManager instance
         """
-        super().__init__(client, api_key=api_key, cache=cache)
+        super().__init__(client, api_key=api_key, cache=cache, **kwargs)
         self.endpoint = "https://api.whatsapp.com/check"
 
     async def check(self, phone: str, country_code: str) -> PhoneCheckResult:
@@ -22,10 +25,10 @@ class WhatsAppChecker(BaseChecker):
         # Example request; adapt to real API
         params = {"phone": f"+{country_code}{phone}"}
         try:
-            resp = await self.client.get(self.endpoint, params=params)
+            resp = await self.request("GET", self.endpoint, params=params)
             exists = (
                 resp.status_code == 200 and
-                resp.json().get("exists", False)
+                self.parse_json(resp).get("exists", False)
             )
             return self.create_result(
                 platform="whatsapp",
@@ -0,0 +1,147 @@
+"""Retry and circuit-breaker policies for platform requests.
+
+This module helps tell transient failures apart from real answers:
+- RetryPolicy retries timeouts and retryable status codes with a
+  jittered exponential backoff
+- CircuitBreaker stops sending requests to a platform that keeps
+  failing, then probes it with a few half-open requests
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import FrozenSet, Optional
+
+import httpx
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the circuit is open."""
+
+
+class RetryExhaustedError(Exception):
+    """Raised when a platform still answers a retryable status (429/5xx)
+    after the last attempt: the answer says nothing about the number.
+
+    Attributes:
+        status_code: HTTP status of the last response
+    """
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class RetryPolicy:
+    """How failed requests are retried.
+
+    Attributes:
+        max_attempts: Total number of attempts (1 disables retries)
+        base_delay: Delay in seconds before the first retry
+        max_delay: Upper bound of the delay between two attempts
+        jitter: Randomize delays ("full jitter") to avoid retry storms
+        retryable_statuses: HTTP status codes worth retrying
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    jitter: bool = True
+    retryable_statuses: FrozenSet[int] = field(
+        default_factory=lambda: frozenset({429, 500, 502, 503, 504})
+    )
+
+    def is_retryable(self, status_code: int) -> bool:
+        """Return True if a response with this status should be retried."""
+        return status_code in self.retryable_statuses
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None):
+        """Return the delay before retry number ``attempt`` (1-based).
+
+        A ``Retry-After`` delay requested by the server is always honoured.
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """Per-platform circuit breaker.
+
+    The circuit opens after ``failure_threshold`` consecutive failures.
+    While open, requests fail immediately. After ``reset_timeout`` seconds
+    it becomes half-open and lets ``half_open_max_calls`` probe requests
+    through: a success closes it, a failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before probing
+            half_open_max_calls: Concurrent probes allowed when half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open when due."""
+        if self._state == self.OPEN and (
+            time.monotonic() - self.opened_at >= self.reset_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+        return False
+
+    def release(self):
+        """Give back a probe slot whose request ended without an outcome
+        (e.g. it was cancelled), so another probe can be sent."""
+        if self._state == self.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record_success(self):
+        """Record a successful request."""
+        self.failures = 0
+        self._state = self.CLOSED
+
+    def record_failure(self):
+        """Record a failed request."""
+        self.failures += 1
+        if self._state == self.HALF_OPEN or (
+            self.failures >= self.failure_threshold
+        ):
+            self._state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+# Exceptions considered transient (worth a retry)
+RETRYABLE_EXCEPTIONS = (httpx.TransportError,)
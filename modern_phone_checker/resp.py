@@ -0,0 +1,185 @@
+"""Minimal asyncio client for Redis-protocol (RESP2) servers.
+
+Only what the shared state needs is implemented: commands, pipelines
+and optimistic transactions (WATCH/MULTI/EXEC). Any server speaking the
+protocol works: Redis, Valkey, KeyDB or the stand-in used by the tests
+(tests/mock_redis.py).
+"""
+
+import asyncio
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_PORT = 6379
+
+
+class RespError(Exception):
+    """Error reply sent by the server."""
+
+
+def _encode(args: Sequence[Any]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode()
+        elif not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by the server")
+    kind, value = line[:1], line[1:-2]
+    if kind == b"+":
+        return value.decode()
+    if kind == b"-":
+        return RespError(value.decode())
+    if kind == b":":
+        return int(value)
+    if kind == b"$":
+        size = int(value)
+        if size < 0:
+            return None
+        return (await reader.readexactly(size + 2))[:-2]
+    if kind == b"*":
+        size = int(value)
+        if size < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(size)]
+    raise ConnectionError(f"Unexpected reply from the server: {line!r}")
+
+
+class RespClient:
+    """Single-connection client; commands are sent one batch at a time.
+
+    Example:
+        >>> client = RespClient.from_url("redis://localhost:6379/0")
+        >>> await client.execute("SET", "key", "value")
+        >>> await client.execute("GET", "key")
+        b'value'
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        db: int = 0,
+        password: Optional[str] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self._connection: Optional[
+            Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+        ] = None
+        # Created lazily so the lock belongs to the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def from_url(cls, url: str) -> "RespClient":
+        """Client for a ``redis://[:password@]host[:port][/db]`` URL."""
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"Not a redis:// URL: {url}")
+        db = parts.path.strip("/")
+        return cls(
+            host=parts.hostname or "127.0.0.1",
+            port=parts.port or DEFAULT_PORT,
+            db=int(db) if db else 0,
+            password=parts.password,
+        )
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self._connection = reader, writer
+        setup: List[Tuple[Any, ...]] = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        try:
+            for reply in await self._send(setup):
+                if isinstance(reply, RespError):
+                    raise reply
+        except BaseException:
+            self.close()
+            raise
+
+    async def _send(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Send commands in one write and read their replies."""
+        if not commands:
+            return []
+        if self._connection is None:
+            await self._connect()
+        reader, writer = self._connection
+        try:
+            writer.write(b"".join(_encode(command) for command in commands))
+            await writer.drain()
+            return [await _read_reply(reader) for _ in commands]
+        except BaseException:
+            # A half-read reply would desynchronize the connection
+            self.close()
+            raise
+
+    async def execute(self, *args: Any) -> Any:
+        """Run one command and return its reply.
+
+        Raises:
+            RespError: The server rejected the command.
+        """
+        (reply,) = await self.pipeline([args])
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    async def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Run several commands in one round trip.
+
+        Error replies are returned as RespError instances, not raised.
+        """
+        async with self._get_lock():
+            return await self._send(commands)
+
+    async def transaction(
+        self,
+        key: str,
+        update: Callable[[Optional[bytes], float], Tuple[Optional[Any], Any]],
+    ) -> Any:
+        """Atomically replace the value of ``key`` (check-and-set).
+
+        ``update`` receives the current value (None if missing) and the
+        server time in seconds, and returns the new value (None to leave
+        the key unchanged) and the result of the call. It is called again
+        if another client changed the key meanwhile.
+        """
+        async with self._get_lock():
+            while True:
+                _, value, (seconds, micros) = await self._send(
+                    [("WATCH", key), ("GET", key), ("TIME",)]
+                )
+                new_value, result = update(
+                    value, int(seconds) + int(micros) / 1e6
+                )
+                if new_value is None:
+                    await self._send([("UNWATCH",)])
+                    return result
+                replies = await self._send(
+                    [("MULTI",), ("SET", key, new_value), ("EXEC",)]
+                )
+                if replies[-1] is not None:
+                    return result
+
+    def close(self):
+        """Close the connection (reopened by the next command)."""
+        if self._connection is not None:
+            self._connection[1].close()
+            self._connection = None
@@ -0,0 +1,29 @@
+"""Compact serialization helpers.
+
+Uses orjson when it is installed (``pip install modern_phone_checker
+[speedups]``) and falls back to the standard json module otherwise.
+Both produce compact JSON, so data written by one can be read by the
+other.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize ``obj`` to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
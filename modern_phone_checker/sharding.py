@@ -0,0 +1,511 @@
+"""Multi-process execution of bulk checks.
+
+One event loop spends a sizeable share of its time decoding responses,
+building results and serializing them. ShardedChecker spreads a bulk run
+over several worker processes, each running its own PhoneChecker and
+event loop:
+
+- input numbers are sharded by number, so repeats of a number meet the
+  same worker (and its in-flight coalescing)
+- rate limits stay global: the parent process holds one token bucket
+  per platform and workers acquire their tokens from it, unless the
+  buckets (and the cache) live in a shared StateStore, which then also
+  spreads them over other runs and hosts
+- results are merged in input order or as they complete
+
+Parent and workers talk over a local socket (a Unix socket where
+available) with length-prefixed pickled messages; workers authenticate
+with a random token given to them at start.
+"""
+
+import asyncio
+import json
+import os
+import pickle
+import secrets
+import shutil
+import socket
+import struct
+import tempfile
+import traceback
+import zlib
+from collections import deque
+from multiprocessing import get_context
+from typing import (
+    Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple,
+)
+
+from .cache import CacheManager
+from .core import NumberSource, PhoneChecker, _iterate_numbers
+from .models import BulkCheckResult
+from .platforms import AVAILABLE_CHECKERS, DEFAULT_PLATFORMS
+from .shared_state import open_state_store
+from .utils import RateLimiter
+
+# Length prefix of every message
+_HEADER = struct.Struct("!I")
+# Seconds a worker may hold finished results before sending them
+_RESULT_DELAY = 0.05
+
+# Where the coordinator listens: a Unix socket path or (host, port)
+Address = Any
+
+
+class WorkerError(Exception):
+    """Raised when a worker process fails."""
+
+
+async def _send(writer: asyncio.StreamWriter, message: tuple):
+    _send_nowait(writer, message)
+    await writer.drain()
+
+
+def _send_nowait(writer: asyncio.StreamWriter, message: tuple):
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    writer.write(_HEADER.pack(len(data)) + data)
+
+
+async def _receive(reader: asyncio.StreamReader) -> tuple:
+    header = await reader.readexactly(_HEADER.size)
+    (size,) = _HEADER.unpack(header)
+    return pickle.loads(await reader.readexactly(size))
+
+
+async def _connect(address: Address):
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+def outcome_to_json(outcome: BulkCheckResult) -> str:
+    """JSON line of an outcome, usable as a worker-side ``transform``."""
+    return json.dumps(outcome.to_dict())
+
+
+def shard_of(phone: str, country_code: str, shards: int) -> int:
+    """Worker assigned to a number (stable across runs)."""
+    return zlib.crc32(f"{country_code}:{phone}".encode()) % shards
+
+
+class CoordinatedRateLimiter:
+    """RateLimiter stand-in whose tokens come from the coordinator.
+
+    Used by the workers: acquire() waits for a token from the bucket the
+    parent process keeps for the platform, and penalize()/reward() are
+    forwarded to it, so every worker sees the same limits.
+    """
+
+    def __init__(self, address: Address, token: str, platform: str):
+        self.address = address
+        self.token = token
+        self.platform = platform
+        self._connection: Optional[Tuple[Any, Any]] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _open(self):
+        reader, writer = await _connect(self.address)
+        await _send(writer, ("hello", self.token, "limits", self.platform))
+        self._connection = reader, writer
+
+    async def acquire(self):
+        """Waits for a token of the shared bucket."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # One request at a time per connection: tokens are handed out
+        # in order anyway
+        async with self._lock:
+            if self._connection is None:
+                await self._open()
+            reader, writer = self._connection
+            await _send(writer, ("acquire",))
+            await _receive(reader)
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """Slows down every worker after the platform pushed back."""
+        if self._connection is not None:
+            _send_nowait(self._connection[1], ("penalize", retry_after))
+
+    def reward(self):
+        """Reports a successful call to the shared bucket."""
+        if self._connection is not None:
+            _send_nowait(self._connection[1], ("reward",))
+
+    def close(self):
+        if self._connection is not None:
+            self._connection[1].close()
+            self._connection = None
+
+
+class ShardedChecker:
+    """Run bulk checks over several worker processes.
+
+    Example:
+        >>> sharded = ShardedChecker(workers=4, checker_options={
+        ...     "api_key": "KEY", "platforms": ["whatsapp", "telegram"],
+        ... })
+        >>> async for outcome in sharded.check_numbers(numbers):
+        ...     print(outcome.to_dict())
+
+    Everything given to the workers (options, ``transform`` and
+    ``on_start``) must be picklable: use module-level functions.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        checker_options: Optional[Dict[str, Any]] = None,
+        cache_options: Optional[Dict[str, Any]] = None,
+        ordered: bool = False,
+        chunk_size: int = 100,
+        max_pending: int = 10_000,
+        transform: Optional[Callable[[BulkCheckResult], Any]] = None,
+        on_start: Optional[Callable[[PhoneChecker], None]] = None,
+        shared_state: Optional[str] = None,
+    ):
+        """
+        Args:
+            workers: Number of worker processes (CPU count if None).
+            checker_options: Keyword arguments of each worker's
+                PhoneChecker (``rate_limits`` sets the shared limits).
+            cache_options: Keyword arguments of each worker's
+                CacheManager (no cache if None).
+            ordered: Yield results in input order rather than as they
+                complete.
+            chunk_size: Numbers (and results) sent per message.
+            max_pending: Numbers read ahead of the consumer; bounds the
+                memory used to restore the input order.
+            transform: Applied to every outcome inside the worker, e.g.
+                to serialize it there; check_numbers then yields its
+                return values.
+            on_start: Called with each worker's PhoneChecker once created.
+            shared_state: Directory or ``redis://`` URL of a StateStore
+                holding the rate limits and the cache, shared with
+                other runs (see shared_state.open_state_store).
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.checker_options = dict(checker_options or {})
+        self.cache_options = cache_options
+        self.ordered = ordered
+        self.chunk_size = chunk_size
+        self.max_pending = max(max_pending, chunk_size)
+        self.transform = transform
+        self.on_start = on_start
+        self.shared_state = shared_state
+        rate_limits = self.checker_options.pop("rate_limits", None) or {}
+        self.rate_limits = rate_limits
+        self._limiters: Dict[str, RateLimiter] = {
+            platform: RateLimiter(*limit)
+            for platform, limit in rate_limits.items()
+        }
+
+    def _limiter(self, platform: str) -> RateLimiter:
+        limiter = self._limiters.get(platform)
+        if limiter is None:
+            checker_class = AVAILABLE_CHECKERS[platform]
+            limiter = self._limiters[platform] = RateLimiter(
+                *getattr(checker_class, "default_rate_limit", (10, 1.0))
+            )
+        return limiter
+
+    async def check_numbers(
+        self,
+        numbers: NumberSource,
+        concurrency: int = 50,
+        per_platform_limit: Optional[int] = None,
+        force_refresh: bool = False,
+    ) -> AsyncIterator[Any]:
+        """Check many numbers across the worker processes.
+
+        Args:
+            numbers: Sync or async iterable of (phone, country_code) pairs.
+            concurrency: Numbers checked at once by each worker.
+            per_platform_limit: Concurrent requests per platform and
+                worker (unbounded if None).
+            force_refresh: Force fresh verification even if cached.
+
+        Yields:
+            One BulkCheckResult (or ``transform`` output) per number.
+
+        Raises:
+            WorkerError: If a worker process fails.
+        """
+        token = secrets.token_hex(16)
+        results: asyncio.Queue = asyncio.Queue()
+        # Input positions not yet yielded bound the read-ahead
+        pending = asyncio.Semaphore(self.max_pending)
+        connected: List[asyncio.Future] = [
+            asyncio.get_running_loop().create_future()
+            for _ in range(self.workers)
+        ]
+
+        async def serve(reader, writer):
+            try:
+                hello = await _receive(reader)
+                if hello[:2] != ("hello", token):
+                    return
+                if hello[2] == "limits":
+                    await self._serve_limits(hello[3], reader, writer)
+                    return
+                shard = hello[3]
+                connected[shard].set_result(writer)
+                while True:
+                    message = await _receive(reader)
+                    await results.put((shard, message))
+                    if message[0] != "results":
+                        break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+            finally:
+                writer.close()
+
+        tmp_dir = tempfile.mkdtemp(prefix="phone-checker-")
+        server, address = await self._listen(serve, tmp_dir)
+        context = get_context("spawn")
+        options = {
+            "checker_options": self.checker_options,
+            "cache_options": self.cache_options,
+            "check_options": {
+                "concurrency": concurrency,
+                "per_platform_limit": per_platform_limit,
+                "force_refresh": force_refresh,
+            },
+            "chunk_size": self.chunk_size,
+            "transform": self.transform,
+            "on_start": self.on_start,
+            "shared_state": self.shared_state,
+            "rate_limits": self.rate_limits,
+        }
+        processes = [
+            context.Process(
+                target=_worker_main,
+                args=(address, token, shard, options),
+                daemon=True,
+            )
+            for shard in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        fed = None
+
+        async def feed():
+            nonlocal fed
+            writers = [await future for future in connected]
+            chunks: List[list] = [[] for _ in writers]
+
+            async def send(shard):
+                if chunks[shard]:
+                    chunk, chunks[shard] = chunks[shard], []
+                    await _send(writers[shard], ("numbers", chunk))
+
+            index = 0
+            async for phone, country_code in _iterate_numbers(numbers):
+                if pending.locked():
+                    # Waiting numbers only come back once they are sent
+                    for shard in range(len(writers)):
+                        await send(shard)
+                await pending.acquire()
+                shard = shard_of(phone, country_code, len(writers))
+                chunks[shard].append((index, phone, country_code))
+                index += 1
+                if len(chunks[shard]) >= self.chunk_size:
+                    await send(shard)
+            fed = index
+            for shard, writer in enumerate(writers):
+                await send(shard)
+                await _send(writer, ("end",))
+
+        def feed_done(task: asyncio.Future):
+            if not task.cancelled() and task.exception() is not None:
+                results.put_nowait((None, ("feed_error", task.exception())))
+
+        feeder = asyncio.ensure_future(feed())
+        feeder.add_done_callback(feed_done)
+        try:
+            received = 0
+            finished = 0
+            waiting: Dict[int, Any] = {}
+            next_index = 0
+            while fed is None or received < fed or finished < self.workers:
+                shard, message = await self._next_message(
+                    results, processes, connected
+                )
+                kind = message[0]
+                if kind == "feed_error":
+                    raise message[1]
+                if kind == "error":
+                    raise WorkerError(f"Worker {shard} failed:\n{message[1]}")
+                if kind == "done":
+                    finished += 1
+                    continue
+                received += len(message[1])
+                if not self.ordered:
+                    for _, outcome in message[1]:
+                        pending.release()
+                        yield outcome
+                    continue
+                waiting.update(message[1])
+                while next_index in waiting:
+                    outcome = waiting.pop(next_index)
+                    next_index += 1
+                    pending.release()
+                    yield outcome
+        finally:
+            feeder.cancel()
+            # Workers stop as soon as their connection is closed
+            for future in connected:
+                if future.done() and not future.cancelled():
+                    future.result().close()
+            server.close()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, _stop_processes, processes)
+            await server.wait_closed()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    async def _next_message(self, results, processes, connected):
+        """Next worker message, failing if a worker died silently."""
+        while True:
+            try:
+                return await asyncio.wait_for(results.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                for shard, process in enumerate(processes):
+                    if not process.is_alive() and process.exitcode != 0:
+                        raise WorkerError(
+                            f"Worker {shard} exited with code "
+                            f"{process.exitcode}"
+                        )
+
+    async def _serve_limits(self, platform: str, reader, writer):
+        limiter = self._limiter(platform)
+        while True:
+            message = await _receive(reader)
+            kind = message[0]
+            if kind == "acquire":
+                await limiter.acquire()
+                await _send(writer, ("ok",))
+            elif kind == "penalize":
+                limiter.penalize(message[1])
+            elif kind == "reward":
+                limiter.reward()
+
+    async def _listen(self, handler, tmp_dir: str):
+        if hasattr(socket, "AF_UNIX"):
+            path = os.path.join(tmp_dir, "coordinator.sock")
+            server = await asyncio.start_unix_server(handler, path)
+            return server, path
+        server = await asyncio.start_server(handler, "127.0.0.1", 0)
+        return server, server.sockets[0].getsockname()[:2]
+
+
+def _stop_processes(processes, timeout: float = 5.0):
+    for process in processes:
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+
+def _worker_main(address: Address, token: str, shard: int, options: Dict):
+    """Entry point of a worker process."""
+    asyncio.run(_run_worker(address, token, shard, options))
+
+
+async def _run_worker(address: Address, token: str, shard: int,
+                      options: Dict):
+    reader, writer = await _connect(address)
+    await _send(writer, ("hello", token, "work", shard))
+    try:
+        await _check_shard(address, token, reader, writer, options)
+        await _send(writer, ("done",))
+    except (ConnectionError, asyncio.IncompleteReadError):
+        # The parent stopped the run
+        pass
+    except Exception:
+        await _send(writer, ("error", traceback.format_exc()))
+    finally:
+        writer.close()
+
+
+async def _check_shard(address, token, reader, writer, options: Dict):
+    checker_options = dict(options["checker_options"])
+    platforms = checker_options.get("platforms") or DEFAULT_PLATFORMS
+    store = None
+    cache_options = options["cache_options"]
+    if options["shared_state"] is not None:
+        store = open_state_store(options["shared_state"])
+        await store.open()
+        limiters = store.rate_limiters(platforms, options["rate_limits"])
+        if cache_options is not None:
+            cache_options = dict(
+                cache_options, backend=store.cache_backend()
+            )
+    else:
+        limiters = {
+            platform: CoordinatedRateLimiter(address, token, platform)
+            for platform in platforms
+        }
+    cache = None
+    if cache_options is not None:
+        cache = CacheManager(**cache_options)
+    else:
+        checker_options["use_cache"] = False
+    checker = PhoneChecker(
+        cache=cache, rate_limiters=limiters, **checker_options
+    )
+    if options["on_start"] is not None:
+        options["on_start"](checker)
+    transform = options["transform"]
+    # Input positions of the numbers in flight, by number
+    in_flight: Dict[Tuple[str, str], Deque[int]] = {}
+
+    async def incoming():
+        while True:
+            message = await _receive(reader)
+            if message[0] == "end":
+                return
+            for index, phone, country_code in message[1]:
+                in_flight.setdefault(
+                    (phone, country_code), deque()
+                ).append(index)
+                yield phone, country_code
+
+    batch: List[Tuple[int, Any]] = []
+
+    async def send_batch():
+        nonlocal batch
+        if batch:
+            chunk, batch = batch, []
+            await _send(writer, ("results", chunk))
+
+    async def send_periodically():
+        while True:
+            await asyncio.sleep(_RESULT_DELAY)
+            await send_batch()
+
+    sender = asyncio.ensure_future(send_periodically())
+    try:
+        async with checker:
+            async for outcome in checker.check_numbers(
+                incoming(), **options["check_options"]
+            ):
+                key = (outcome.phone, outcome.country_code)
+                positions = in_flight[key]
+                index = positions.popleft()
+                if not positions:
+                    del in_flight[key]
+                batch.append(
+                    (index, transform(outcome) if transform else outcome)
+                )
+                if len(batch) >= options["chunk_size"]:
+                    await send_batch()
+    finally:
+        sender.cancel()
+        if store is None:
+            for limiter in limiters.values():
+                limiter.close()
+        try:
+            if cache is not None:
+                await cache.close()
+        finally:
+            if store is not None:
+                await store.close()
+    await send_batch()
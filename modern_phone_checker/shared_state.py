@@ -0,0 +1,387 @@
+"""Cache and rate limits shared by several processes or hosts.
+
+A PhoneChecker keeps its token buckets in memory and, by default, its
+cache in a local directory: every process running checks spends the full
+quota of each platform and checks again numbers another process already
+checked. A StateStore holds both in one place instead:
+
+- ``SQLiteStateStore``: a directory holding SQLite databases, for the
+  processes of one host (or a shared volume with working locks)
+- ``RedisStateStore``: a Redis-protocol server, for a fleet of hosts
+
+Example:
+    >>> store = open_state_store("redis://cache-host:6379/0")
+    >>> await store.open()
+    >>> checker = PhoneChecker(
+    ...     cache=CacheManager(backend=store.cache_backend()),
+    ...     rate_limiters=store.rate_limiters(["whatsapp", "telegram"]),
+    ... )
+
+Each token bucket is a single record updated atomically (an immediate
+SQLite transaction, or WATCH/MULTI/EXEC on the server), so the fleet
+respects one quota per platform. Penalties after a 429 slow down every
+process alike.
+"""
+
+import asyncio
+import functools
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple,
+)
+
+from .cache_backends import CacheBackend, RedisBackend, SQLiteBackend
+from .resp import RespClient
+
+# Receives the stored value (None if missing) and the current time, and
+# returns the value to store (None to keep it) and a result
+Update = Callable[[Optional[Any], float], Tuple[Optional[str], Any]]
+
+
+class _Bucket(NamedTuple):
+    tokens: float
+    updated: float
+    rate: float
+    blocked_until: float
+
+    def encode(self) -> str:
+        return " ".join(repr(float(field)) for field in self)
+
+    @classmethod
+    def decode(cls, value: Any) -> "_Bucket":
+        if isinstance(value, bytes):
+            value = value.decode()
+        return cls(*(float(field) for field in value.split()))
+
+
+class SharedRateLimiter:
+    """Token bucket kept in a StateStore.
+
+    Behaves like utils.RateLimiter (burst, penalize() on 429, gradual
+    recovery through reward()), but the bucket is shared by every
+    limiter of the same name, whatever the process or host. Waiters of
+    one process are served in arrival order; across processes, the next
+    token goes to whoever asks first once it is available.
+    """
+
+    def __init__(
+        self,
+        store: "StateStore",
+        name: str,
+        calls: int,
+        period: float,
+        burst: Optional[int] = None,
+        min_rate_ratio: float = 0.1,
+    ):
+        """
+        Args:
+            store: Where the bucket is kept.
+            name: Name of the bucket (usually the platform).
+            calls: Number of allowed calls
+            period: Time period in seconds
+            burst: Maximum number of calls allowed at once (default: calls)
+            min_rate_ratio: Lowest fraction of the nominal rate penalize()
+                can bring the limiter down to
+        """
+        self.store = store
+        self.name = name
+        self.key = "rate:" + name
+        self.calls = calls
+        self.period = period
+        self.max_rate = calls / period
+        self.min_rate = self.max_rate * min_rate_ratio
+        self.capacity = float(burst or calls)
+        # Rate last seen in the store, to skip useless reward() updates
+        self.rate = self.max_rate
+        self._lock: Optional[asyncio.Lock] = None
+        self._updates: Set[asyncio.Future] = set()
+
+    def _load(self, value: Optional[Any], now: float) -> _Bucket:
+        if value is None:
+            bucket = _Bucket(self.capacity, now, self.max_rate, 0.0)
+        else:
+            bucket = _Bucket.decode(value)
+            elapsed = now - bucket.updated
+            if elapsed > 0:
+                bucket = bucket._replace(
+                    tokens=min(
+                        self.capacity, bucket.tokens + elapsed * bucket.rate
+                    ),
+                    updated=now,
+                )
+        self.rate = bucket.rate
+        return bucket
+
+    def _take(
+        self, value: Optional[Any], now: float
+    ) -> Tuple[Optional[str], float]:
+        bucket = self._load(value, now)
+        if now < bucket.blocked_until:
+            return None, bucket.blocked_until - now
+        if bucket.tokens >= 1:
+            return bucket._replace(tokens=bucket.tokens - 1).encode(), 0.0
+        # Nothing to store: the refill is computed again next time
+        return None, (1 - bucket.tokens) / bucket.rate
+
+    def _penalized(
+        self, retry_after: Optional[float], value: Optional[Any], now: float
+    ) -> Tuple[str, None]:
+        bucket = self._load(value, now)
+        blocked_until = bucket.blocked_until
+        if retry_after:
+            blocked_until = max(blocked_until, now + retry_after)
+        bucket = bucket._replace(
+            tokens=0.0,
+            rate=max(self.min_rate, bucket.rate / 2),
+            blocked_until=blocked_until,
+        )
+        self.rate = bucket.rate
+        return bucket.encode(), None
+
+    def _rewarded(
+        self, value: Optional[Any], now: float
+    ) -> Tuple[Optional[str], None]:
+        bucket = self._load(value, now)
+        if bucket.rate >= self.max_rate:
+            return None, None
+        bucket = bucket._replace(
+            rate=min(self.max_rate, bucket.rate + self.max_rate * 0.05)
+        )
+        self.rate = bucket.rate
+        return bucket.encode(), None
+
+    async def acquire(self):
+        """Waits if necessary to respect the shared rate limits."""
+        # Created lazily so the lock belongs to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                wait = await self.store.transact(self.key, self._take)
+                if not wait:
+                    return
+                await asyncio.sleep(wait)
+
+    def _update(self, update: Update):
+        # The checkers call penalize() and reward() synchronously
+        task = asyncio.ensure_future(self.store.transact(self.key, update))
+        self._updates.add(task)
+        task.add_done_callback(self._updates.discard)
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """Slows down every user of the bucket after a rejection (429).
+
+        Args:
+            retry_after: Delay in seconds requested by the platform
+        """
+        self._update(functools.partial(self._penalized, retry_after))
+
+    def reward(self):
+        """Recovers part of the nominal rate after a successful call."""
+        if self.rate < self.max_rate:
+            self._update(self._rewarded)
+
+    async def wait_updates(self):
+        """Wait until pending penalize() and reward() calls are stored."""
+        if self._updates:
+            await asyncio.gather(*self._updates, return_exceptions=True)
+
+
+class StateStore(ABC):
+    """Base class of the places holding shared state."""
+
+    def __init__(self):
+        self._limiters: List[SharedRateLimiter] = []
+
+    @abstractmethod
+    async def transact(self, key: str, update: Update) -> Any:
+        """Atomically apply ``update`` to the value stored under ``key``.
+
+        Returns:
+            The result returned by ``update``.
+        """
+
+    @abstractmethod
+    def cache_backend(self) -> CacheBackend:
+        """Cache backend storing its entries in the store."""
+
+    async def open(self):
+        """Prepare the store for use."""
+
+    async def close(self):
+        """Store pending rate limit updates and release resources."""
+        for limiter in self._limiters:
+            await limiter.wait_updates()
+
+    async def __aenter__(self) -> "StateStore":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def rate_limiter(
+        self, name: str, calls: int, period: float, **kwargs
+    ) -> SharedRateLimiter:
+        """Shared token bucket of ``calls`` per ``period`` seconds.
+
+        Every limiter created with the same name, from any process using
+        the same store, draws from the same bucket; the first one to use
+        it sets its size.
+        """
+        limiter = SharedRateLimiter(self, name, calls, period, **kwargs)
+        self._limiters.append(limiter)
+        return limiter
+
+    def rate_limiters(
+        self,
+        platforms: Iterable[str],
+        rate_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+    ) -> Dict[str, SharedRateLimiter]:
+        """Shared limiters for PhoneChecker(rate_limiters=...).
+
+        Args:
+            platforms: Platforms to create a limiter for.
+            rate_limits: (calls, period in seconds) per platform; the
+                checker's default limit applies to the others.
+        """
+        from .platforms import AVAILABLE_CHECKERS
+
+        rate_limits = rate_limits or {}
+        limiters = {}
+        for platform in platforms:
+            limit = rate_limits.get(platform) or getattr(
+                AVAILABLE_CHECKERS[platform], "default_rate_limit", (10, 1.0)
+            )
+            limiters[platform] = self.rate_limiter(platform, *limit)
+        return limiters
+
+
+class SQLiteStateStore(StateStore):
+    """Shared state kept in SQLite databases in one directory.
+
+    The cache uses the regular SQLite cache backend of that directory;
+    token buckets live in their own database so that bucket updates never
+    wait behind a large cache write. All database access goes through a
+    single worker thread.
+    """
+
+    filename = "shared_state.sqlite3"
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = Path(directory)
+        self.path = self.directory / self.filename
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _connect(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Transactions are managed explicitly (BEGIN IMMEDIATE)
+        conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS shared_state ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn = conn
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def open(self):
+        if self._conn is not None:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="phone-checker-state"
+        )
+        await self._run(self._connect)
+
+    async def close(self):
+        await super().close()
+        if self._conn is None:
+            return
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=True)
+        self._conn = None
+        self._executor = None
+
+    def _transact(self, key: str, update: Update) -> Any:
+        conn = self._conn
+        # Takes the write lock now, so no other process can change the
+        # value between the read and the write
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM shared_state WHERE key = ?", (key,)
+            ).fetchone()
+            value, result = update(row[0] if row else None, time.time())
+            if value is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO shared_state (key, value)"
+                    " VALUES (?, ?)",
+                    (key, value),
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    async def transact(self, key: str, update: Update) -> Any:
+        await self.open()
+        return await self._run(self._transact, key, update)
+
+    def cache_backend(self) -> SQLiteBackend:
+        return SQLiteBackend(self.directory)
+
+
+class RedisStateStore(StateStore):
+    """Shared state kept on a Redis-protocol server.
+
+    Token buckets use the server's clock, so hosts need not agree on the
+    time. Cache entries expire on the server.
+    """
+
+    def __init__(self, client: RespClient, prefix: str = "phone_checker:"):
+        """
+        Args:
+            client: Connection to the server.
+            prefix: Prefix of every key, to share a server with others.
+        """
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+
+    async def open(self):
+        await self.client.execute("PING")
+
+    async def close(self):
+        try:
+            await super().close()
+        finally:
+            self.client.close()
+
+    async def transact(self, key: str, update: Update) -> Any:
+        return await self.client.transaction(self.prefix + key, update)
+
+    def cache_backend(self) -> RedisBackend:
+        return RedisBackend(self.client, self.prefix)
+
+
+def open_state_store(location: str) -> StateStore:
+    """Store for a ``redis://host:port/db`` URL or a directory path."""
+    if location.startswith("redis://"):
+        return RedisStateStore(RespClient.from_url(location))
+    return SQLiteStateStore(location)
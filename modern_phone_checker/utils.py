@@ -3,13 +3,27 @@
 This module provides utility functions to:
 - Validate phone numbers
 - Handle rate limiting
+- Deduplicate concurrent calls
+- Read blocking input without blocking the event loop
 - Clean phone data
 """
 
 import re
+import threading
+import time
+from collections import deque
 from functools import wraps
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable,
+    Iterable, Optional, Tuple,
+)
+
+from .phone_numbers import normalize_phone_number
+
+_NON_DIGITS = re.compile(r'\D')
 
 
 def clean_phone_number(phone: str) -> str:
@@ -21,65 +35,129 @@ def clean_phone_number(phone: str) -> str:
     Returns:
         Cleaned number containing only digits
     """
-    return re.sub(r'\D', '', phone)
+    return _NON_DIGITS.sub('', phone)
 
 
 def validate_phone_number(phone: str, country_code: str) -> bool:
     """Validates a phone number for a given country.
 
+    See phone_numbers.normalize_phone_number, which also returns the
+    normalized number.
+
     Args:
-        phone: Phone number without country code
+        phone: Phone number without country code (optionally with the
+            national trunk prefix), or international ``+CC...`` number
         country_code: Country code (e.g., '33' for France)
 
     Returns:
         True if the number is valid, False otherwise
     """
-    country_formats = {
-        '33': r'^[67]\d{8}$',  # France: mobile starts with 6 or 7, +8 digits
-        '1':  r'^\d{10}$',     # USA/Canada: 10 digits
-    }
-
-    clean_number = clean_phone_number(phone)
-    pattern = country_formats.get(country_code)
-
-    if not pattern:
-        return True  # Accept if unknown country format
-
-    return bool(re.match(pattern, clean_number))
+    return normalize_phone_number(phone, country_code) is not None
 
 
 class RateLimiter:
-    """Rate limiter for API requests."""
+    """Asynchronous token-bucket rate limiter for API requests.
+
+    Tokens are refilled continuously at ``calls / period`` per second, up
+    to ``burst`` tokens. Each acquire() costs O(1) and waiters are served
+    in arrival order. When the platform pushes back (HTTP 429), penalize()
+    halves the rate and honours the ``Retry-After`` delay; the rate then
+    recovers gradually through reward().
+    """
 
-    def __init__(self, calls: int, period: int):
+    def __init__(
+        self,
+        calls: int,
+        period: float,
+        burst: Optional[int] = None,
+        min_rate_ratio: float = 0.1,
+    ):
         """Initializes the rate limiter.
 
         Args:
             calls: Number of allowed calls
             period: Time period in seconds
+            burst: Maximum number of calls allowed at once (default: calls)
+            min_rate_ratio: Lowest fraction of the nominal rate penalize()
+                can bring the limiter down to
         """
         self.calls = calls
         self.period = period
-        self.timestamps = []
+        self.max_rate = calls / period
+        self.min_rate = self.max_rate * min_rate_ratio
+        self.rate = self.max_rate
+        self.capacity = float(burst or calls)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self._updated = now
 
     async def acquire(self):
         """Waits if necessary to respect the rate limits."""
-        now = datetime.now()
-        cutoff = now - timedelta(seconds=self.period)
+        # Created lazily so the lock belongs to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """Slows down after the platform rejected a request (e.g. 429).
 
-        # Remove outdated timestamps
-        self.timestamps = [ts for ts in self.timestamps if ts > cutoff]
+        Args:
+            retry_after: Delay in seconds requested by the platform
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0.0
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def reward(self):
+        """Recovers part of the nominal rate after a successful call."""
+        if self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a ``Retry-After`` header into a delay in seconds.
 
-        if len(self.timestamps) >= self.calls:
-            oldest = self.timestamps.pop(0)
-            sleep_time = (oldest - cutoff).total_seconds()
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
+    Args:
+        value: Header value, either a number of seconds or an HTTP date
 
-        self.timestamps.append(now)
+    Returns:
+        The delay in seconds, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
 
 
-def rate_limit(calls: int, period: int):
+def rate_limit(calls: int, period: float):
     """Decorator to apply rate limiting to an async function.
 
     Args:
@@ -96,3 +174,126 @@ def rate_limit(calls: int, period: int):
         return wrapper
 
     return decorator
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls sharing the same key.
+
+    While a call for a key is in progress, later callers with the same
+    key wait for its outcome instead of starting their own call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.shared = 0  # Number of calls served by another caller
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Runs ``func`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Identifier of the call
+            func: Coroutine function started by the first caller
+
+        Returns:
+            Tuple of (result, leader) where leader is True for the caller
+            that actually ran ``func``
+        """
+        future = self._calls.get(key)
+        leader = future is None
+        if leader:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        else:
+            self.shared += 1
+        # Shielded so that a cancelled caller doesn't cancel the others
+        return await asyncio.shield(future), leader
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+
+async def iterate_in_thread(
+    iterable: Iterable[Any], max_pending: int = 10_000
+) -> AsyncIterator[Any]:
+    """Iterates over a blocking iterable (e.g. lines of stdin) in a thread.
+
+    A daemon thread reads up to ``max_pending`` items ahead, so a slow
+    producer (a pipe, a network file) never stalls the event loop and
+    the checks in flight. The loop is only woken up when it is waiting
+    for an item. Once the consumer stops, the thread stops reading after
+    the blocking read in progress, if any.
+
+    Args:
+        iterable: Blocking iterable, consumed by the thread only
+        max_pending: Items read ahead of the consumer
+
+    Raises:
+        Exception: Whatever the iterable raised, once the items read
+            before the error were consumed
+    """
+    loop = asyncio.get_running_loop()
+    end = object()
+    # (item, error) pairs; ``end`` closes the sequence
+    items: Deque[Tuple[Any, Optional[BaseException]]] = deque()
+    ready = asyncio.Event()
+    space = threading.Semaphore(max_pending)
+    stopped = threading.Event()
+    waiting = False
+
+    def wake():
+        try:
+            loop.call_soon_threadsafe(ready.set)
+        except RuntimeError:
+            # The event loop is closed: nobody is waiting anymore
+            pass
+
+    def produce():
+        try:
+            for item in iterable:
+                space.acquire()
+                if stopped.is_set():
+                    return
+                items.append((item, None))
+                if waiting:
+                    wake()
+        except Exception as e:
+            items.append((end, e))
+        else:
+            items.append((end, None))
+        wake()
+
+    # A daemon thread, unlike the default executor, never delays the
+    # shutdown of the program while it is blocked on a read
+    threading.Thread(
+        target=produce, name="phone-checker-reader", daemon=True
+    ).start()
+    try:
+        while True:
+            if not items:
+                ready.clear()
+                waiting = True
+                # Items appended before ``waiting`` was set woke no one
+                if not items:
+                    await ready.wait()
+                waiting = False
+                continue
+            item, error = items.popleft()
+            if item is end:
+                if error is not None:
+                    raise error
+                return
+            space.release()
+            yield item
+    finally:
+        stopped.set()
+        # Unblocks the thread if it waits for space
+        space.release()
@@ -16,6 +16,11 @@ setup(
         "dnspython>=2.7.0",
         "phonenumbers>=8.12.55",
     ],
+    extras_require={
+        "speedups": ["orjson>=3.8"],
+        "http2": ["httpx[http2]>=0.24"],
+        "arrow": ["pyarrow>=10"],
+    },
     entry_points={
         "console_scripts": [
             "modern-phone-checker=modern_phone_checker.__main__:cli",
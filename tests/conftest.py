@@ -0,0 +1,10 @@
+import pytest_asyncio
+
+from mock_redis import MockRedisServer
+
+
+@pytest_asyncio.fixture
+async def redis_server():
+    """In-memory Redis-protocol server, stopped after the test."""
+    async with MockRedisServer() as server:
+        yield server
@@ -0,0 +1,211 @@
+"""Local stand-in for a Redis server.
+
+MockRedisServer speaks enough of the Redis protocol (RESP2) for the
+shared state of modern_phone_checker: strings with expiry, MGET, SCAN,
+PTTL, TIME and optimistic transactions (WATCH/MULTI/EXEC). Data lives in
+memory and expired keys are removed when they are next touched. Commands
+run one at a time on the event loop, so EXEC is atomic as on Redis.
+"""
+
+import asyncio
+import fnmatch
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _Error(Exception):
+    pass
+
+
+def _encode(reply: Any) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, _Error):
+        return b"-ERR %s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(_encode(r) for r in reply)
+
+
+class _Client:
+    """State of one connection."""
+
+    def __init__(self):
+        # Key -> version seen by WATCH
+        self.watched: Dict[bytes, int] = {}
+        # Commands queued after MULTI
+        self.queued: Optional[List[List[bytes]]] = None
+
+
+class MockRedisServer:
+    """Minimal in-memory Redis-protocol server."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            host: Interface to listen on.
+            port: TCP port (0 picks a free one).
+        """
+        self.host = host
+        self.port = port
+        # Key -> (value, expires_at or None)
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        # Key -> number of writes, to detect changes of watched keys
+        self.versions: Counter = Counter()
+        self.command_counts: Counter = Counter()
+        self._server: Optional[asyncio.AbstractServer] = None
+        # Open connections: their writer and the task serving them
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Clients see the connection closed and their tasks end
+            tasks = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockRedisServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def _lookup(self, key: bytes) -> Optional[Tuple[bytes, Optional[float]]]:
+        item = self.data.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.time():
+            del self.data[key]
+            self.versions[key] += 1
+            return None
+        return item
+
+    def _write(self, key: bytes, item: Optional[Tuple[bytes, Any]]):
+        if item is None:
+            self.data.pop(key, None)
+        else:
+            self.data[key] = item
+        self.versions[key] += 1
+
+    def _run(self, client: _Client, name: str, args: List[bytes]) -> Any:
+        if name == "MULTI":
+            client.queued = []
+            return "OK"
+        if name == "EXEC":
+            queued, client.queued = client.queued, None
+            if queued is None:
+                return _Error("EXEC without MULTI")
+            watched, client.watched = client.watched, {}
+            for key, version in watched.items():
+                self._lookup(key)
+                if self.versions[key] != version:
+                    return None
+            return [self._run(client, c[0].decode().upper(), c[1:])
+                    for c in queued]
+        if client.queued is not None:
+            client.queued.append([name.encode()] + args)
+            return "QUEUED"
+        if name == "WATCH":
+            for key in args:
+                self._lookup(key)
+                client.watched[key] = self.versions[key]
+            return "OK"
+        if name == "UNWATCH":
+            client.watched = {}
+            return "OK"
+        if name in ("PING", "SELECT", "AUTH"):
+            return "PONG" if name == "PING" else "OK"
+        if name == "TIME":
+            now = time.time()
+            return [str(int(now)).encode(),
+                    str(int(now % 1 * 1e6)).encode()]
+        if name == "GET":
+            item = self._lookup(args[0])
+            return item[0] if item else None
+        if name == "MGET":
+            return [(self._lookup(key) or (None,))[0] for key in args]
+        if name == "SET":
+            expires_at = None
+            if len(args) == 4 and args[2].upper() == b"PX":
+                expires_at = time.time() + int(args[3]) / 1000
+            self._write(args[0], (args[1], expires_at))
+            return "OK"
+        if name == "DEL":
+            removed = 0
+            for key in args:
+                if self._lookup(key) is not None:
+                    self._write(key, None)
+                    removed += 1
+            return removed
+        if name == "PTTL":
+            item = self._lookup(args[0])
+            if item is None:
+                return -2
+            if item[1] is None:
+                return -1
+            return int((item[1] - time.time()) * 1000)
+        if name == "SCAN":
+            # Everything in one pass
+            options = dict(zip(args[1::2], args[2::2]))
+            pattern = options.get(b"MATCH", b"*").decode()
+            keys = [key for key in list(self.data)
+                    if self._lookup(key) is not None
+                    and fnmatch.fnmatchcase(key.decode(), pattern)]
+            return [b"0", keys]
+        if name == "DBSIZE":
+            return sum(
+                self._lookup(key) is not None for key in list(self.data)
+            )
+        if name == "FLUSHDB":
+            for key in list(self.data):
+                self._write(key, None)
+            return "OK"
+        return _Error(f"unknown command '{name}'")
+
+    async def _read_command(self, reader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            raise ValueError("inline commands are not supported")
+        args = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    async def _handle(self, reader, writer):
+        client = _Client()
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                name = command[0].decode().upper()
+                self.command_counts[name] += 1
+                writer.write(_encode(self._run(client, name, command[1:])))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            del self._connections[writer]
+            writer.close()
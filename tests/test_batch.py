@@ -0,0 +1,148 @@
+import csv
+import io
+import pickle
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+
+import pytest
+
+from modern_phone_checker.batch import COLUMNS, ResultBatch
+from modern_phone_checker.models import (
+    BulkCheckResult, FrozenPhoneCheckResult, PhoneCheckResult,
+)
+
+CHECKED_AT = datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+
+def make_outcomes():
+    return [
+        BulkCheckResult("612345678", "33", [
+            PhoneCheckResult(
+                "whatsapp", True, metadata={"status": "available"},
+                timestamp=CHECKED_AT,
+            ),
+            PhoneCheckResult(
+                "instagram", False, error="throttled", username="jane",
+                last_seen=CHECKED_AT, timestamp=CHECKED_AT,
+            ),
+        ]),
+        BulkCheckResult("123", "33", [], error="Invalid phone number"),
+        BulkCheckResult("5552345678", "1", [
+            PhoneCheckResult(
+                "whatsapp", True, metadata={"status": "available"},
+                timestamp=CHECKED_AT,
+            ),
+        ]),
+    ]
+
+
+def test_results_are_slotted_and_freezable():
+    result = PhoneCheckResult("whatsapp", True, metadata={"a": 1})
+    assert not hasattr(result, "__dict__")
+    result.exists = False
+
+    frozen = result.freeze()
+    assert isinstance(frozen, FrozenPhoneCheckResult)
+    assert not hasattr(frozen, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        frozen.exists = True
+    # Metadata is copied, not shared
+    result.metadata["a"] = 2
+    assert frozen.metadata == {"a": 1}
+    assert frozen.freeze() is frozen
+    assert frozen.thaw() == PhoneCheckResult(
+        "whatsapp", False, metadata={"a": 1}, timestamp=result.timestamp
+    )
+
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert pickle.loads(pickle.dumps(result)) == result
+    assert FrozenPhoneCheckResult.from_dict(frozen.to_dict()) == frozen
+
+
+def test_batch_stores_rows_in_columns():
+    batch = ResultBatch(make_outcomes())
+
+    assert len(batch) == 4
+    assert batch.exists_count() == 2
+    assert batch.exists(0) and not batch.exists(1)
+    with pytest.raises(IndexError):
+        batch.exists(4)
+    # Repeated strings are stored once
+    assert batch.platform.values == [None, "whatsapp", "instagram"]
+    assert batch.metadata.values == [None, '{"status":"available"}']
+
+    assert batch.row(1) == {
+        "phone": "612345678",
+        "country_code": "33",
+        "platform": "instagram",
+        "exists": False,
+        "error": "throttled",
+        "username": "jane",
+        "last_seen": CHECKED_AT,
+        "metadata": None,
+        "timestamp": CHECKED_AT,
+    }
+    assert batch.row(2)["platform"] is None
+    assert batch.row(2)["error"] == "Invalid phone number"
+
+    rows = list(batch)
+    assert rows[0] == ("612345678", "33", FrozenPhoneCheckResult(
+        "whatsapp", True, metadata={"status": "available"},
+        timestamp=CHECKED_AT,
+    ))
+    assert rows[2] == ("123", "33", None)
+
+
+def test_batch_to_csv():
+    stream = io.StringIO()
+    ResultBatch(make_outcomes()).to_csv(stream)
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+
+    assert list(rows[0]) == list(COLUMNS)
+    assert [row["phone"] for row in rows] == [
+        "612345678", "612345678", "123", "5552345678",
+    ]
+    assert rows[0]["exists"] == "1"
+    assert rows[0]["metadata"] == '{"status":"available"}'
+    assert datetime.fromisoformat(rows[1]["last_seen"]) == (
+        CHECKED_AT.astimezone()
+    )
+    assert rows[2]["error"] == "Invalid phone number"
+    assert rows[2]["timestamp"] == ""
+
+
+def test_batch_to_arrow_and_parquet(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    batch = ResultBatch(make_outcomes())
+
+    table = batch.to_arrow()
+    assert table.column_names == list(COLUMNS)
+    assert pa.types.is_dictionary(table.schema.field("phone").type)
+    assert table.column("exists").to_pylist() == [True, False, False, True]
+    assert table.column("platform").to_pylist() == [
+        "whatsapp", "instagram", None, "whatsapp",
+    ]
+    assert table.column("error").to_pylist() == [
+        None, "throttled", "Invalid phone number", None,
+    ]
+    timestamps = table.column("timestamp").to_pylist()
+    assert timestamps[0] == CHECKED_AT.astimezone()
+    assert timestamps[2] is None
+
+    path = tmp_path / "results.parquet"
+    batch.to_parquet(str(path))
+    assert pq.read_table(str(path)).to_pylist() == table.to_pylist()
+
+
+def test_batch_can_grow_after_export():
+    pytest.importorskip("pyarrow")
+    batch = ResultBatch(make_outcomes())
+    table = batch.to_arrow()
+
+    batch.extend(make_outcomes())
+    assert len(batch) == 8
+    # The exported table does not see the new rows
+    assert table.num_rows == 4
+    assert table.column("phone").to_pylist()[-1] == "5552345678"
+    assert batch.to_arrow().num_rows == 8
@@ -0,0 +1,74 @@
+import pytest
+
+from benchmarks import bench_cache
+from benchmarks.bench_checks import (
+    compare_reports, run_benchmark, run_sharded_benchmark,
+)
+
+
+@pytest.mark.asyncio
+async def test_benchmark_report_against_mock_server():
+    report = await run_benchmark(
+        numbers=20,
+        concurrency=5,
+        latency=0,
+        throttle_rate=0.1,
+        repeat_ratio=0.5,
+    )
+
+    results = report["results"]
+    assert results["checks"] == 20
+    assert results["checks_per_sec"] > 0
+    assert results["p50_ms"] <= results["p95_ms"] <= results["p99_ms"]
+    assert results["cache_hit_ratio"] > 0
+    # Every check reached the mock server, some of them throttled
+    assert report["server"]["requests"] > 0
+    assert set(report["server"]["status_counts"]) <= {"200", "404", "429"}
+
+    lines = compare_reports(report, report)
+    assert any("checks_per_sec" in line for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_sharded_benchmark_report():
+    report = await run_sharded_benchmark(
+        numbers=10, workers=2, platforms=["whatsapp"], latency=0,
+        ordered=True,
+    )
+    assert report["results"]["checks"] == 10
+    assert report["results"]["checks_per_sec"] > 0
+    assert report["server"]["requests"] == 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+async def test_cache_benchmark_report(backend):
+    report = await bench_cache.run_benchmark(
+        backends=[backend], sizes=[50], samples=10
+    )
+
+    data = report["backends"][backend]
+    assert data["writes"]["set_per_sec"] > 0
+    assert data["writes"]["set_bytes_per_entry"] >= 0
+    assert data["writes"]["payload_bytes_per_entry"] > 0
+    [reads] = data["reads"]
+    assert reads["entries"] == 50
+    assert reads["initialize_ms"] >= 0
+    assert reads["memory_hit"]["p50_us"] > 0
+    assert f"{backend}.50.miss_p50_us" in bench_cache.flatten(report)
+
+
+@pytest.mark.asyncio
+async def test_cache_benchmark_redis_backend(redis_server):
+    report = await bench_cache.run_benchmark(
+        backends=["redis"], sizes=[50], samples=10,
+        redis_url=redis_server.url,
+    )
+
+    data = report["backends"]["redis"]
+    assert data["writes"]["set_many_per_sec"] > 0
+    # Nothing is written locally
+    assert "set_bytes_per_entry" not in data["writes"]
+    [reads] = data["reads"]
+    assert reads["backend_hit"]["p50_us"] > 0
+    assert redis_server.command_counts["MGET"] > 0
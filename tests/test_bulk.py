@@ -0,0 +1,158 @@
+import asyncio
+import time
+import pytest
+from datetime import datetime
+
+from modern_phone_checker.core import PhoneChecker
+from modern_phone_checker.models import PhoneCheckResult
+from modern_phone_checker.platforms import AVAILABLE_CHECKERS
+from modern_phone_checker.utils import iterate_in_thread
+
+
+class SlowChecker:
+    """A fake checker that tracks how many checks run at the same time."""
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self, client, api_key=None, cache=None):
+        self.client = client
+
+    async def check(self, phone: str, country_code: str) -> PhoneCheckResult:
+        cls = type(self)
+        cls.in_flight += 1
+        cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        await asyncio.sleep(0.01)
+        cls.in_flight -= 1
+        return PhoneCheckResult(
+            platform="slow",
+            exists=phone.endswith("0"),
+            timestamp=datetime(2025, 1, 1, 0, 0, 0),
+        )
+
+
+@pytest.fixture(autouse=True)
+def register_slow():
+    SlowChecker.in_flight = 0
+    SlowChecker.max_in_flight = 0
+    AVAILABLE_CHECKERS["slow"] = SlowChecker
+    yield
+    AVAILABLE_CHECKERS.pop("slow", None)
+
+
+def french_numbers(count):
+    return ((f"6{i:08d}", "33") for i in range(count))
+
+
+@pytest.mark.asyncio
+async def test_check_numbers_yields_every_number():
+    checker = PhoneChecker(platforms=["slow"], use_cache=False)
+    seen = {}
+    async for outcome in checker.check_numbers(
+        french_numbers(40), concurrency=8
+    ):
+        seen[outcome.phone] = outcome
+    await checker.close()
+
+    assert len(seen) == 40
+    assert all(o.error is None for o in seen.values())
+    assert seen["600000010"].results[0].exists is True
+
+
+@pytest.mark.asyncio
+async def test_check_numbers_respects_limits():
+    checker = PhoneChecker(platforms=["slow"], use_cache=False)
+    outcomes = [
+        o async for o in checker.check_numbers(
+            french_numbers(30), concurrency=10, per_platform_limit=3
+        )
+    ]
+    await checker.close()
+
+    assert len(outcomes) == 30
+    assert SlowChecker.max_in_flight <= 3
+
+
+@pytest.mark.asyncio
+async def test_slow_blocking_input_does_not_stall_checks():
+    def slow_pipe():
+        yield ("612345670", "33")
+        # A producer that is slow to write the next line
+        time.sleep(0.5)
+        yield ("612345671", "33")
+        raise ValueError("truncated input")
+
+    checker = PhoneChecker(platforms=["slow"], use_cache=False)
+    started = time.monotonic()
+    completed = []
+    with pytest.raises(ValueError, match="truncated input"):
+        async for outcome in checker.check_numbers(
+            iterate_in_thread(slow_pipe())
+        ):
+            completed.append((outcome.phone, time.monotonic() - started))
+    await checker.close()
+
+    # The first number was checked while the second was being read
+    assert [phone for phone, _ in completed] == ["612345670", "612345671"]
+    assert completed[0][1] < 0.3
+
+
+@pytest.mark.asyncio
+async def test_input_is_validated_in_chunks(monkeypatch):
+    from modern_phone_checker import core
+
+    chunks = []
+    original = core.normalize_batch
+
+    def normalize_batch(numbers):
+        chunks.append(len(numbers))
+        return original(numbers)
+
+    monkeypatch.setattr(core, "normalize_batch", normalize_batch)
+    numbers = list(french_numbers(2500)) + [("123", "33")]
+
+    async def async_numbers():
+        for number in numbers:
+            yield number
+
+    checker = PhoneChecker(platforms=["slow"], use_cache=False)
+    for source in (numbers, async_numbers()):
+        outcomes = [
+            o async for o in checker.check_numbers(source, concurrency=100)
+        ]
+        assert len(outcomes) == 2501
+        assert [o.phone for o in outcomes if o.error] == ["123"]
+    await checker.close()
+
+    # Readily available numbers are validated a thousand at a time
+    assert chunks == [1000, 1000, 501] * 2
+
+
+@pytest.mark.asyncio
+async def test_check_numbers_accepts_async_input_and_reports_errors():
+    async def numbers():
+        yield ("612345678", "33")
+        yield ("123", "33")
+
+    checker = PhoneChecker(platforms=["slow"], use_cache=False)
+    outcomes = {
+        o.phone: o async for o in checker.check_numbers(numbers())
+    }
+    await checker.close()
+
+    assert outcomes["612345678"].error is None
+    assert outcomes["123"].results == []
+    assert "Invalid number" in outcomes["123"].error
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_of_same_number_are_coalesced():
+    checker = PhoneChecker(platforms=["slow"], use_cache=False)
+    batches = await asyncio.gather(*[
+        checker.check_number("612345678", "33") for _ in range(20)
+    ])
+    await checker.close()
+
+    assert SlowChecker.max_in_flight == 1
+    assert all(len(results) == 1 for results in batches)
+    # Every caller gets its own result object
+    assert len({id(results[0]) for results in batches}) == 20
@@ -0,0 +1,527 @@
+import asyncio
+import time
+import pytest
+from datetime import datetime, timedelta
+
+from modern_phone_checker.cache import (
+    CacheManager, CacheEntry, LRUCache
+)
+from modern_phone_checker.cache_backends import SQLiteBackend
+from modern_phone_checker.core import PhoneChecker
+from modern_phone_checker.models import PhoneCheckResult
+from modern_phone_checker.platforms import AVAILABLE_CHECKERS
+
+
+def make_results(exists=True):
+    return {
+        "whatsapp": PhoneCheckResult(
+            platform="whatsapp",
+            exists=exists,
+            metadata={"status_code": 200},
+            timestamp=datetime(2025, 1, 1, 0, 0, 0),
+        )
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+async def test_cache_round_trip(tmp_path, backend):
+    cache = CacheManager(cache_dir=str(tmp_path), backend=backend)
+    await cache.initialize()
+    await cache.set("612345678", "33", make_results())
+    await cache.close()
+
+    # A fresh manager reads the entry back from disk
+    cache = CacheManager(cache_dir=str(tmp_path), backend=backend)
+    await cache.initialize()
+    cached = await cache.get("612345678", "33", ["whatsapp", "telegram"])
+    assert list(cached) == ["whatsapp"]
+    result, freshness = cached["whatsapp"]
+    assert result.exists is True
+    assert 0 < freshness <= 1
+
+    await cache.invalidate("612345678", "33")
+    assert await cache.get("612345678", "33", ["whatsapp"]) == {}
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_json_entries_are_replaced_atomically(tmp_path, monkeypatch):
+    from modern_phone_checker import cache_backends
+
+    cache = CacheManager(cache_dir=str(tmp_path), backend="json")
+    await cache.set("612345678", "33", make_results())
+    cache_file = tmp_path / "whatsapp_33_612345678.json"
+    before = cache_file.read_bytes()
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    # A write failing midway leaves the previous entry untouched
+    monkeypatch.setattr(cache_backends.os, "utime", fail)
+    with pytest.raises(OSError):
+        await cache.backend.set("whatsapp_33_612345678", b"{}", 0)
+    assert cache_file.read_bytes() == before
+    assert [p.name for p in tmp_path.iterdir()] == [cache_file.name]
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_unreadable_entries_are_misses(tmp_path):
+    cache = CacheManager(cache_dir=str(tmp_path), backend="json")
+    await cache.set("612345678", "33", make_results())
+    await cache.close()
+    cache_file = tmp_path / "whatsapp_33_612345678.json"
+    cache_file.write_bytes(cache_file.read_bytes()[:20])
+
+    cache = CacheManager(cache_dir=str(tmp_path), backend="json")
+    assert await cache.get("612345678", "33", ["whatsapp"]) == {}
+    assert cache.stats()["backend_misses"] == 1
+    # Dropped, so the next check stores a fresh result
+    assert not cache_file.exists()
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_is_not_preloaded(tmp_path):
+    cache = CacheManager(cache_dir=str(tmp_path))
+    await cache.initialize()
+    await cache.set_many(
+        (f"6{i:08d}", "33", make_results()) for i in range(100)
+    )
+    await cache.close()
+
+    assert (tmp_path / "cache.sqlite3").exists()
+    assert not list(tmp_path.glob("*.json"))
+
+    cache = CacheManager(cache_dir=str(tmp_path))
+    await cache.initialize()
+    assert len(cache.cache_data) == 0
+    assert await cache.get("600000042", "33", ["whatsapp"])
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_dropped(tmp_path):
+    cache = CacheManager(cache_dir=str(tmp_path), expire_after=60)
+    await cache.initialize()
+    await cache.set("612345678", "33", make_results())
+    entry = cache.cache_data.get("whatsapp_33_612345678")
+    cache.cache_data.set(
+        "whatsapp_33_612345678",
+        CacheEntry(datetime.now() - timedelta(seconds=120), entry.result),
+        time.time() + 60,
+    )
+
+    assert await cache.get("612345678", "33", ["whatsapp"]) == {}
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_cached_results_are_decoded_once_and_copied(tmp_path):
+    cache = CacheManager(cache_dir=str(tmp_path))
+    await cache.set("612345678", "33", make_results())
+    await cache.close()
+
+    cache = CacheManager(cache_dir=str(tmp_path))
+    first = await cache.get("612345678", "33", ["whatsapp"])
+    first["whatsapp"][0].metadata["cached"] = True
+    second = await cache.get("612345678", "33", ["whatsapp"])
+    await cache.close()
+
+    result = second["whatsapp"][0]
+    assert isinstance(result, PhoneCheckResult)
+    assert result.timestamp == datetime(2025, 1, 1, 0, 0, 0)
+    assert result.metadata == {"status_code": 200}
+    assert cache.stats()["backend_hits"] == 1
+    assert cache.stats()["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_platforms_are_cached_separately_with_own_ttl(tmp_path):
+    cache = CacheManager(
+        cache_dir=str(tmp_path),
+        expire_after=60,
+        platform_ttls={"whatsapp": 3600},
+    )
+    results = make_results()
+    results["instagram"] = PhoneCheckResult(
+        platform="instagram", exists=False
+    )
+    results["snapchat"] = PhoneCheckResult(
+        platform="snapchat", exists=False, error="timeout"
+    )
+    await cache.set("612345678", "33", results)
+
+    cached = await cache.get(
+        "612345678", "33", ["whatsapp", "instagram", "snapchat"]
+    )
+    # Failed checks are not cached so they get retried
+    assert set(cached) == {"whatsapp", "instagram"}
+
+    # Two minutes later only the long-lived WhatsApp result is valid
+    for platform in ("whatsapp", "instagram"):
+        key = f"{platform}_33_612345678"
+        entry = cache.cache_data.get(key)
+        cache.cache_data.set(
+            key,
+            CacheEntry(datetime.now() - timedelta(seconds=120), entry.result),
+            time.time() + 60,
+        )
+    cached = await cache.get("612345678", "33", ["whatsapp", "instagram"])
+    assert set(cached) == {"whatsapp"}
+    await cache.close()
+
+
+class StubChecker:
+    """Platform checker answering that the number is not registered."""
+    def __init__(self, client, api_key=None, cache=None):
+        self.client = client
+
+    async def check(self, phone, country_code):
+        return PhoneCheckResult(platform="stub", exists=False)
+
+
+@pytest.mark.asyncio
+async def test_check_number_only_queries_uncached_platforms(tmp_path):
+    calls = []
+
+    class CountingChecker(StubChecker):
+        async def check(self, phone, country_code):
+            calls.append(phone)
+            return PhoneCheckResult(platform="counting", exists=False)
+
+    AVAILABLE_CHECKERS["stub"] = StubChecker
+    AVAILABLE_CHECKERS["counting"] = CountingChecker
+    try:
+        checker = PhoneChecker(platforms=["stub"], cache_expire=60)
+        checker.cache.cache_dir = tmp_path / "cache"
+        await checker.check_number("612345678", "33")
+        await checker.close()
+
+        # Same cache, one more platform: only the new one is queried
+        checker = PhoneChecker(
+            platforms=["stub", "counting"], cache_expire=60
+        )
+        checker.cache.cache_dir = tmp_path / "cache"
+        results = await checker.check_number("612345678", "33")
+        await checker.close()
+    finally:
+        AVAILABLE_CHECKERS.pop("stub", None)
+        AVAILABLE_CHECKERS.pop("counting", None)
+
+    assert calls == ["612345678"]
+    assert [r.platform for r in results] == ["stub", "counting"]
+    assert results[0].metadata["cached"] is True
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        CacheManager(backend="memcached")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+async def test_initialize_is_lazy_with_optional_warm_up(tmp_path, backend):
+    cache = CacheManager(cache_dir=str(tmp_path), backend=backend)
+    await cache.set_many(
+        (f"6{i:08d}", "33", make_results()) for i in range(20)
+    )
+    await cache.close()
+
+    cache = CacheManager(cache_dir=str(tmp_path), backend=backend)
+    await cache.initialize()
+    assert len(cache.cache_data) == 0
+    assert await cache.get("600000003", "33", ["whatsapp"])
+    assert len(cache.cache_data) == 1
+    await cache.close()
+
+    cache = CacheManager(
+        cache_dir=str(tmp_path), backend=backend, warm_up=5
+    )
+    await cache.initialize()
+    await cache._warm_up_task
+    assert len(cache.cache_data) == 5
+    await cache.close()
+
+
+class RecordingBackend(SQLiteBackend):
+    """SQLite backend remembering the size of every batch written."""
+
+    def __init__(self, cache_dir):
+        super().__init__(cache_dir)
+        self.batches = []
+
+    async def set_many(self, items):
+        self.batches.append(len(items))
+        await super().set_many(items)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_by_size_and_on_close(tmp_path):
+    backend = RecordingBackend(tmp_path)
+    cache = CacheManager(
+        backend=backend, write_behind=True, flush_size=10,
+        flush_interval=60,
+    )
+    await cache.initialize()
+    for i in range(25):
+        await cache.set(f"6{i:08d}", "33", make_results())
+
+    assert backend.batches == [10, 10]
+    assert cache.stats()["pending_writes"] == 5
+    await cache.close()
+    assert backend.batches == [10, 10, 5]
+
+    # Every acknowledged write survived the shutdown
+    cache = CacheManager(cache_dir=str(tmp_path))
+    await cache.initialize()
+    for i in range(25):
+        assert await cache.get(f"6{i:08d}", "33", ["whatsapp"])
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_after_interval(tmp_path):
+    backend = RecordingBackend(tmp_path)
+    cache = CacheManager(
+        backend=backend, write_behind=True, flush_interval=0.01
+    )
+    await cache.initialize()
+    await cache.set("612345678", "33", make_results())
+    await cache.set("612345679", "33", make_results())
+    assert backend.batches == []
+
+    await asyncio.sleep(0.05)
+    assert backend.batches == [2]
+    assert cache.stats()["pending_writes"] == 0
+    await cache.close()
+
+
+class FailingOnceBackend(RecordingBackend):
+    """Backend whose first write fails, like a locked database."""
+
+    async def set_many(self, items):
+        if not self.batches:
+            self.batches.append(0)
+            raise RuntimeError("database is locked")
+        await super().set_many(items)
+
+
+@pytest.mark.asyncio
+async def test_failed_background_flush_is_logged_not_printed(
+    tmp_path, capsys, caplog
+):
+    backend = FailingOnceBackend(tmp_path)
+    cache = CacheManager(
+        backend=backend, write_behind=True, flush_interval=0.01
+    )
+    await cache.initialize()
+    await cache.set("612345678", "33", make_results())
+    await asyncio.sleep(0.1)
+
+    # stdout carries the results of check-batch
+    assert capsys.readouterr().out == ""
+    assert "database is locked" in caplog.text
+    # The entries were queued again and written by the next flush
+    assert backend.batches == [0, 1]
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_pending_writes_are_readable_and_invalidated(tmp_path):
+    cache = CacheManager(
+        cache_dir=str(tmp_path), write_behind=True, flush_interval=60,
+        memory_max_entries=1,
+    )
+    await cache.initialize()
+    await cache.set("612345678", "33", make_results())
+    await cache.set("612345679", "33", make_results())
+
+    # Evicted from memory but not written yet: served from the queue
+    assert "whatsapp_33_612345678" not in cache.cache_data
+    assert await cache.get("612345678", "33", ["whatsapp"])
+
+    # An invalidated entry is never written afterwards
+    await cache.invalidate("612345679", "33")
+    await cache.close()
+    cache = CacheManager(cache_dir=str(tmp_path))
+    await cache.initialize()
+    assert await cache.get("612345678", "33", ["whatsapp"])
+    assert await cache.get("612345679", "33", ["whatsapp"]) == {}
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_phone_checker_close_flushes_shared_cache(tmp_path):
+    cache = CacheManager(
+        cache_dir=str(tmp_path), write_behind=True, flush_interval=60
+    )
+    await cache.initialize()
+    checker = PhoneChecker(cache=cache, platforms=[])
+    await cache.set("612345678", "33", make_results())
+
+    await checker.close()
+    assert cache.stats()["pending_writes"] == 0
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_ahead_serves_stale_results_and_refreshes(tmp_path):
+    release = asyncio.Event()
+    calls = []
+
+    class SlowChecker(StubChecker):
+        async def check(self, phone, country_code):
+            calls.append(phone)
+            if len(calls) > 1:
+                await release.wait()
+            return PhoneCheckResult(platform="slow", exists=len(calls) > 1)
+
+    AVAILABLE_CHECKERS["slow"] = SlowChecker
+    try:
+        # Any cached result is below a freshness threshold of 1
+        checker = PhoneChecker(
+            platforms=["slow"], cache_expire=60, refresh_ahead=1.0
+        )
+        checker.cache.cache_dir = tmp_path / "cache"
+        first = await checker.check_number("612345678", "33")
+        assert first[0].exists is False
+
+        # Served from cache while the refresh waits on the platform
+        for _ in range(3):
+            stale = await checker.check_number("612345678", "33")
+            assert stale[0].metadata["cached"] is True
+            assert stale[0].exists is False
+        assert len(checker._refresh_tasks) == 1
+
+        release.set()
+        await asyncio.gather(*checker._refresh_tasks)
+        refreshed = await checker.check_number("612345678", "33")
+        assert refreshed[0].exists is True
+        await checker.close()
+    finally:
+        AVAILABLE_CHECKERS.pop("slow", None)
+
+    # The initial check and a single background refresh; the refresh
+    # scheduled by the last check was cancelled by close()
+    assert len(calls) == 2
+
+
+async def store_entries(cache, count, expires_at):
+    """Write entries straight to the backend with a given expiry."""
+    entry = CacheEntry(datetime.now(), make_results()["whatsapp"])
+    backend = await cache._get_backend()
+    await backend.set_many([
+        (f"whatsapp_33_6{i:08d}", entry.encode(), expires_at)
+        for i in range(count)
+    ])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+async def test_sweep_removes_expired_entries_within_budget(
+    tmp_path, backend
+):
+    cache = CacheManager(cache_dir=str(tmp_path), backend=backend)
+    await cache.initialize()
+    await store_entries(cache, 10, time.time() - 1)
+    await cache.set("712345678", "33", make_results())
+
+    # Each pass examines at most ``limit`` entries
+    removed = await cache.sweep(limit=4)
+    assert 0 < removed <= 4
+    while await cache.sweep(limit=4):
+        pass
+    stats = await cache.storage_stats()
+    assert stats["entries"] == stats["live"] == 1
+    assert await cache.get("712345678", "33", ["whatsapp"])
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_background_sweeper(tmp_path):
+    cache = CacheManager(cache_dir=str(tmp_path), sweep_interval=0.01)
+    await cache.initialize()
+    await store_entries(cache, 5, time.time() - 1)
+
+    await asyncio.sleep(0.1)
+    assert (await cache.storage_stats())["entries"] == 0
+    await cache.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+async def test_storage_stats_and_compact(tmp_path, backend):
+    cache = CacheManager(
+        cache_dir=str(tmp_path), backend=backend,
+        platform_ttls={"google_voice": 86400},
+    )
+    await cache.initialize()
+    await store_entries(cache, 20, time.time() - 1)
+    results = make_results()
+    results["google_voice"] = PhoneCheckResult("google_voice", False)
+    await cache.set("712345678", "33", results)
+
+    stats = await cache.storage_stats()
+    assert stats["entries"] == 22
+    assert stats["expired"] == 20 and stats["live"] == 2
+    assert stats["platforms"] == {"whatsapp": 21, "google_voice": 1}
+    assert stats["age"]["<1h"] == 2
+    assert stats["age"]["1h-6h"] == 20
+    assert stats["size_bytes"] > 0
+
+    assert await cache.compact() == 20
+    stats = await cache.storage_stats()
+    assert stats["entries"] == 2
+    await cache.close()
+
+
+def test_lru_cache_evicts_least_recently_used():
+    lru = LRUCache(max_entries=2)
+    far = time.time() + 60
+    lru.set("a", 1, far)
+    lru.set("b", 2, far)
+    assert lru.get("a") == 1
+    lru.set("c", 3, far)
+
+    assert "b" not in lru
+    assert lru.get("a") == 1 and lru.get("c") == 3
+    assert lru.stats.evictions == 1
+
+
+def test_lru_cache_drops_expired_entries_first():
+    lru = LRUCache(max_entries=2)
+    lru.set("stale", 1, time.time() - 1)
+    lru.set("fresh", 2, time.time() + 60)
+    lru.set("new", 3, time.time() + 60)
+
+    assert "stale" not in lru and "fresh" in lru
+    assert lru.stats.evictions == 0
+    assert lru.stats.expirations == 1
+    assert lru.get("missing") is None
+    assert lru.stats.misses == 1
+
+
+def test_lru_cache_byte_budget():
+    lru = LRUCache(max_entries=None, max_bytes=2000)
+    far = time.time() + 60
+    for i in range(50):
+        lru.set(str(i), {"payload": "x" * 100}, far)
+
+    assert lru.size_bytes <= 2000
+    assert 0 < len(lru) < 50
+
+
+def test_lru_cache_byte_budget_sizes_slotted_results():
+    lru = LRUCache(max_entries=None, max_bytes=50_000)
+    far = time.time() + 60
+    for i in range(10):
+        result = PhoneCheckResult(
+            platform="whatsapp", exists=True, metadata={"blob": "x" * 10_000}
+        )
+        lru.set(str(i), CacheEntry(datetime.now(), result), far)
+
+    # The metadata of the results counts towards the budget
+    assert 40_000 < lru.size_bytes <= 50_000
+    assert len(lru) < 5
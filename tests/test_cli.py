@@ -1,13 +1,20 @@
+import asyncio
+import json
+import time
 import pytest
 from datetime import datetime
 from click.testing import CliRunner
 
 from modern_phone_checker.__main__ import cli
+from modern_phone_checker.cache import CacheManager, CacheEntry
+from modern_phone_checker.models import PhoneCheckResult
+
 
 @pytest.fixture
 def runner():
     return CliRunner()
 
+
 def test_check_help_shows_options(runner):
     result = runner.invoke(cli, ["check", "--help"])
     assert result.exit_code == 0
@@ -15,15 +22,18 @@ def test_check_help_shows_options(runner):
     assert "--email" in result.output
     assert "--api-key" in result.output
 
+
 def test_help_shows_commands(runner):
     result = runner.invoke(cli, ["--help"])
     assert result.exit_code == 0
     assert "check" in result.output
 
+
 def test_check_phone_only(runner, monkeypatch):
     class DummyChecker:
         def __init__(self, *args, **kwargs):
             pass
+
         async def check_number(self, phone, country, force_refresh=False):
             from modern_phone_checker.models import PhoneCheckResult
             return [
@@ -36,6 +46,7 @@ def test_check_phone_only(runner, monkeypatch):
                     timestamp=datetime(2025, 1, 1, 0, 0, 0),
                 )
             ]
+
         async def close(self):
             pass
 
@@ -48,10 +59,12 @@ def test_check_phone_only(runner, monkeypatch):
     assert result.exit_code == 0
     assert "DUMMY" in result.output
 
+
 def test_check_email_only(runner, monkeypatch):
     class DummyEmail:
         def __init__(self, *args, **kwargs):
             pass
+
         async def check(self, email):
             from modern_phone_checker.models import PhoneCheckResult
             return PhoneCheckResult(
@@ -76,6 +89,7 @@ def test_check_email_only(runner, monkeypatch):
     assert "EMAIL" in result.output
     assert "valid_syntax" in result.output
 
+
 def test_check_email_without_api_key(runner):
     """Should show warning and skip email check if no API key."""
     result = runner.invoke(
@@ -87,3 +101,208 @@ def test_check_email_without_api_key(runner):
         "Email checking requires an API key. Skipping email check."
         in result.output
     )
+
+
+class DummyBatchChecker:
+    instances = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).instances += 1
+
+    async def initialize(self):
+        pass
+
+    async def check_numbers(self, numbers, **kwargs):
+        from modern_phone_checker.core import _iterate_numbers
+        from modern_phone_checker.models import (
+            BulkCheckResult, PhoneCheckResult
+        )
+        async for phone, country in _iterate_numbers(numbers):
+            yield BulkCheckResult(
+                phone=phone,
+                country_code=country,
+                results=[
+                    PhoneCheckResult(
+                        platform="dummy",
+                        exists=True,
+                        timestamp=datetime(2025, 1, 1, 0, 0, 0),
+                    )
+                ],
+            )
+
+    async def close(self):
+        pass
+
+
+def test_check_batch_csv_from_stdin(runner, monkeypatch):
+    import json
+    DummyBatchChecker.instances = 0
+    monkeypatch.setattr(
+        "modern_phone_checker.__main__.PhoneChecker",
+        DummyBatchChecker
+    )
+
+    result = runner.invoke(
+        cli,
+        ["check-batch"],
+        input="phone,country_code\n612345678,33\n5551234567,1\n",
+    )
+    assert result.exit_code == 0
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert [(r["phone"], r["country_code"]) for r in lines] == [
+        ("612345678", "33"), ("5551234567", "1")
+    ]
+    assert lines[0]["results"][0]["platform"] == "dummy"
+    assert DummyBatchChecker.instances == 1
+
+
+def test_check_batch_ndjson_default_country(runner, monkeypatch):
+    import json
+    monkeypatch.setattr(
+        "modern_phone_checker.__main__.PhoneChecker",
+        DummyBatchChecker
+    )
+
+    result = runner.invoke(
+        cli,
+        ["check-batch", "--country", "1"],
+        input='{"phone": "5551234567"}\n\n{"phone": "612345678", '
+              '"country_code": "33"}\n',
+    )
+    assert result.exit_code == 0
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert [r["country_code"] for r in lines] == ["1", "33"]
+
+
+def test_cache_stats_and_compact(runner, tmp_path):
+    async def fill():
+        cache = CacheManager(cache_dir=str(tmp_path))
+        await cache.initialize()
+        entry = CacheEntry(
+            datetime.now(), PhoneCheckResult(platform="whatsapp", exists=True)
+        )
+        backend = await cache._get_backend()
+        await backend.set_many([
+            ("whatsapp_33_600000001", entry.encode(), time.time() - 1),
+            ("whatsapp_33_600000002", entry.encode(), time.time() + 60),
+        ])
+        await cache.close()
+
+    asyncio.run(fill())
+
+    result = runner.invoke(
+        cli, ["cache", "stats", "--cache-dir", str(tmp_path), "--json"]
+    )
+    assert result.exit_code == 0, result.output
+    stats = json.loads(result.output)
+    assert stats["entries"] == 2 and stats["expired"] == 1
+
+    result = runner.invoke(
+        cli, ["cache", "compact", "--cache-dir", str(tmp_path)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Removed 1 expired entries" in result.output
+
+    result = runner.invoke(
+        cli, ["cache", "stats", "--cache-dir", str(tmp_path)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Entries" in result.output
+
+
+def test_check_batch_parquet_output(runner, monkeypatch, tmp_path):
+    pytest.importorskip("pyarrow")
+    from modern_phone_checker.export import read_dataset
+
+    monkeypatch.setattr(
+        "modern_phone_checker.__main__.PhoneChecker",
+        DummyBatchChecker
+    )
+    result = runner.invoke(
+        cli,
+        ["check-batch", "--parquet-dir", str(tmp_path / "out")],
+        input="phone,country_code\n612345678,33\n5551234567,1\n",
+    )
+    assert result.exit_code == 0
+    assert result.output == ""
+    rows = read_dataset(tmp_path / "out").to_pylist()
+    assert sorted((r["country_code"], r["phone"]) for r in rows) == [
+        ("1", "5551234567"), ("33", "612345678"),
+    ]
+
+
+def test_check_batch_resumes_from_checkpoint(runner, monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "modern_phone_checker.__main__.PhoneChecker",
+        DummyBatchChecker
+    )
+    checkpoint = tmp_path / "job.checkpoint"
+    args = ["check-batch", "--checkpoint", str(checkpoint)]
+
+    result = runner.invoke(cli, args, input="612345678\n612345679\n")
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == 2
+
+    # The input grew: only the new number is checked
+    result = runner.invoke(
+        cli, args, input="612345678\n612345679\n5551234567\n"
+    )
+    assert result.exit_code == 0
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert [r["phone"] for r in lines] == ["5551234567"]
+
+
+def test_check_batch_checkpoint_keeps_parquet_row_groups(
+    runner, monkeypatch, tmp_path
+):
+    pytest.importorskip("pyarrow")
+    from modern_phone_checker.export import read_dataset
+
+    monkeypatch.setattr(
+        "modern_phone_checker.__main__.PhoneChecker",
+        DummyBatchChecker
+    )
+    out = tmp_path / "out"
+    args = [
+        "check-batch", "--parquet-dir", str(out), "--checkpoint",
+        str(tmp_path / "job.checkpoint"), "--checkpoint-every", "1",
+    ]
+    numbers = "".join(f"61234567{i}\n" for i in range(5))
+    result = runner.invoke(cli, args, input=numbers)
+    assert result.exit_code == 0, result.output
+    # Checkpoints did not cut the partition into one file per number
+    assert len(list(out.rglob("*.parquet"))) == 1
+
+    result = runner.invoke(cli, args, input=numbers + "612345679\n")
+    assert result.exit_code == 0, result.output
+    phones = [r["phone"] for r in read_dataset(out).to_pylist()]
+    assert sorted(phones) == [f"61234567{i}" for i in [0, 1, 2, 3, 4, 9]]
+
+
+def test_check_batch_shared_state(runner, monkeypatch, tmp_path):
+    from modern_phone_checker.shared_state import SharedRateLimiter
+    created = []
+
+    class RecordingChecker(DummyBatchChecker):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(kwargs)
+
+    monkeypatch.setattr(
+        "modern_phone_checker.__main__.PhoneChecker", RecordingChecker
+    )
+    shared = tmp_path / "shared"
+    result = runner.invoke(
+        cli,
+        ["check-batch", "--shared-state", str(shared)],
+        input="phone,country_code\n612345678,33\n",
+    )
+    assert result.exit_code == 0, result.output
+    limiters = created[0]["rate_limiters"]
+    assert sorted(limiters) == ["telegram", "whatsapp"]
+    assert all(
+        isinstance(limiter, SharedRateLimiter)
+        for limiter in limiters.values()
+    )
+    assert created[0]["cache"].backend.cache_dir == shared
+    assert (shared / "shared_state.sqlite3").exists()
@@ -1,7 +1,9 @@
 import pytest
+import dns.resolver
 from datetime import datetime
 
 from modern_phone_checker.core import PhoneChecker
+from modern_phone_checker.email_checker import EmailChecker
 from modern_phone_checker.models import PhoneCheckResult
 from modern_phone_checker.platforms import AVAILABLE_CHECKERS
 
@@ -81,3 +83,67 @@ async def test_check_number_with_cache(tmp_path, monkeypatch):
     assert results2[0].metadata.get("cached") is True
 
     await checker.close()
+
+
+class FakeAnswer:
+    def __init__(self, ttl):
+        self.rrset = type("RRset", (), {"ttl": ttl})()
+
+    def __len__(self):
+        return 1
+
+
+class FakeResolver:
+    """Async resolver answering from a fixed table and counting queries."""
+    def __init__(self):
+        self.queries = []
+
+    async def resolve(self, domain, rdtype):
+        self.queries.append(domain)
+        if domain == "example.com":
+            return FakeAnswer(ttl=3600)
+        if domain == "flaky.com":
+            raise dns.resolver.LifetimeTimeout()
+        if domain == "servfail.com":
+            raise dns.resolver.NoNameservers()
+        raise dns.resolver.NXDOMAIN()
+
+
+@pytest.mark.asyncio
+async def test_email_check_caches_mx_answers():
+    resolver = FakeResolver()
+    checker = EmailChecker(resolver=resolver)
+
+    ok = await checker.check("alice@example.com")
+    again = await checker.check("bob@EXAMPLE.com")
+    missing = await checker.check("carol@nowhere.invalid")
+    await checker.check("dave@nowhere.invalid")
+    bad = await checker.check("not-an-email")
+    failed = await checker.check("erin@servfail.com")
+    await checker.check("frank@servfail.com")
+
+    assert ok.exists is True and again.exists is True
+    assert missing.exists is False and missing.error
+    assert bad.metadata == {"valid_syntax": False, "valid_mx": False}
+    assert failed.exists is False and failed.error
+    # Positive and negative answers are each resolved once; failing
+    # name servers prove nothing and are asked again
+    assert resolver.queries == [
+        "example.com", "nowhere.invalid", "servfail.com", "servfail.com",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_email_check_many_resolves_each_domain_once():
+    resolver = FakeResolver()
+    checker = EmailChecker(resolver=resolver)
+    emails = [f"user{i}@example.com" for i in range(50)]
+    emails += [f"user{i}@flaky.com" for i in range(50)]
+    emails.append("broken")
+
+    results = [r async for r in checker.check_many(emails, chunk_size=1000)]
+
+    assert len(results) == 101
+    assert all(r.exists for r in results[:50])
+    assert not any(r.exists for r in results[50:])
+    assert sorted(resolver.queries) == ["example.com", "flaky.com"]
@@ -0,0 +1,127 @@
+import os
+import stat
+from datetime import datetime
+
+import pytest
+
+from modern_phone_checker.export import (
+    ParquetDatasetWriter, partition_key, read_dataset,
+)
+from modern_phone_checker.models import BulkCheckResult, PhoneCheckResult
+
+pytest.importorskip("pyarrow")
+
+CHECKED_AT = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def outcome(phone, country_code="33"):
+    return BulkCheckResult(phone, country_code, [
+        PhoneCheckResult(platform, True, timestamp=CHECKED_AT)
+        for platform in ("whatsapp", "telegram")
+    ])
+
+
+def parts(root):
+    return sorted(p.relative_to(root).as_posix()
+                  for p in root.rglob("*.parquet"))
+
+
+def test_partition_key():
+    date = CHECKED_AT.astimezone().date().isoformat()
+    assert partition_key(outcome("612345678")) == ("33", date)
+    invalid = BulkCheckResult("12", "1", [], error="Invalid phone number")
+    assert partition_key(invalid)[0] == "1"
+
+
+@pytest.mark.asyncio
+async def test_writes_partitioned_row_groups(tmp_path):
+    import pyarrow.parquet as pq
+
+    async with ParquetDatasetWriter(tmp_path, row_group_size=4) as writer:
+        for i in range(5):
+            await writer.write(outcome(f"61234567{i}"))
+        await writer.write(outcome("5552345678", "1"))
+        # Two full row groups of French results are already written
+        assert writer.parts_written == 2
+        assert not list(tmp_path.rglob(".*.tmp"))
+
+    assert writer.rows_written == 12
+    files = parts(tmp_path)
+    assert len(files) == 4
+    assert sum(f.startswith("country_code=33/date=") for f in files) == 3
+    for path in tmp_path.rglob("*.parquet"):
+        metadata = pq.ParquetFile(str(path)).metadata
+        assert metadata.num_row_groups == 1
+        assert metadata.num_rows <= 4
+        assert "country_code" not in metadata.schema.names
+
+    table = read_dataset(tmp_path)
+    assert table.num_rows == 12
+    rows = table.to_pylist()
+    assert {(r["country_code"], r["platform"]) for r in rows} == {
+        ("33", "whatsapp"), ("33", "telegram"),
+        ("1", "whatsapp"), ("1", "telegram"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_buffered_rows_are_bounded(tmp_path):
+    writer = ParquetDatasetWriter(
+        tmp_path, row_group_size=100, max_buffered_rows=100
+    )
+    for i, country_code in enumerate(["33", "1", "44"] * 20):
+        await writer.write(outcome(f"6123456{i:02d}", country_code))
+        assert writer._buffered_rows <= 100
+    await writer.close()
+    assert read_dataset(tmp_path).num_rows == 120
+
+
+@pytest.mark.asyncio
+async def test_resumed_writer_appends_parts(tmp_path):
+    first = ParquetDatasetWriter(tmp_path, row_group_size=4)
+    await first.write(outcome("612345671"))
+    await first.write(outcome("612345672"))
+    # Interrupted: the buffered number is lost, written parts remain
+    await first.write(outcome("612345673"))
+    before = parts(tmp_path)
+    assert len(before) == 1
+
+    async with ParquetDatasetWriter(tmp_path, row_group_size=4) as second:
+        await second.write(outcome("612345673"))
+    after = parts(tmp_path)
+    assert set(before) < set(after)
+    assert len(after) == 2
+    phones = [r["phone"] for r in read_dataset(tmp_path).to_pylist()]
+    assert sorted(set(phones)) == ["612345671", "612345672", "612345673"]
+
+
+@pytest.mark.asyncio
+async def test_parts_are_synced_before_they_appear(tmp_path, monkeypatch):
+    from modern_phone_checker import export
+
+    events = []
+    fsync, replace = os.fsync, os.replace
+
+    def recording_fsync(fd):
+        is_dir = stat.S_ISDIR(os.fstat(fd).st_mode)
+        events.append("fsync dir" if is_dir else "fsync file")
+        fsync(fd)
+
+    def recording_replace(src, dst):
+        # Nothing is visible to readers until the rename
+        assert parts(tmp_path) == []
+        events.append("replace")
+        replace(src, dst)
+
+    monkeypatch.setattr(export.os, "fsync", recording_fsync)
+    monkeypatch.setattr(export.os, "replace", recording_replace)
+    writer = ParquetDatasetWriter(tmp_path, row_group_size=4)
+    await writer.write(outcome("612345671"), token=1)
+    assert writer.take_durable() == [] and events == []
+    await writer.write(outcome("612345672"), token=2)
+
+    # The part and every directory leading to it are synced
+    assert events == ["fsync file", "replace"] + ["fsync dir"] * 3
+    assert writer.take_durable() == [1, 2]
+    assert len(parts(tmp_path)) == 1
+    assert not list(tmp_path.rglob(".*.tmp"))
@@ -0,0 +1,43 @@
+import pytest
+
+from modern_phone_checker import HTTPConfig, create_http_client
+from modern_phone_checker.core import PhoneChecker
+
+
+def test_http_config_timeouts_per_platform():
+    config = HTTPConfig(
+        connect_timeout=2, read_timeout=4,
+        platform_timeouts={"instagram": (1, 20)},
+    )
+    assert config.timeout().read == 4
+    assert config.timeout("instagram").connect == 1
+    assert config.timeout("instagram").read == 20
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_and_left_open():
+    client = create_http_client(HTTPConfig(max_connections=10))
+    config = HTTPConfig(platform_timeouts={"telegram": (1, 3)})
+
+    async with PhoneChecker(
+        platforms=["whatsapp", "telegram"],
+        use_cache=False,
+        client=client,
+        http_config=config,
+    ) as first:
+        second = PhoneChecker(use_cache=False, client=client)
+        assert first.client is second.client is client
+        assert first.checkers["whatsapp"].client is client
+        assert first.checkers["whatsapp"].timeout is None
+        assert first.checkers["telegram"].timeout.read == 3
+        await second.close()
+
+    assert not client.is_closed
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_owned_client_is_closed():
+    async with PhoneChecker(use_cache=False) as checker:
+        pass
+    assert checker.client.is_closed
@@ -0,0 +1,157 @@
+import json
+
+import pytest
+
+from modern_phone_checker.core import _iterate_numbers
+from modern_phone_checker.jobs import (
+    CheckpointedJob, CheckpointLog, CheckpointMismatchError,
+)
+from modern_phone_checker.models import BulkCheckResult, PhoneCheckResult
+
+
+class FakeCache:
+    def __init__(self):
+        self.flushes = 0
+
+    async def flush(self):
+        self.flushes += 1
+
+
+class ShufflingChecker:
+    """Completes numbers out of input order, like check_numbers does."""
+
+    def __init__(self):
+        self.cache = FakeCache()
+        self.checked = []
+
+    async def check_numbers(self, numbers, **kwargs):
+        window = []
+        async for phone, country_code in _iterate_numbers(numbers):
+            window.append((phone, country_code))
+            if len(window) == 3:
+                while window:
+                    yield self._check(*window.pop())
+        while window:
+            yield self._check(*window.pop())
+
+    def _check(self, phone, country_code):
+        self.checked.append(phone)
+        return BulkCheckResult(
+            phone, country_code, [PhoneCheckResult("whatsapp", True)]
+        )
+
+
+NUMBERS = [(f"61234567{i}", "33") for i in range(10)]
+
+
+async def consume(job, numbers, stop_after=None):
+    phones = []
+    async for outcome in job.run(numbers):
+        phones.append(outcome.phone)
+        if len(phones) == stop_after:
+            break
+    return phones
+
+
+@pytest.mark.asyncio
+async def test_resumes_where_it_stopped(tmp_path):
+    path = tmp_path / "job.checkpoint"
+    checker = ShufflingChecker()
+    job = CheckpointedJob(checker, str(path), checkpoint_every=2)
+    first = await consume(job, NUMBERS, stop_after=5)
+    # The last result was taken but the consumer never came back for
+    # more, so it is not counted as completed
+    assert job.completed == 4
+    assert checker.cache.flushes >= 2
+
+    job = CheckpointedJob(ShufflingChecker(), str(path))
+    second = await consume(job, NUMBERS)
+    assert job.skipped == 4
+    assert sorted(set(first[:4]) | set(second)) == sorted(
+        phone for phone, _ in NUMBERS
+    )
+    assert not set(first[:4]) & set(second)
+    assert job.log.finished
+
+    # A finished job has nothing left to do
+    job = CheckpointedJob(ShufflingChecker(), str(path))
+    assert await consume(job, NUMBERS) == []
+    assert job.skipped == len(NUMBERS)
+
+
+@pytest.mark.asyncio
+async def test_log_records_offset_and_out_of_order_keys(tmp_path):
+    path = tmp_path / "job.checkpoint"
+    job = CheckpointedJob(ShufflingChecker(), str(path), checkpoint_every=1)
+    # Items 2 and 1 complete first; item 0 is never marked completed
+    await consume(job, NUMBERS, stop_after=3)
+
+    log = CheckpointLog(str(path))
+    log.load()
+    assert log.offset == 0
+    assert log.done == {2: "33:612345672", 1: "33:612345671"}
+    # Loading compacts the log to a single record
+    assert len(path.read_text().splitlines()) == 1
+
+
+@pytest.mark.asyncio
+async def test_torn_record_is_ignored(tmp_path):
+    path = tmp_path / "job.checkpoint"
+    path.write_text(
+        json.dumps({"offset": 3, "done": [[5, "33:612345675"]]}) + "\n"
+        + '{"offset": 8, "do'
+    )
+    checker = ShufflingChecker()
+    job = CheckpointedJob(checker, str(path))
+    await consume(job, NUMBERS)
+    assert sorted(checker.checked) == [
+        "612345673", "612345674", "612345676", "612345677", "612345678",
+        "612345679",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_changed_input_is_rejected(tmp_path):
+    path = tmp_path / "job.checkpoint"
+    path.write_text(json.dumps({"offset": 0, "done": [[1, "1:5551234"]]}))
+    job = CheckpointedJob(ShufflingChecker(), str(path))
+    with pytest.raises(CheckpointMismatchError):
+        await consume(job, NUMBERS)
+
+
+@pytest.mark.asyncio
+async def test_durable_outputs_decide_completion(tmp_path):
+    path = tmp_path / "job.checkpoint"
+    buffered, stored, flushes = [], [], []
+
+    def durable():
+        done, stored[:] = list(stored), []
+        return done
+
+    async def flush():
+        flushes.append(len(buffered))
+        stored.extend(buffered)
+        buffered.clear()
+
+    job = CheckpointedJob(
+        ShufflingChecker(), str(path), checkpoint_every=1,
+        on_checkpoint=flush, durable=durable,
+    )
+    completed = []
+    async for outcome in job.run(NUMBERS):
+        completed.append(job.completed)
+        buffered.append(job.position)
+        # The output stores its rows four at a time
+        if len(buffered) == 4:
+            stored.extend(buffered)
+            buffered.clear()
+    # Numbers count once stored, not once taken
+    assert completed == [0, 0, 0, 0, 4, 4, 4, 4, 8, 8]
+    # Only the final checkpoint flushed the output
+    assert flushes == [2]
+    assert job.completed == len(NUMBERS)
+    assert job.log.finished
+
+    log = CheckpointLog(str(path))
+    log.load()
+    assert log.finished and log.offset == len(NUMBERS)
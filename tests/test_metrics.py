@@ -0,0 +1,87 @@
+import httpx
+import pytest
+
+from modern_phone_checker import metrics
+from modern_phone_checker.core import PhoneChecker
+from modern_phone_checker.metrics import InMemoryMetrics, NullMetrics
+from modern_phone_checker.platforms.whatsapp import WhatsAppChecker
+
+
+@pytest.fixture
+def store():
+    store = InMemoryMetrics()
+    previous = metrics.set_registry(store)
+    yield store
+    metrics.set_registry(previous)
+
+
+def test_render_prometheus_text(store):
+    store.inc("phone_checker_cache_hits_total", 2, tier="memory")
+    store.add("phone_checker_checks_in_flight", 1)
+    store.observe("phone_checker_check_seconds", 0.003)
+    text = store.render()
+
+    assert "# TYPE phone_checker_cache_hits_total counter" in text
+    assert 'phone_checker_cache_hits_total{tier="memory"} 2' in text
+    assert 'phone_checker_check_seconds_bucket{le="0.005"} 1' in text
+    assert 'phone_checker_check_seconds_bucket{le="0.0025"} 0' in text
+    assert "phone_checker_check_seconds_count 1" in text
+
+
+@pytest.mark.asyncio
+async def test_check_number_is_instrumented(store, tmp_path):
+    def handler(request):
+        return httpx.Response(200, json={"exists": True})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    checker = PhoneChecker(platforms=["whatsapp"], client=client)
+    checker.cache.cache_dir = tmp_path
+    await checker.check_number("612345678", "33")
+    await checker.check_number("612345678", "33")
+    await checker.close()
+    await client.aclose()
+
+    assert store.value("phone_checker_checks_total") == 2
+    assert store.value("phone_checker_checks_in_flight") == 0
+    assert store.count("phone_checker_check_seconds") == 2
+    assert store.count(
+        "phone_checker_http_request_seconds", platform="whatsapp"
+    ) == 1
+    assert store.count(
+        "phone_checker_json_parse_seconds", platform="whatsapp"
+    ) == 1
+    assert store.value("phone_checker_cache_misses_total") == 1
+    assert store.value(
+        "phone_checker_cache_hits_total", tier="memory"
+    ) == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_server_serves_text(store):
+    store.inc("phone_checker_checks_total")
+    server = await metrics.start_metrics_server(port=0, metrics=store)
+    port = server.sockets[0].getsockname()[1]
+    async with httpx.AsyncClient() as client:
+        resp = await client.get(f"http://127.0.0.1:{port}/metrics")
+        missing = await client.get(f"http://127.0.0.1:{port}/other")
+    server.close()
+    await server.wait_closed()
+
+    assert resp.status_code == 200
+    assert "phone_checker_checks_total 1" in resp.text
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_null_metrics_records_nothing():
+    previous = metrics.set_registry(NullMetrics())
+    try:
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda r: httpx.Response(404))
+        )
+        result = await WhatsAppChecker(client).check("612345678", "33")
+        await client.aclose()
+    finally:
+        metrics.set_registry(previous)
+    assert result.exists is False
+    assert not hasattr(NullMetrics(), "render")
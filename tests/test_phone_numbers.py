@@ -0,0 +1,96 @@
+import pytest
+
+from modern_phone_checker.phone_numbers import (
+    NUMBERING_PLANS, normalize_batch, normalize_phone_number, parse_e164,
+    split_calling_code, to_e164,
+)
+from modern_phone_checker.utils import validate_phone_number
+
+
+@pytest.mark.parametrize("number, expected", [
+    ("+33 6 12 34 56 78", ("33", "612345678")),
+    ("+1 (555) 234-5678", ("1", "5552345678")),
+    ("+44 7700 900123", ("44", "7700900123")),
+    ("+55 11 99999 8888", ("55", "11999998888")),
+    ("+971 50 123 4567", ("971", "501234567")),
+    ("+61 412 345 678", ("61", "412345678")),
+    ("+49 151 12345678", ("49", "15112345678")),
+    ("0033612345678", ("33", "612345678")),
+    ("+999 1234567", None),     # unassigned calling code
+    ("+33 5 12 34 56 78", None),  # French landline
+    ("+33", None),
+    ("+33 6 12 AB 56 78", None),
+])
+def test_parse_e164(number, expected):
+    assert parse_e164(number) == expected
+
+
+@pytest.mark.parametrize("phone, country, expected", [
+    ("612345678", "33", ("33", "612345678")),
+    ("06 12 34 56 78", "33", ("33", "612345678")),
+    ("06.12.34.56.78", "33", ("33", "612345678")),
+    ("5552345678", "1", ("1", "5552345678")),
+    ("1 555 234 5678", "1", ("1", "5552345678")),
+    ("89161234567", "7", ("7", "9161234567")),
+    ("8001234567", "7", ("7", "8001234567")),  # NSN starting with 8
+    # The trunk prefix also fits the NSN lengths of these plans
+    ("0412 345 678", "61", ("61", "412345678")),
+    ("412345678", "61", ("61", "412345678")),
+    ("0151 12345678", "49", ("49", "15112345678")),
+    ("15112345678", "49", ("49", "15112345678")),
+    # E.164 input wins over the default country
+    ("+44 7700 900123", "33", ("44", "7700900123")),
+    ("0033612345678", "1", ("33", "612345678")),
+    ("123", "33", None),
+    ("1234567890", "1", None),  # NANP area codes do not start with 1
+    ("612345678", "999", None),  # unknown calling code
+    ("612345678", None, None),
+])
+def test_normalize_phone_number(phone, country, expected):
+    assert normalize_phone_number(phone, country) == expected
+    assert validate_phone_number(phone, country) is (expected is not None)
+
+
+def test_calling_codes_are_prefix_free():
+    codes = set(NUMBERING_PLANS)
+    for code in codes:
+        for length in range(1, len(code)):
+            assert code[:length] not in codes
+    assert split_calling_code("33612345678") == ("33", "612345678")
+    assert split_calling_code("0123") is None
+
+
+def test_normalize_batch_matches_single_numbers():
+    numbers = [
+        ("612345678", "33"),
+        ("06 12 34 56 78", "33"),
+        ("512345678", "33"),
+        ("5552345678", "1"),
+        ("+44 7700 900123", None),
+        ("+44 7700 900123", "1"),
+        ("61234\n5678", "33"),
+        ("bad", "33"),
+        ("612345678", "999"),
+        ("0412345678", "61"),
+        ("412345678", "61"),
+        ("+61412345678", "61"),
+        ("015112345678", "49"),
+        ("15112345678", "49"),
+        ("+4915112345678", "49"),
+    ] * 3
+
+    results = normalize_batch(numbers)
+    assert results == [normalize_phone_number(p, c) for p, c in numbers]
+    assert results[0] == ("33", "612345678")
+    assert results[2] is None
+    # National and international forms give the same number
+    assert results[9] == results[10] == results[11] == ("61", "412345678")
+    assert results[12] == results[13] == results[14] == (
+        "49", "15112345678"
+    )
+
+
+def test_to_e164():
+    assert to_e164(*normalize_phone_number("06 12 34 56 78", "33")) == (
+        "+33612345678"
+    )
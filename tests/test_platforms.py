@@ -0,0 +1,94 @@
+import subprocess
+import sys
+
+import pytest
+
+from modern_phone_checker import platforms
+from modern_phone_checker.platforms import (
+    BUILTIN_CHECKERS, CheckerRegistry,
+)
+from modern_phone_checker.platforms.base import BaseChecker
+
+
+class FakeChecker(BaseChecker):
+    async def check(self, phone, country_code):
+        raise NotImplementedError
+
+
+class FakeEntryPoint:
+    def __init__(self, name, checker):
+        self.name = name
+        self.checker = checker
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return self.checker
+
+
+def test_checker_modules_imported_on_first_lookup():
+    code = (
+        "import sys\n"
+        "import modern_phone_checker.core\n"
+        "from modern_phone_checker.platforms import AVAILABLE_CHECKERS\n"
+        "module = 'modern_phone_checker.platforms.whatsapp'\n"
+        "assert module not in sys.modules\n"
+        "assert 'whatsapp' in AVAILABLE_CHECKERS\n"
+        "assert module not in sys.modules\n"
+        "AVAILABLE_CHECKERS['whatsapp']\n"
+        "assert module in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_cli_help_does_not_import_http_stack():
+    code = (
+        "import sys\n"
+        "from click.testing import CliRunner\n"
+        "from modern_phone_checker.__main__ import cli\n"
+        "assert CliRunner().invoke(cli, ['--help']).exit_code == 0\n"
+        "assert 'httpx' not in sys.modules\n"
+        "assert 'dns.resolver' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_entry_points_discovered_for_unknown_names(monkeypatch):
+    entry_point = FakeEntryPoint("signal", FakeChecker)
+    shadowing = FakeEntryPoint("whatsapp", FakeChecker)
+    scans = []
+
+    def entry_points(group):
+        scans.append(group)
+        return [entry_point, shadowing]
+
+    monkeypatch.setattr(platforms, "_entry_points", entry_points)
+    registry = CheckerRegistry(BUILTIN_CHECKERS)
+
+    # Built-in platforms never trigger a scan
+    assert "telegram" in registry
+    assert not scans
+
+    assert registry["signal"] is FakeChecker
+    assert registry["signal"] is FakeChecker
+    assert scans == [platforms.ENTRY_POINT_GROUP]
+    assert entry_point.loads == 1
+    # Plugins cannot replace a built-in checker
+    assert registry["whatsapp"] is not FakeChecker
+    assert set(registry) == set(BUILTIN_CHECKERS) | {"signal"}
+    with pytest.raises(KeyError):
+        registry["unknown"]
+
+
+def test_register_by_reference(monkeypatch):
+    monkeypatch.setattr(platforms, "_entry_points", lambda group: [])
+    registry = CheckerRegistry({})
+    registry.register("fake", f"{__name__}:FakeChecker")
+    assert not registry.is_loaded("fake")
+    assert registry["fake"] is FakeChecker
+    assert registry.is_loaded("fake")
+
+    registry["fake"] = BaseChecker
+    assert registry["fake"] is BaseChecker
+    del registry["fake"]
+    assert "fake" not in registry
@@ -0,0 +1,71 @@
+import asyncio
+import time
+import httpx
+import pytest
+
+from modern_phone_checker.core import PhoneChecker
+from modern_phone_checker.platforms.whatsapp import WhatsAppChecker
+from modern_phone_checker.resilience import RetryPolicy
+from modern_phone_checker.utils import RateLimiter, parse_retry_after
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_burst_then_throttles():
+    limiter = RateLimiter(calls=5, period=0.1)
+    start = time.monotonic()
+    await asyncio.gather(*[limiter.acquire() for _ in range(10)])
+    elapsed = time.monotonic() - start
+
+    # 5 immediate tokens, then 5 more at 50 per second
+    assert 0.08 <= elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_penalize_and_recover():
+    limiter = RateLimiter(calls=100, period=1)
+    limiter.penalize(retry_after=0.05)
+    assert limiter.rate == 50
+
+    start = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.05
+
+    for _ in range(20):
+        limiter.reward()
+    assert limiter.rate == 100
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_checker_slows_down_on_429():
+    def handler(request):
+        return httpx.Response(429, headers={"Retry-After": "0"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    checker = WhatsAppChecker(
+        client,
+        rate_limiter=RateLimiter(10, 1),
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+    result = await checker.check("612345678", "33")
+    await client.aclose()
+
+    assert result.exists is False
+    assert "HTTP 429" in result.error
+    assert checker.rate_limiter.rate == 5
+
+
+def test_rate_limits_are_configured_per_platform():
+    checker = PhoneChecker(
+        platforms=["whatsapp", "telegram"],
+        use_cache=False,
+        rate_limits={"whatsapp": (2, 1.0)},
+    )
+    assert checker.checkers["whatsapp"].rate_limiter.max_rate == 2
+    assert checker.checkers["telegram"].rate_limiter.max_rate == 30
@@ -0,0 +1,116 @@
+import httpx
+import pytest
+
+from modern_phone_checker.confidence import ConfidenceScorer
+from modern_phone_checker.platforms.telegram import TelegramChecker
+from modern_phone_checker.resilience import CircuitBreaker, RetryPolicy
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay=0.001)
+
+
+def make_checker(handler, **kwargs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return TelegramChecker(client, retry_policy=FAST_RETRY, **kwargs)
+
+
+def test_retry_delay_is_bounded_and_honours_retry_after():
+    policy = RetryPolicy(base_delay=1, max_delay=4, jitter=False)
+    assert [policy.delay(n) for n in (1, 2, 3, 4)] == [1, 2, 4, 4]
+    assert policy.delay(1, retry_after=10) == 10
+    jittered = RetryPolicy(base_delay=1, max_delay=4)
+    assert all(0 <= jittered.delay(3) <= 4 for _ in range(20))
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            raise httpx.ConnectTimeout("timed out")
+        return httpx.Response(200, json={"result": []})
+
+    checker = make_checker(handler)
+    result = await checker.check("612345678", "33")
+
+    assert len(calls) == 3
+    assert result.exists is True and result.error is None
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_fails_fast():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    scorer = ConfidenceScorer()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    checker = make_checker(handler, circuit_breaker=breaker, scorer=scorer)
+
+    for _ in range(2):
+        await checker.check("612345678", "33")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert len(calls) == 6
+
+    result = await checker.check("612345678", "33")
+    assert "Circuit open" in result.error
+    assert len(calls) == 6
+    assert scorer.platform_scores["telegram"].success_rate < 1.0
+
+
+def test_circuit_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [429, 503])
+async def test_exhausted_retries_are_errors_and_not_cached(tmp_path, status):
+    from modern_phone_checker.cache import CacheManager
+    from modern_phone_checker.platforms.whatsapp import WhatsAppChecker
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(status))
+    )
+    checker = WhatsAppChecker(client, retry_policy=FAST_RETRY)
+    result = await checker.check("612345678", "33")
+    assert result.exists is False
+    assert f"HTTP {status} after 3 attempts" in result.error
+
+    cache = CacheManager(cache_dir=str(tmp_path))
+    await cache.set("612345678", "33", {"whatsapp": result})
+    assert await cache.get("612345678", "33", ["whatsapp"]) == {}
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_its_slot():
+    import asyncio
+
+    slow = True
+
+    async def handler(request):
+        if slow:
+            await asyncio.sleep(10)
+        return httpx.Response(200, json={"result": []})
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    checker = make_checker(handler, circuit_breaker=breaker)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(checker.check("612345678", "33"), 0.1)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    slow = False
+    result = await checker.check("612345678", "33")
+    assert result.error is None
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,111 @@
+import functools
+import time
+
+import pytest
+
+from benchmarks.mock_server import MockPlatformServer, point_checkers_at
+from modern_phone_checker.sharding import (
+    ShardedChecker, WorkerError, outcome_to_json, shard_of,
+)
+
+NUMBERS = [(f"6123456{i:02d}", "33") for i in range(30)]
+
+
+class TimingServer(MockPlatformServer):
+    """Records when each request arrives."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.request_times = []
+
+    async def _respond(self, method, target, body):
+        self.request_times.append(time.monotonic())
+        return await super()._respond(method, target, body)
+
+
+def fail_on_start(checker):
+    raise RuntimeError("worker setup failed")
+
+
+def sharded(server, **kwargs):
+    options = {
+        "platforms": ["whatsapp"],
+        "rate_limits": {"whatsapp": (1000, 1.0)},
+    }
+    options.update(kwargs.pop("checker_options", {}))
+    return ShardedChecker(
+        workers=2,
+        checker_options=options,
+        on_start=functools.partial(
+            point_checkers_at, base_url=server.base_url
+        ),
+        **kwargs
+    )
+
+
+def test_shard_of_is_stable():
+    shards = [shard_of(phone, cc, 4) for phone, cc in NUMBERS]
+    assert shards == [shard_of(phone, cc, 4) for phone, cc in NUMBERS]
+    assert set(shards) == {0, 1, 2, 3}
+
+
+@pytest.mark.asyncio
+async def test_ordered_results_across_workers():
+    async with MockPlatformServer() as server:
+        checker = sharded(server, ordered=True, chunk_size=4, max_pending=8)
+        outcomes = [o async for o in checker.check_numbers(NUMBERS)]
+
+    assert [(o.phone, o.country_code) for o in outcomes] == NUMBERS
+    assert all(not o.error for o in outcomes)
+    assert all(o.results[0].platform == "whatsapp" for o in outcomes)
+    assert server.status_counts[200] + server.status_counts[404] == 30
+
+
+@pytest.mark.asyncio
+async def test_workers_share_rate_limits_and_serialize_output():
+    async with TimingServer() as server:
+        checker = sharded(
+            server,
+            checker_options={"rate_limits": {"whatsapp": (10, 1.0)}},
+            transform=outcome_to_json,
+        )
+        lines = [line async for line in checker.check_numbers(NUMBERS)]
+
+    assert all(isinstance(line, str) for line in lines)
+    assert sorted(lines) == sorted(set(lines))
+    assert len(lines) == 30
+    # 10 requests come from the burst, the next 20 at 10 per second for
+    # both workers together (0.5s if each worker had its own bucket)
+    times = server.request_times
+    assert len(times) == 30
+    assert max(times) - min(times) >= 1.5
+
+
+@pytest.mark.asyncio
+async def test_worker_failure_is_raised():
+    checker = ShardedChecker(workers=2, on_start=fail_on_start)
+    with pytest.raises(WorkerError, match="worker setup failed"):
+        async for _ in checker.check_numbers(NUMBERS):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_runs_share_limits_and_cache_through_a_store(tmp_path):
+    async with TimingServer() as server:
+        for _ in range(2):
+            checker = sharded(
+                server,
+                checker_options={"rate_limits": {"whatsapp": (10, 1.0)}},
+                cache_options={"cache_dir": str(tmp_path / "local")},
+                shared_state=str(tmp_path / "shared"),
+            )
+            outcomes = [o async for o in checker.check_numbers(NUMBERS)]
+            assert len(outcomes) == 30
+
+    # The workers drew from the bucket of the store
+    times = server.request_times
+    assert max(times) - min(times) >= 1.5
+    # and the second run found every result in the shared cache
+    assert len(times) == 30
+    assert (tmp_path / "shared" / "cache.sqlite3").exists()
+    assert not (tmp_path / "local" / "cache.sqlite3").exists()
@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+
+from modern_phone_checker.cache import CacheManager
+from modern_phone_checker.models import PhoneCheckResult
+from modern_phone_checker.resp import RespClient
+from modern_phone_checker.shared_state import (
+    RedisStateStore, SQLiteStateStore, open_state_store,
+)
+
+
+async def acquire_all(limiters, count):
+    """Acquire ``count`` tokens from each limiter concurrently."""
+    started = time.monotonic()
+    await asyncio.gather(*(
+        limiter.acquire() for limiter in limiters for _ in range(count)
+    ))
+    return time.monotonic() - started
+
+
+@pytest.mark.asyncio
+async def test_sqlite_stores_share_one_bucket(tmp_path):
+    # Two stores on the same directory stand for two processes
+    async with SQLiteStateStore(tmp_path) as first, \
+            SQLiteStateStore(tmp_path) as second:
+        limiters = [
+            store.rate_limiter("whatsapp", 10, 1.0)
+            for store in (first, second)
+        ]
+        # 10 tokens from the burst, 10 more at 10 per second
+        elapsed = await acquire_all(limiters, 10)
+    assert elapsed >= 0.8
+
+
+@pytest.mark.asyncio
+async def test_redis_clients_share_one_bucket_and_penalties(redis_server):
+    stores = [
+        RedisStateStore(RespClient.from_url(redis_server.url))
+        for _ in range(3)
+    ]
+    limiters = [
+        store.rate_limiter("telegram", 10, 1.0) for store in stores
+    ]
+    elapsed = await acquire_all(limiters, 6)
+    assert elapsed >= 0.7
+    # Concurrent updates were retried, none was lost
+    assert redis_server.command_counts["EXEC"] >= 18
+
+    limiters[0].penalize(retry_after=0.3)
+    await limiters[0].wait_updates()
+    started = time.monotonic()
+    await limiters[1].acquire()
+    assert time.monotonic() - started >= 0.25
+    assert limiters[1].rate == 5.0
+    for store in stores:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_entries_are_shared_through_redis(tmp_path, redis_server):
+    stores = [open_state_store(redis_server.url) for _ in range(2)]
+    writer, reader = (
+        CacheManager(
+            cache_dir=str(tmp_path / "local"), backend=s.cache_backend()
+        )
+        for s in stores
+    )
+    await writer.initialize()
+    await writer.set(
+        "612345678", "33",
+        {"whatsapp": PhoneCheckResult("whatsapp", True)},
+    )
+    found = await reader.get("612345678", "33", ["whatsapp", "telegram"])
+    assert list(found) == ["whatsapp"]
+    assert found["whatsapp"][0].exists is True
+
+    stats = await reader.storage_stats()
+    assert stats["entries"] == stats["live"] == 1
+    assert stats["size_bytes"] == 0
+    await reader.invalidate("612345678", "33")
+    assert await writer.backend.get_many(["whatsapp_33_612345678"]) == {}
+    for cache, store in zip((writer, reader), stores):
+        await cache.close()
+        await store.close()
+    # Nothing is kept locally
+    assert not (tmp_path / "local").exists()
+
+
+def test_open_state_store_locations(tmp_path):
+    store = open_state_store("redis://:secret@cache-host:6380/2")
+    assert isinstance(store, RedisStateStore)
+    client = store.client
+    assert (client.host, client.port, client.db, client.password) == (
+        "cache-host", 6380, 2, "secret"
+    )
+    store = open_state_store(str(tmp_path))
+    assert isinstance(store, SQLiteStateStore)
+    assert store.cache_backend().cache_dir == tmp_path